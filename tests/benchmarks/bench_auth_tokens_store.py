@@ -0,0 +1,47 @@
+"""
+Benchmark of the auth token store maintenance on 1M tokens stored in
+fakeredis (900k tokens with a TTL, 100k legacy tokens without TTL).
+Benchmarks are not collected by the default test run, launch them
+explicitly:
+
+    py.test -s tests/benchmarks/bench_auth_tokens_store.py
+"""
+import time
+import unittest
+
+import fakeredis
+
+from zou.app.stores import auth_tokens_store
+
+NB_TOKENS = 1000000
+NB_LEGACY_TOKENS = 100000
+
+
+class AuthTokensStoreBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.redis_store = auth_tokens_store.revoked_tokens_store
+        auth_tokens_store.revoked_tokens_store = fakeredis.FakeStrictRedis()
+        pipeline = auth_tokens_store.revoked_tokens_store.pipeline(
+            transaction=False
+        )
+        for index in range(NB_TOKENS):
+            ttl = None if index < NB_LEGACY_TOKENS else 3600
+            pipeline.set("token-%s" % index, "false", ex=ttl)
+            if index % 10000 == 0:
+                pipeline.execute()
+        pipeline.execute()
+
+    def tearDown(self):
+        auth_tokens_store.revoked_tokens_store = self.redis_store
+
+    def test_clean_and_clear(self):
+        start = time.time()
+        nb_deleted = auth_tokens_store.clean()
+        print("\nclean: %s tokens in %.2fs" % (nb_deleted, time.time() - start))
+        self.assertEqual(nb_deleted, NB_LEGACY_TOKENS)
+
+        start = time.time()
+        nb_deleted = auth_tokens_store.clear()
+        print("clear: %s tokens in %.2fs" % (nb_deleted, time.time() - start))
+        self.assertEqual(nb_deleted, NB_TOKENS - NB_LEGACY_TOKENS)
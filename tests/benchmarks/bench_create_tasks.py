@@ -0,0 +1,76 @@
+"""
+Benchmark of the bulk task creation. It creates 50k tasks (5,000 shots and
+10 task types). Benchmarks are not collected by the default test run, launch
+them explicitly:
+
+    py.test -s tests/benchmarks/bench_create_tasks.py
+"""
+import time
+
+from tests.base import ApiDBTestCase
+
+from zou.app import db
+from zou.app.models.entity import Entity
+from zou.app.models.task import Task
+from zou.app.models.task_type import TaskType
+from zou.app.services import tasks_service
+from zou.app.utils import fields
+
+NB_SHOTS = 5000
+NB_TASK_TYPES = 10
+
+
+class CreateTasksBenchmark(ApiDBTestCase):
+
+    def setUp(self):
+        super(CreateTasksBenchmark, self).setUp()
+        self.generate_fixture_project_status()
+        self.generate_fixture_project()
+        self.generate_fixture_asset_type()
+        self.generate_fixture_sequence()
+        self.generate_fixture_department()
+        self.generate_fixture_task_status_todo()
+        db.session.bulk_insert_mappings(Entity, [
+            {
+                "id": fields.gen_uuid(),
+                "name": "SH%05d" % index,
+                "project_id": self.project.id,
+                "entity_type_id": self.shot_type.id,
+                "parent_id": self.sequence.id,
+            }
+            for index in range(NB_SHOTS)
+        ])
+        db.session.commit()
+        self.task_types = [
+            TaskType.create(
+                name="Task type %s" % index,
+                short_name="tt%s" % index,
+                for_shots=True,
+                department_id=self.department.id
+            ).serialize()
+            for index in range(NB_TASK_TYPES)
+        ]
+        self.shots = [
+            {"id": str(entity.id), "project_id": str(entity.project_id)}
+            for entity in Entity.get_all_by(entity_type_id=self.shot_type.id)
+        ]
+
+    def test_create_50k_tasks(self):
+        start = time.time()
+        for task_type in self.task_types:
+            tasks_service.create_tasks(task_type, self.shots)
+        duration = time.time() - start
+        print(
+            "\n%s tasks created in %.2fs" % (
+                NB_SHOTS * NB_TASK_TYPES,
+                duration
+            )
+        )
+        self.assertEqual(Task.query.count(), NB_SHOTS * NB_TASK_TYPES)
+
+        start = time.time()
+        for task_type in self.task_types:
+            tasks = tasks_service.create_tasks(task_type, self.shots)
+            self.assertEqual(len(tasks), 0)
+        duration = time.time() - start
+        print("Existence check for 50k tasks in %.2fs" % duration)
@@ -0,0 +1,121 @@
+"""
+Benchmark of the movie normalization: single ffmpeg run encoding both
+resolutions versus the former two runs (plus the silent soundtrack rewrite).
+Sample clips are generated with the ffmpeg test sources, with and without
+soundtrack. Benchmarks are not collected by the default test run, launch
+them explicitly:
+
+    py.test -s tests/benchmarks/bench_normalize_movie.py
+"""
+import math
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import ffmpeg
+
+from zou.utils import movie
+
+CLIP_DURATION = 10
+CLIP_SIZE = "1920x1080"
+CLIP_FPS = 25
+
+
+def normalize_movie_two_passes(movie_path, fps, width, height):
+    """
+    Former normalization: the source is decoded once for each resolution.
+    """
+    folder_path = os.path.dirname(movie_path)
+    file_source_name = os.path.basename(movie_path)
+    file_target_path = os.path.join(
+        folder_path, "%s.mp4" % file_source_name[:-8]
+    )
+    low_file_target_path = os.path.join(
+        folder_path, "%s_low.mp4" % file_source_name[:-8]
+    )
+
+    if not movie.has_soundtrack(movie_path):
+        movie.add_empty_soundtrack(movie_path)
+
+    low_width = 1280
+    low_height = math.floor((height / width) * low_width)
+    if low_height % 2 == 1:
+        low_height = low_height + 1
+    for (path, bitrate, size) in [
+        (file_target_path, "28M", "%sx%s" % (width, height)),
+        (low_file_target_path, "1M", "%sx%s" % (low_width, low_height)),
+    ]:
+        stream = ffmpeg.input(movie_path)
+        ffmpeg.output(
+            stream.video,
+            stream.audio,
+            path,
+            pix_fmt="yuv420p",
+            format="mp4",
+            r=fps,
+            b=bitrate,
+            preset="slow",
+            vcodec="libx264",
+            color_primaries=1,
+            color_trc=1,
+            colorspace=1,
+            movflags="+faststart",
+            s=size,
+        ).overwrite_output().run(quiet=True)
+    return file_target_path, low_file_target_path, None
+
+
+class NormalizeMovieBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.clips = {
+            "with soundtrack": self.generate_clip("sound", True),
+            "without soundtrack": self.generate_clip("silent", False),
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def generate_clip(self, name, with_audio):
+        path = os.path.join(self.tmpdir, "%s.mov" % name)
+        video = ffmpeg.input(
+            "testsrc=duration=%s:size=%s:rate=%s"
+            % (CLIP_DURATION, CLIP_SIZE, CLIP_FPS),
+            format="lavfi",
+        )
+        streams = [video]
+        if with_audio:
+            streams.append(ffmpeg.input(
+                "sine=duration=%s" % CLIP_DURATION, format="lavfi"
+            ))
+        ffmpeg.output(*streams, path, vcodec="prores").run(quiet=True)
+        return path
+
+    def normalize(self, normalize_function, clip_path, name):
+        # Uploaded files are named <preview id>.mov.tmp.
+        upload_path = os.path.join(self.tmpdir, "%s.mov.tmp" % name)
+        shutil.copyfile(clip_path, upload_path)
+        start = time.time()
+        result = normalize_function(upload_path, CLIP_FPS, 1920, 1080)
+        duration = time.time() - start
+        for path in result[:2]:
+            self.assertTrue(movie.has_soundtrack(path))
+            os.remove(path)
+        os.remove(upload_path)
+        return duration
+
+    def test_normalize_movie(self):
+        for (label, clip_path) in self.clips.items():
+            two_passes = self.normalize(
+                normalize_movie_two_passes, clip_path, "two-passes"
+            )
+            single_pass = self.normalize(
+                movie.normalize_movie, clip_path, "single-pass"
+            )
+            print(
+                "\n%s: two passes %.2fs, single pass %.2fs (%.1fx)"
+                % (label, two_passes, single_pass, two_passes / single_pass)
+            )
@@ -5,6 +5,7 @@ from zou.app.models.event import ApiEvent
 from zou.app.services import (
     assets_service
 )
+from zou.app.stores import publisher_store
 
 
 class EventsRoutesTestCase(ApiDBTestCase):
@@ -67,3 +68,24 @@ class EventsRoutesTestCase(ApiDBTestCase):
         self.assertEqual(len(events), 6)
         events = self.get("/data/events/last?only_files=true")
         self.assertEqual(len(events), 2)
+
+    def test_replay_project_events(self):
+        if publisher_store.publisher_store is None:
+            self.skipTest("No key value store able to keep event histories")
+        for name in ["test 1", "test 2"]:
+            assets_service.create_asset(
+                self.project.id, self.asset_type.id, name, "", {}
+            )
+        path = "/data/events/projects/%s/replay" % self.project.id
+        result = self.get(path)
+        sequence = result["sequence"]
+        self.assertTrue(result["is_complete"])
+        self.assertEqual(len(result["events"]), sequence)
+        self.assertEqual(result["events"][-1]["name"], "asset:new")
+
+        result = self.get("%s?after=%s" % (path, sequence - 1))
+        self.assertEqual(len(result["events"]), 1)
+        self.assertEqual(result["events"][0]["sequence"], sequence)
+        self.assertEqual(
+            result["events"][0]["data"]["project_id"], str(self.project.id)
+        )
@@ -2,6 +2,7 @@ from tests.base import ApiDBTestCase
 from zou.app.models.task import Task
 from zou.app.models.person import Person
 
+from zou.app.services import persons_service
 from zou.app.utils import fields
 
 
@@ -80,6 +81,15 @@ class TaskTestCase(ApiDBTestCase):
         self.assertEqual(data["name"], task_again["name"])
         self.put_404("data/tasks/%s" % fields.gen_uuid(), data)
 
+    def test_update_task_assignees(self):
+        person_id = str(self.person.id)
+        snapshot = persons_service.get_access_snapshot(person_id)
+        self.assertEqual(snapshot["entity_ids"], set([str(self.asset.id)]))
+        for task in self.tasks:
+            self.put("data/tasks/%s" % task.id, {"assignees": []})
+        snapshot = persons_service.get_access_snapshot(person_id)
+        self.assertEqual(snapshot["entity_ids"], set())
+
     def test_delete_task(self):
         tasks = self.get("data/tasks")
         self.assertEqual(len(tasks), 3)
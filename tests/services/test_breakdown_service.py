@@ -1,6 +1,10 @@
 from tests.base import ApiDBTestCase
 
-from zou.app.services import breakdown_service
+from zou.app.services import (
+    breakdown_service,
+    entities_service,
+    shots_service,
+)
 
 
 class BreakdownServiceTestCase(ApiDBTestCase):
@@ -158,6 +162,64 @@ class BreakdownServiceTestCase(ApiDBTestCase):
         self.assertEqual(cast_in[0]["sequence_name"], self.sequence.name)
         self.assertEqual(cast_in[0]["episode_name"], self.episode.name)
 
+    def test_get_cast_in_many(self):
+        cast_in = breakdown_service.get_cast_in_many(
+            [self.asset_id, self.asset_character_id]
+        )
+        self.assertEqual(cast_in[self.asset_id], [])
+        self.assertEqual(cast_in[self.asset_character_id], [])
+
+        breakdown_service.update_casting(self.shot_id, [
+            {"asset_id": self.asset_id, "nb_occurences": 1},
+            {"asset_id": self.asset_character_id, "nb_occurences": 3}
+        ])
+        self.generate_fixture_shot("SH02")
+        breakdown_service.update_casting(str(self.shot.id), [
+            {"asset_id": self.asset_character_id, "nb_occurences": 2}
+        ])
+        cast_in = breakdown_service.get_cast_in_many(
+            [self.asset_id, self.asset_character_id]
+        )
+        self.assertEqual(len(cast_in[self.asset_id]), 1)
+        self.assertEqual(len(cast_in[self.asset_character_id]), 2)
+        self.assertEqual(cast_in[self.asset_id][0]["shot_id"], self.shot_id)
+        self.assertEqual(
+            cast_in[self.asset_character_id][1]["nb_occurences"], 2
+        )
+
+        entity_link = breakdown_service.get_entity_link(
+            self.shot_id, self.asset_id
+        )
+        entities_service.remove_entity_link(entity_link["id"])
+        cast_in = breakdown_service.get_cast_in_many([self.asset_id])
+        self.assertEqual(cast_in[self.asset_id], [])
+
+    def test_get_cast_in_after_shot_update(self):
+        breakdown_service.update_casting(self.shot_id, [
+            {"asset_id": self.asset_id, "nb_occurences": 1}
+        ])
+        cast_in = breakdown_service.get_cast_in(self.asset_id)
+        self.assertEqual(cast_in[0]["shot_name"], self.shot.name)
+
+        shots_service.update_shot(self.shot_id, {"name": "SH_RENAMED"})
+        cast_in = breakdown_service.get_cast_in(self.asset_id)
+        self.assertEqual(cast_in[0]["shot_name"], "SH_RENAMED")
+
+        shots_service.update_shot(self.shot_id, {"canceled": True})
+        cast_in = breakdown_service.get_cast_in(self.asset_id)
+        self.assertEqual(cast_in, [])
+
+    def test_get_cast_in_after_sequence_update(self):
+        breakdown_service.update_casting(self.shot_id, [
+            {"asset_id": self.asset_id, "nb_occurences": 1}
+        ])
+        cast_in = breakdown_service.get_cast_in(self.asset_id)
+        self.assertEqual(cast_in[0]["sequence_name"], self.sequence.name)
+
+        self.put("data/entities/%s" % self.sequence.id, {"name": "SE_RENAMED"})
+        cast_in = breakdown_service.get_cast_in(self.asset_id)
+        self.assertEqual(cast_in[0]["sequence_name"], "SE_RENAMED")
+
     def test_add_instance_to_shot(self):
         instances = breakdown_service.get_asset_instances_for_shot(self.shot.id)
         self.assertEqual(instances, {})
@@ -3,8 +3,9 @@ from tests.base import ApiDBTestCase
 
 from zou.app.utils import fields
 from zou.app.services import (
+    assets_service,
+    deletion_service,
     events_service,
-    assets_service
 )
 
 
@@ -62,3 +63,20 @@ class EventsServiceTestCase(ApiDBTestCase):
         self.assertEqual(len(login_logs), 4)
         login_logs = events_service.get_last_login_logs(page_size=2)
         self.assertEqual(len(login_logs), 2)
+
+    def test_event_partitions(self):
+        if not events_service.is_event_table_partitioned():
+            self.skipTest("Partitioning requires PostgreSQL 11")
+        assets_service.create_asset(
+            self.project.id, self.asset_type.id, "test 1", "", {}
+        )
+        partition_names = events_service.create_event_partitions(2)
+        self.assertEqual(len(partition_names), 3)
+        self.assertEqual(len(events_service.get_event_partitions()), 3)
+        self.assertEqual(events_service.create_event_partitions(2), [])
+        events = events_service.get_last_events()
+        self.assertEqual(len(events), 1)
+
+        deletion_service.remove_old_events(days_old=0)
+        events = events_service.get_last_events()
+        self.assertEqual(len(events), 0)
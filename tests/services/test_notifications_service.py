@@ -2,6 +2,7 @@ from tests.base import ApiDBTestCase
 
 from zou.app.models.notification import Notification
 from zou.app.services import comments_service, notifications_service
+from zou.app.utils import fields
 
 
 class NotificationsServiceTestCase(ApiDBTestCase):
@@ -76,6 +77,18 @@ class NotificationsServiceTestCase(ApiDBTestCase):
         notifications = Notification.get_all()
         self.assertEqual(len(notifications), 2)
 
+    def test_create_notifications_for_task_and_comment_with_missing_person(
+        self
+    ):
+        self.generate_fixture_comment()
+        self.comment["mentions"] = [self.person.id, fields.gen_uuid()]
+        notifications_service.create_notifications_for_task_and_comment(
+            self.task_dict,
+            self.comment
+        )
+        notifications = Notification.get_all()
+        self.assertEqual(len(notifications), 2)
+
     def test_create_assignation_notification(self):
         self.generate_fixture_comment()
         notifications_service.create_assignation_notification(
@@ -111,6 +124,31 @@ class NotificationsServiceTestCase(ApiDBTestCase):
         )
         self.assertTrue(self.person_dict["id"] in recipients)
 
+    def test_get_unread_notifications_count(self):
+        self.generate_fixture_comment()
+        person_id = str(self.person.id)
+        notifications_service.clear_unread_notifications_counts([person_id])
+        count = notifications_service.get_unread_notifications_count(person_id)
+        self.assertEqual(count, 0)
+        notification = notifications_service.create_notification(
+            person_id,
+            comment_id=self.comment["id"],
+            author_id=self.comment["person_id"],
+            task_id=self.comment["object_id"]
+        )
+        count = notifications_service.get_unread_notifications_count(person_id)
+        self.assertEqual(count, 1)
+
+        Notification.get(notification["id"]).update({"read": True})
+        notifications_service.decrement_unread_notifications_count(person_id)
+        count = notifications_service.get_unread_notifications_count(person_id)
+        self.assertEqual(count, 0)
+
+        Notification.get(notification["id"]).update({"read": False})
+        notifications_service.clear_unread_notifications_counts([person_id])
+        count = notifications_service.get_unread_notifications_count(person_id)
+        self.assertEqual(count, 1)
+
     def test_unsubscribe_task(self):
         self.generate_fixture_comment()
         notifications_service.subscribe_to_task(
@@ -1,6 +1,10 @@
 from tests.base import ApiDBTestCase
 
-from zou.app.services import persons_service, tasks_service
+from zou.app.services import (
+    persons_service,
+    projects_service,
+    tasks_service
+)
 from zou.app.services.exception import PersonNotFoundException
 from zou.app.utils import auth
 
@@ -137,3 +141,48 @@ class PersonServiceTestCase(ApiDBTestCase):
         persons_service.remove_from_department(department["id"], person["id"])
         person = persons_service.get_person(person["id"])
         self.assertEqual(len(person["departments"]), 0)
+
+    def test_get_access_snapshot(self):
+        self.generate_fixture_project_status()
+        self.generate_fixture_project()
+        self.generate_fixture_asset_type()
+        self.generate_fixture_asset()
+        snapshot = persons_service.get_access_snapshot(self.person_id)
+        self.assertFalse(snapshot["is_admin"])
+        self.assertEqual(snapshot["project_ids"], set())
+        self.assertEqual(snapshot["entity_ids"], set())
+
+        projects_service.add_team_member(self.project_id, self.person_id)
+        snapshot = persons_service.get_access_snapshot(self.person_id)
+        self.assertEqual(snapshot["project_ids"], set([str(self.project_id)]))
+
+        self.generate_fixture_task_type()
+        self.generate_fixture_task_status()
+        self.generate_fixture_assigner()
+        self.generate_fixture_task()
+        persons_service.clear_access_snapshot()
+        snapshot = persons_service.get_access_snapshot(self.person_id)
+        self.assertEqual(snapshot["entity_ids"], set([str(self.asset.id)]))
+
+    def test_get_current_user(self):
+        from flask import g
+        from zou.app import app
+
+        old_get_jwt_identity = persons_service.get_jwt_identity
+        persons_service.get_jwt_identity = lambda: self.person_email
+        try:
+            with app.test_request_context():
+                user = persons_service.get_current_user()
+                self.assertEqual(user["id"], self.person_id)
+                self.assertEqual(g.current_user[1]["id"], self.person_id)
+                self.assertEqual(
+                    persons_service.get_current_user_id(), self.person_id
+                )
+                user_raw = persons_service.get_current_user_raw()
+                self.assertTrue(
+                    persons_service.get_current_user_raw() is user_raw
+                )
+                persons_service.clear_current_user()
+                self.assertTrue(g.get("current_user") is None)
+        finally:
+            persons_service.get_jwt_identity = old_get_jwt_identity
@@ -1,5 +1,6 @@
 from tests.base import ApiDBTestCase
 
+from zou.app.models.asset_instance import AssetInstance
 from zou.app.models.entity import Entity
 from zou.app.models.project import Project
 from zou.app.models.metadata_descriptor import MetadataDescriptor
@@ -179,6 +180,39 @@ class ProjectServiceTestCase(ApiDBTestCase):
         )
         self.assertEqual(len(descriptors), 0)
 
+    def test_get_projects_with_extra_data(self):
+        self.generate_fixture_asset_types()
+        self.generate_fixture_person()
+        self.project.update({"production_type": "tvshow"})
+        self.generate_fixture_episode("E02")
+        first_episode = self.generate_fixture_episode("E01")
+        self.generate_fixture_episode("E03", project_id=self.project_closed.id)
+        projects_service.add_team_member(self.project.id, self.person.id)
+        descriptor = projects_service.add_metadata_descriptor(
+            self.project.id, "Asset", "Contractor", [], True
+        )
+        projects_service.add_metadata_descriptor(
+            self.project_closed.id, "Asset", "Is Outdoor", [], False
+        )
+
+        projects = projects_service.get_projects_with_extra_data(
+            Project.query.order_by(Project.name)
+        )
+        self.assertEqual(len(projects), 2)
+        (project, project_closed) = projects
+        self.assertEqual(project["first_episode_id"], str(first_episode.id))
+        self.assertFalse("first_episode_id" in project_closed)
+        self.assertEqual(project["team"], [str(self.person.id)])
+        self.assertEqual(len(project["descriptors"]), 1)
+        self.assertEqual(project["descriptors"][0]["id"], descriptor["id"])
+        self.assertEqual(len(project_closed["descriptors"]), 1)
+
+        projects = projects_service.get_projects_with_extra_data(
+            Project.query.order_by(Project.name), for_client=True
+        )
+        self.assertEqual(len(projects[0]["descriptors"]), 1)
+        self.assertEqual(len(projects[1]["descriptors"]), 0)
+
     def test_update_metadata_descriptor(self):
         asset = self.generate_fixture_asset_type()
         asset = self.generate_fixture_asset()
@@ -244,6 +278,36 @@ class ProjectServiceTestCase(ApiDBTestCase):
         project_id = str(self.project.id)
         deletion_service.remove_project(project_id)
         self.assertIsNone(Project.get(project_id))
+        progress = deletion_service.get_project_deletion_progress(project_id)
+        self.assertEqual(progress["status"], "succeeded")
+        self.assertEqual(progress["step"], progress["nb_steps"])
+
+    def test_delete_project_with_asset_instance_entity(self):
+        self.generate_fixture_asset_type()
+        self.generate_fixture_episode()
+        self.generate_fixture_sequence()
+        self.generate_fixture_shot()
+        other_asset = Entity.create(
+            name="Other asset",
+            project_id=self.project_closed.id,
+            entity_type_id=self.asset_type.id
+        )
+        asset_instance = AssetInstance.create(
+            asset_id=other_asset.id,
+            entity_id=self.shot.id,
+            number=1,
+            name="other_asset_0001"
+        )
+
+        asset_instance_id = str(asset_instance.id)
+        other_asset_id = str(other_asset.id)
+        project_id = str(self.project.id)
+        deletion_service.remove_project(project_id)
+        self.assertIsNone(Project.get(project_id))
+        self.assertIsNone(
+            AssetInstance.query.filter_by(id=asset_instance_id).first()
+        )
+        self.assertIsNotNone(Entity.get(other_asset_id))
 
     def test_is_tv_show(self):
         self.assertFalse(projects_service.is_tv_show(self.project.serialize()))
@@ -10,6 +10,7 @@ from zou.app.models.preview_file import PreviewFile
 from zou.app.services import (
     comments_service,
     deletion_service,
+    events_service,
     preview_files_service,
     tasks_service
 )
@@ -119,6 +120,17 @@ class TaskServiceTestCase(ApiDBTestCase):
         self.assertEqual(task["task_type_id"], task_type["id"])
         self.assertEqual(task["project_id"], shot["project_id"])
         self.assertEqual(task["task_status_id"], status["id"])
+        self.assertEqual(tasks[1]["entity_id"], shot_2["id"])
+        self.assertEqual(tasks[1]["task_type_name"], task_type["name"])
+
+        tasks = tasks_service.create_tasks(task_type, [shot, shot_2])
+        self.assertEqual(len(tasks), 0)
+        last_events = events_service.get_last_events()
+        batch_events = [
+            event for event in last_events if event["name"] == "task:new-batch"
+        ]
+        self.assertEqual(len(batch_events), 1)
+        self.assertEqual(len(batch_events[0]["data"]["task_ids"]), 2)
 
     def test_status_to_wip(self):
         events.register(
@@ -178,6 +190,22 @@ class TaskServiceTestCase(ApiDBTestCase):
         tasks_service.assign_task(self.task.id, self.assigner.id)
         self.assertEqual(self.task.assignees[1].id, self.assigner.id)
 
+    def test_assign_tasks(self):
+        task_id = str(self.task.id)
+        shot_task_id = str(self.shot_task.id)
+        tasks = tasks_service.assign_tasks(
+            [task_id, shot_task_id, "wrong-id"], str(self.assigner.id)
+        )
+        self.assertEqual(len(tasks), 2)
+        task = tasks_service.get_task_with_relations(task_id)
+        self.assertTrue(str(self.assigner.id) in task["assignees"])
+        task = tasks_service.get_task_with_relations(shot_task_id)
+        self.assertTrue(str(self.assigner.id) in task["assignees"])
+        tasks = tasks_service.assign_tasks([task_id], str(self.assigner.id))
+        self.assertEqual(tasks, [])
+        task = tasks_service.get_task_with_relations(task_id)
+        self.assertEqual(len(task["assignees"]), 2)
+
     def test_get_department_from_task(self):
         department = tasks_service.get_department_from_task(self.task.id)
         self.assertEqual(department["name"], "Modeling")
@@ -509,6 +537,36 @@ class TaskServiceTestCase(ApiDBTestCase):
         )
         self.assertEqual(comment["mentions"][0], str(self.person.id))
 
+    def test_create_comments(self):
+        shot_task_id = str(self.shot_task.id)
+        comments = comments_service.create_comments(self.person.id, [
+            {
+                "object_id": self.task_id,
+                "task_status_id": str(self.wip_status_id),
+                "comment": "Test @John Doe"
+            },
+            {
+                "object_id": shot_task_id,
+                "task_status_id": str(self.to_review_status_id),
+                "comment": "Ready"
+            },
+            {
+                "task_status_id": str(self.wip_status_id),
+                "comment": "No task"
+            }
+        ])
+        self.assertEqual(len(comments), 2)
+        self.assertEqual(comments[0]["mentions"][0], str(self.person.id))
+        self.assertEqual(comments[1]["text"], "Ready")
+        task = tasks_service.get_task(self.task_id)
+        self.assertEqual(task["task_status_id"], str(self.wip_status_id))
+        self.assertIsNotNone(task["real_start_date"])
+        task = tasks_service.get_task(shot_task_id)
+        self.assertEqual(
+            task["task_status_id"], str(self.to_review_status_id)
+        )
+        self.assertEqual(len(tasks_service.get_comments(shot_task_id)), 1)
+
     def test_get_full_task(self):
         task = tasks_service.get_full_task(self.task.id)
         self.assertEqual(task["project"]["name"], self.project.name)
@@ -0,0 +1,163 @@
+import os
+import tempfile
+import unittest
+
+from collections import OrderedDict
+
+from rq import Queue
+
+from tests.base import ApiDBTestCase
+
+from zou.app import config
+from zou.app.services import transcoding_service
+from zou.app.services.exception import WrongParameterException
+from zou.app.stores import queue_store
+from zou.app.utils import fields
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class TranscodingServiceTestCase(ApiDBTestCase):
+
+    def setUp(self):
+        super(TranscodingServiceTestCase, self).setUp()
+
+        self.generate_fixture_project_status()
+        self.generate_fixture_project()
+        self.generate_fixture_asset_type()
+        self.generate_fixture_asset()
+        self.generate_fixture_department()
+        self.generate_fixture_task_type()
+        self.generate_fixture_task_status()
+        self.generate_fixture_person()
+        self.generate_fixture_assigner()
+        self.generate_fixture_task()
+        self.generate_fixture_preview_file()
+
+    def set_fake_transcoding_queues(self):
+        """
+        Run transcoding queues on a fake Redis instance for the current test.
+        """
+        if fakeredis is None:
+            raise unittest.SkipTest("fakeredis is required")
+        old_values = {
+            name: getattr(queue_store, name, None)
+            for name in ["queue_store", "transcoding_queues"]
+        }
+        old_enable_job_queue = config.ENABLE_JOB_QUEUE
+
+        def restore():
+            config.ENABLE_JOB_QUEUE = old_enable_job_queue
+            for (name, value) in old_values.items():
+                if value is None:
+                    delattr(queue_store, name)
+                else:
+                    setattr(queue_store, name, value)
+
+        self.addCleanup(restore)
+        config.ENABLE_JOB_QUEUE = True
+        queue_store.queue_store = fakeredis.FakeStrictRedis()
+        queue_store.queue_store.flushall()
+        queue_store.transcoding_queues = OrderedDict(
+            (
+                priority,
+                Queue(
+                    queue_store.get_transcoding_queue_name(priority),
+                    connection=queue_store.queue_store,
+                ),
+            )
+            for priority in queue_store.TRANSCODING_PRIORITIES
+        )
+
+    def queue_transcoding(self, preview_file_id, priority):
+        (handle, uploaded_movie_path) = tempfile.mkstemp(suffix=".mp4")
+        os.close(handle)
+        self.addCleanup(self.remove_file, uploaded_movie_path)
+        transcoding_service.queue_movie_transcoding(
+            preview_file_id, uploaded_movie_path, priority=priority
+        )
+        return uploaded_movie_path
+
+    def remove_file(self, file_path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def test_check_priority(self):
+        self.assertEqual(transcoding_service.check_priority("high"), "high")
+        self.assertRaises(
+            WrongParameterException,
+            transcoding_service.check_priority,
+            "urgent"
+        )
+
+    def test_get_transcoding_status(self):
+        preview_file_id = str(self.preview_file.id)
+        status = transcoding_service.get_transcoding_status(preview_file_id)
+        self.assertEqual(status["preview_file_id"], preview_file_id)
+        self.assertEqual(status["status"], self.preview_file.status)
+        self.assertIsNone(status["job_status"])
+        self.assertIsNone(status["queue_position"])
+
+    def test_cancel_transcoding_without_job(self):
+        self.assertRaises(
+            WrongParameterException,
+            transcoding_service.cancel_transcoding,
+            str(self.preview_file.id)
+        )
+
+    def test_get_queue_position(self):
+        self.set_fake_transcoding_queues()
+        preview_file_ids = [str(fields.gen_uuid()) for _ in range(4)]
+        priorities = ["low", "normal", "high", "normal"]
+        for (preview_file_id, priority) in zip(preview_file_ids, priorities):
+            self.queue_transcoding(preview_file_id, priority)
+
+        positions = [
+            transcoding_service.get_queue_position(
+                transcoding_service.get_job(preview_file_id)
+            )
+            for preview_file_id in preview_file_ids
+        ]
+        self.assertEqual(positions, [3, 1, 0, 2])
+
+    def test_get_transcoding_status_with_job(self):
+        self.set_fake_transcoding_queues()
+        preview_file_id = str(self.preview_file.id)
+        self.queue_transcoding(str(fields.gen_uuid()), "high")
+        self.queue_transcoding(preview_file_id, "low")
+        status = transcoding_service.get_transcoding_status(preview_file_id)
+        self.assertEqual(status["job_status"], "queued")
+        self.assertEqual(status["priority"], "low")
+        self.assertEqual(status["progress"], "queued")
+        self.assertEqual(status["queue_position"], 1)
+
+    def test_cancel_transcoding(self):
+        self.set_fake_transcoding_queues()
+        preview_file_id = str(self.preview_file.id)
+        uploaded_movie_path = self.queue_transcoding(preview_file_id, "high")
+        preview_file = transcoding_service.cancel_transcoding(preview_file_id)
+        self.assertEqual(preview_file["status"], "broken")
+        self.assertFalse(os.path.exists(uploaded_movie_path))
+        self.assertIsNone(transcoding_service.get_job(preview_file_id))
+        self.assertEqual(queue_store.transcoding_queues["high"].count, 0)
+        self.assertRaises(
+            WrongParameterException,
+            transcoding_service.cancel_transcoding,
+            preview_file_id
+        )
+
+    def test_cancel_transcoding_taken_by_worker(self):
+        self.set_fake_transcoding_queues()
+        preview_file_id = str(self.preview_file.id)
+        uploaded_movie_path = self.queue_transcoding(preview_file_id, "normal")
+        queue_store.transcoding_queues["normal"].pop_job_id()
+        self.assertRaises(
+            WrongParameterException,
+            transcoding_service.cancel_transcoding,
+            preview_file_id
+        )
+        self.assertTrue(os.path.exists(uploaded_movie_path))
+        self.assertIsNotNone(transcoding_service.get_job(preview_file_id))
@@ -1,5 +1,6 @@
 from tests.source.shotgun.base import ShotgunTestCase
-from zou.app.services import projects_service
+from zou.app.models.person import Person
+from zou.app.services import persons_service, projects_service
 
 
 class ImportShotgunProjectConnectionsTestCase(ShotgunTestCase):
@@ -44,6 +45,10 @@ class ImportShotgunProjectConnectionsTestCase(ShotgunTestCase):
             "type": "ProjectUserConnection"
         }
 
+        person_id = str(Person.get_by(shotgun_id=1).id)
+        snapshot = persons_service.get_access_snapshot(person_id)
+        self.assertEqual(snapshot["project_ids"], set())
+
         api_path = "/import/shotgun/projectconnections"
         self.projects = self.post(api_path, [sg_project_persons], 200)
         self.assertEqual(len(self.projects), 1)
@@ -51,3 +56,5 @@ class ImportShotgunProjectConnectionsTestCase(ShotgunTestCase):
         projects = self.get("data/projects")
         project = projects_service.get_project_with_relations(projects[1]["id"])
         self.assertEqual(len(project["team"]), 1)
+        snapshot = persons_service.get_access_snapshot(person_id)
+        self.assertEqual(snapshot["project_ids"], set([projects[1]["id"]]))
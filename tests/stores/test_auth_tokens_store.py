@@ -35,3 +35,26 @@ class AuthTokensTestCase(ApiTestCase):
         self.store.add("key-2", "true")
         self.assertTrue("key-1" in self.store.keys())
         self.assertTrue("key-2" in self.store.keys())
+
+    def test_clear(self):
+        for index in range(2500):
+            self.store.add("key-%s" % index, "true", ttl=3600)
+        self.assertEqual(self.store.clear(), 2500)
+        self.assertEqual(self.store.keys(), [])
+
+    def test_clean(self):
+        self.store.add("key-1", "false", ttl=3600)
+        self.store.add("key-2", "true")
+        self.assertEqual(self.store.clean(), 1)
+        self.assertEqual(self.store.keys(), ["key-1"])
+
+    def test_is_revoked_after_revocation(self):
+        self.store.add("key-1", "false")
+        self.assertFalse(self.store.is_revoked({"jti": "key-1"}))
+        self.assertFalse(self.store.is_revoked({"jti": "key-1"}))
+        self.store.add("key-1", "true")
+        self.assertTrue(self.store.is_revoked({"jti": "key-1"}))
+        self.store.add("key-2", "false")
+        self.assertFalse(self.store.is_revoked({"jti": "key-2"}))
+        self.store.clear()
+        self.assertTrue(self.store.is_revoked({"jti": "key-2"}))
@@ -0,0 +1,69 @@
+import time
+
+from tests.base import ApiTestCase
+
+from zou.app.stores import notifications_store
+
+
+class NotificationsStoreTestCase(ApiTestCase):
+
+    def setUp(self):
+        super(NotificationsStoreTestCase, self).setUp()
+        self.store = notifications_store
+        self.store.clear_unread_counts(["person-1", "person-2"])
+        self.store.pop_digest("person-1")
+
+    def tearDown(self):
+        self.store.clear_unread_counts(["person-1", "person-2"])
+        self.store.pop_digest("person-1")
+
+    def test_set_and_get_unread_count(self):
+        self.assertIsNone(self.store.get_unread_count("person-1"))
+        self.store.set_unread_count("person-1", 3)
+        self.assertEqual(self.store.get_unread_count("person-1"), 3)
+        self.store.set_unread_count("person-1", 5)
+        self.assertEqual(self.store.get_unread_count("person-1"), 3)
+
+    def test_increment_unread_count(self):
+        self.store.increment_unread_count("person-1")
+        self.assertIsNone(self.store.get_unread_count("person-1"))
+        self.store.set_unread_count("person-1", 0)
+        self.store.increment_unread_count("person-1", 2)
+        self.assertEqual(self.store.get_unread_count("person-1"), 2)
+        self.store.increment_unread_count("person-1", -3)
+        self.assertIsNone(self.store.get_unread_count("person-1"))
+
+    def test_clear_unread_counts(self):
+        self.store.set_unread_count("person-1", 1)
+        self.store.set_unread_count("person-2", 2)
+        self.store.clear_unread_counts(["person-1"])
+        self.assertIsNone(self.store.get_unread_count("person-1"))
+        self.assertEqual(self.store.get_unread_count("person-2"), 2)
+        self.store.clear_unread_counts()
+        self.assertIsNone(self.store.get_unread_count("person-2"))
+
+    def test_digest(self):
+        self.assertEqual(self.store.pop_digest("person-1"), [])
+        is_first = self.store.add_to_digest("person-1", {"subject": "a"}, 60)
+        self.assertTrue(is_first)
+        is_first = self.store.add_to_digest("person-1", {"subject": "b"}, 60)
+        self.assertFalse(is_first)
+        entries = self.store.pop_digest("person-1")
+        self.assertEqual(entries, [{"subject": "a"}, {"subject": "b"}])
+        self.assertEqual(self.store.pop_digest("person-1"), [])
+        is_first = self.store.add_to_digest("person-1", {"subject": "c"}, 60)
+        self.assertTrue(is_first)
+
+    def test_get_due_digests(self):
+        self.store.add_to_digest("person-1", {"subject": "a"}, 60)
+        self.assertEqual(self.store.get_due_digests(), [])
+        due_digests = self.store.get_due_digests(now=time.time() + 61)
+        self.assertEqual(due_digests, ["person-1"])
+        self.assertFalse(self.store.is_digest_due("person-1"))
+        self.assertTrue(
+            self.store.is_digest_due("person-1", now=time.time() + 61)
+        )
+        self.assertFalse(self.store.is_digest_due("person-2"))
+        self.store.pop_digest("person-1")
+        due_digests = self.store.get_due_digests(now=time.time() + 61)
+        self.assertEqual(due_digests, [])
@@ -0,0 +1,95 @@
+from tests.base import ApiTestCase
+
+from zou.app import app, config
+from zou.app.stores import publisher_store
+
+
+class SocketIORecorder(object):
+
+    def __init__(self):
+        self.messages = []
+
+    def emit(self, event, data, namespace=None, room=None):
+        self.messages.append((event, room))
+
+
+class PublisherStoreTestCase(ApiTestCase):
+
+    def test_get_event_rooms(self):
+        rooms = publisher_store.get_event_rooms(
+            "task:update", {"task_id": "task-1", "project_id": "project-1"}
+        )
+        self.assertEqual(
+            rooms, ["project:project-1", publisher_store.ALL_EVENTS_ROOM]
+        )
+        rooms = publisher_store.get_event_rooms(
+            "notification:new",
+            {
+                "notification_id": "notification-1",
+                "person_id": "person-1",
+                "project_id": "project-1",
+            }
+        )
+        self.assertEqual(rooms, ["person:person-1"])
+        rooms = publisher_store.get_event_rooms(
+            "person:update", {"person_id": "person-1"}
+        )
+        self.assertEqual(rooms, [None])
+
+    def test_build_batch_data(self):
+        events_data = [
+            {
+                "task_id": "task-1",
+                "new_task_status_id": "status-2",
+                "previous_task_status_id": "status-1",
+                "project_id": "project-1",
+                "sequence": 1,
+            },
+            {
+                "task_id": "task-2",
+                "new_task_status_id": "status-1",
+                "previous_task_status_id": "status-2",
+                "project_id": "project-1",
+                "sequence": 2,
+            },
+        ]
+        batch_data = publisher_store.build_batch_data(events_data)
+        self.assertEqual(batch_data, {
+            "nb_events": 2,
+            "project_id": "project-1",
+            "sequence": 2,
+            "events": events_data,
+        })
+
+    def test_publish_outside_request(self):
+        old_socketio = publisher_store.socketio
+        old_batch_window = config.EVENT_BATCH_WINDOW
+        publisher_store.socketio = SocketIORecorder()
+        config.EVENT_BATCH_WINDOW = 60
+        try:
+            data = {"task_id": "task-1", "project_id": "project-1"}
+            publisher_store.publish("task:update", data)
+            self.assertEqual(
+                publisher_store.socketio.messages,
+                [
+                    ("task:update", "project:project-1"),
+                    ("task:update", publisher_store.ALL_EVENTS_ROOM),
+                ],
+            )
+
+            publisher_store.socketio.messages = []
+            with app.test_request_context():
+                publisher_store.publish("task:update", data)
+            self.assertEqual(
+                publisher_store.socketio.messages,
+                [("task:update", publisher_store.ALL_EVENTS_ROOM)],
+            )
+            publisher_store.flush_batch("project:project-1")
+            self.assertEqual(
+                publisher_store.socketio.messages[-1],
+                ("task:update", "project:project-1"),
+            )
+        finally:
+            publisher_store.flush_batches()
+            publisher_store.socketio = old_socketio
+            config.EVENT_BATCH_WINDOW = old_batch_window
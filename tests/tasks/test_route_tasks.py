@@ -134,6 +134,12 @@ class TaskRoutesTestCase(ApiDBTestCase):
         notifications = notifications_service.get_last_notifications()
         self.assertEqual(len(notifications), 2)
 
+        # Already assigned tasks are returned but not notified again.
+        tasks = self.put("/actions/persons/%s/assign" % person_id, data)
+        self.assertEqual(len(tasks), 2)
+        notifications = notifications_service.get_last_notifications()
+        self.assertEqual(len(notifications), 2)
+
     def test_clear_assignation(self):
         self.generate_fixture_task()
         self.generate_fixture_shot_task()
@@ -1,3 +1,5 @@
+import json
+
 from tests.base import ApiDBTestCase
 
 from zou.app.services import (
@@ -450,6 +452,37 @@ class UserContextRoutesTestCase(ApiDBTestCase):
         self.assertEqual(len(context["search_filters"]), 0)
         self.assertEqual(len(context["custom_actions"]), 0)
 
+    def test_get_context_revalidation(self):
+        response = self.app.get(
+            "/data/user/context", headers=self.base_headers
+        )
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        context = json.loads(response.data.decode("utf-8"))
+
+        headers = dict(self.base_headers)
+        headers["If-None-Match"] = etag
+        response = self.app.get("/data/user/context", headers=headers)
+        self.assertEqual(response.status_code, 304)
+
+        context = self.get(
+            "/data/user/context?studio_version=%s" % context["studio_version"]
+        )
+        self.assertEqual(len(context["projects"]), 1)
+        self.assertFalse("task_types" in context)
+        self.assertFalse("persons" in context)
+
+    def test_get_context_after_studio_change(self):
+        context = self.get("/data/user/context")
+        self.assertEqual(len(context["project_status"]), 2)
+        self.post("/data/project-status", {"name": "Frozen"})
+        context = self.get("/data/user/context")
+        self.assertEqual(len(context["project_status"]), 3)
+
+        tasks_service.get_or_create_status("Retake", "rtk")
+        context = self.get("/data/user/context")
+        self.assertEqual(len(context["task_status"]), 4)
+
     def test_get_metadata_columns(self):
         projects_service.add_metadata_descriptor(
             self.project_id,
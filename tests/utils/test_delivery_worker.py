@@ -0,0 +1,117 @@
+import time
+import unittest
+
+from flask_mail import Mail
+
+from tests.base import ApiTestCase
+
+from zou.app import app
+from zou.app.utils.delivery_worker import DeliveryWorker
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+SMTP_PORT = 10025
+
+
+class MessageCollector(object):
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+@unittest.skipIf(Controller is None, "aiosmtpd is required")
+class DeliveryWorkerTestCase(ApiTestCase):
+
+    def setUp(self):
+        super(DeliveryWorkerTestCase, self).setUp()
+        self.collector = MessageCollector()
+        self.controller = Controller(
+            self.collector, hostname="127.0.0.1", port=SMTP_PORT
+        )
+        self.controller.start()
+        self.old_mail_state = app.extensions["mail"]
+        self.set_mail_state(SMTP_PORT)
+
+    def tearDown(self):
+        app.extensions["mail"] = self.old_mail_state
+        self.controller.stop()
+        super(DeliveryWorkerTestCase, self).tearDown()
+
+    def set_mail_state(self, port):
+        mail_config = dict(app.config)
+        mail_config.update({
+            "MAIL_SERVER": "127.0.0.1",
+            "MAIL_PORT": port,
+            "MAIL_USERNAME": None,
+            "MAIL_USE_TLS": False,
+            "MAIL_USE_SSL": False,
+            "MAIL_SUPPRESS_SEND": False,
+        })
+        app.extensions["mail"] = Mail().init_mail(mail_config)
+
+    def test_send_emails(self):
+        worker = DeliveryWorker(app, Mail(), batch_size=3, idle_timeout=1)
+        for index in range(5):
+            worker.send_email(
+                "Subject %s" % index, "Body", "john.doe@gmail.com"
+            )
+        worker.shutdown()
+        self.assertEqual(len(self.collector.messages), 5)
+        stats = worker.get_stats()
+        self.assertEqual(stats["sent"], 5)
+        self.assertEqual(stats["smtp_connections"], 1)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_retry(self):
+        self.set_mail_state(SMTP_PORT + 1)
+        worker = DeliveryWorker(
+            app,
+            Mail(),
+            max_retries=2,
+            retry_delay=0.01,
+            idle_timeout=1,
+        )
+        worker.send_email("Subject", "Body", "john.doe@gmail.com")
+        start = time.time()
+        while worker.get_stats()["failures"] == 0 and time.time() - start < 5:
+            time.sleep(0.05)
+        worker.shutdown()
+        stats = worker.get_stats()
+        self.assertEqual(stats["sent"], 0)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["failures"], 1)
+
+    def test_retry_does_not_block_queue(self):
+        self.set_mail_state(SMTP_PORT + 1)
+        worker = DeliveryWorker(
+            app,
+            Mail(),
+            max_retries=1,
+            retry_delay=60,
+            idle_timeout=1,
+        )
+        worker.send_email("Subject 1", "Body", "john.doe@gmail.com")
+        start = time.time()
+        while worker.get_stats()["retries"] == 0 and time.time() - start < 5:
+            time.sleep(0.05)
+
+        self.set_mail_state(SMTP_PORT)
+        worker.send_email("Subject 2", "Body", "john.doe@gmail.com")
+        start = time.time()
+        while worker.get_stats()["sent"] == 0 and time.time() - start < 5:
+            time.sleep(0.05)
+        self.assertEqual(worker.get_stats()["sent"], 1)
+        self.assertEqual(worker.get_stats()["queue_depth"], 1)
+
+        worker.shutdown()
+        stats = worker.get_stats()
+        self.assertEqual(stats["sent"], 2)
+        self.assertEqual(stats["failures"], 0)
+        self.assertEqual(len(self.collector.messages), 2)
@@ -0,0 +1,16 @@
+import unittest
+
+from zou.app.utils import event_stream_load
+
+
+class EventStreamLoadTestCase(unittest.TestCase):
+
+    def test_get_percentiles(self):
+        values = list(range(1, 101))
+        percentiles = event_stream_load.get_percentiles(values)
+        self.assertEqual(percentiles["p50"], 51)
+        self.assertEqual(percentiles["p90"], 90)
+        self.assertEqual(percentiles["p99"], 99)
+        self.assertEqual(percentiles["p100"], 100)
+        percentiles = event_stream_load.get_percentiles([])
+        self.assertIsNone(percentiles["p50"])
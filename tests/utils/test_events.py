@@ -1,4 +1,5 @@
 from zou.app.utils import events
+from zou.app.utils.handler_pool import HandlerPool
 from zou.app.services import events_service
 
 from tests.base import ApiDBTestCase
@@ -55,3 +56,29 @@ class EventsTestCase(ApiDBTestCase):
         event_models = events_service.get_last_events()
         self.assertEqual(len(event_models), 4)
         self.assertEqual(event_models[0]["name"], "task:new")
+
+    def test_buffer_events(self):
+        with self.flask_app.test_request_context():
+            events.emit("task:start")
+            events.emit("task:new")
+            events.emit("task:start", persist=False)
+            event_models = events_service.get_last_events()
+            self.assertEqual(len(event_models), 0)
+        event_models = events_service.get_last_events()
+        self.assertEqual(len(event_models), 2)
+        self.assertEqual(event_models[0]["name"], "task:new")
+
+    def test_handler_pool(self):
+        pool = HandlerPool(self.flask_app, 2, 4, 10)
+        futures = [
+            pool.submit("inc_counter", self, {}) for _ in range(10)
+        ]
+        for future in futures:
+            future.result()
+        pool.shutdown()
+        self.assertEqual(self.counter, 11)
+        stats = pool.get_stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertLessEqual(stats["max_queue_depth"], 6)
+        self.assertEqual(stats["handlers"]["inc_counter"]["calls"], 10)
+        self.assertEqual(stats["handlers"]["inc_counter"]["failures"], 0)
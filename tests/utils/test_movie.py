@@ -53,6 +53,43 @@ class MovieTestCase(unittest.TestCase):
         self.assertEqual(width, 320)
         self.assertEqual(height, 240)
 
+    def test_get_movie_info(self):
+        width, height, has_audio = movie.get_movie_info(self.video_only_path)
+        self.assertEqual(width, 320)
+        self.assertEqual(height, 240)
+        self.assertFalse(has_audio)
+
+    def test_get_movie_metadata(self):
+        metadata = movie.get_movie_metadata(self.video_only_path)
+        self.assertEqual(metadata["width"], 320)
+        self.assertEqual(metadata["height"], 240)
+        self.assertEqual(metadata["streams"], ["video"])
+        self.assertFalse(metadata["has_audio"])
+        self.assertIsNone(metadata["audio_codec"])
+        self.assertEqual(metadata["video_codec"], "mpeg4")
+        self.assertGreater(metadata["duration"], 0)
+
+    def test_is_demuxer_compatible(self):
+        info = {
+            "streams": ["video", "audio"],
+            "video_codec": "h264",
+            "audio_codec": "aac",
+            "width": 1920,
+            "height": 1080,
+            "fps": 24.0,
+        }
+        self.assertTrue(movie.is_demuxer_compatible([info, dict(info)]))
+        self.assertFalse(movie.is_demuxer_compatible([info, None]))
+        self.assertFalse(movie.is_demuxer_compatible([]))
+        self.assertFalse(
+            movie.is_demuxer_compatible([info, dict(info, fps=25.0)])
+        )
+        self.assertFalse(
+            movie.is_demuxer_compatible(
+                [info, dict(info, streams=["audio", "video"])]
+            )
+        )
+
     def test_normalize(self):
         filename = "%s.m4v" % inspect.currentframe().f_code.co_name
         video = str(Path(self.tmpdir) / filename)
@@ -60,10 +97,14 @@ class MovieTestCase(unittest.TestCase):
 
         self.assertFalse(movie.has_soundtrack(video))
         width, height = movie.get_movie_size(video)
-        normalized, _, _ = movie.normalize_movie(video, 5, width, height)
+        normalized, low_def, _ = movie.normalize_movie(
+            video, 5, width, height
+        )
 
         # normalization adds an audio stream
         self.assertTrue(movie.has_soundtrack(normalized))
+        self.assertTrue(movie.has_soundtrack(low_def))
+        self.assertEqual(movie.get_movie_size(low_def)[0], 1280)
 
         # dimensions are unchanged
         width_norm, height_norm = movie.get_movie_size(normalized)
@@ -81,8 +122,9 @@ class MovieTestCase(unittest.TestCase):
         self.assertEqual(width/2, width_norm)
         self.assertEqual(height/2, height_norm)
 
-    def concat(self, method, test_name):
+    def concat(self, method, test_name, with_metadata=False):
         videos = []
+        movie_infos = []
         width, height = movie.get_movie_size(self.video_only_path)
         for i in range(0, 2):
             filename = "%s-%s.m4v" % (i, test_name)
@@ -91,12 +133,15 @@ class MovieTestCase(unittest.TestCase):
             normalized, _, _ = movie.normalize_movie(video, 5, width, height)
             # 2nd item isn't used by build_playlist_movie
             videos.append((normalized, None))
+            movie_infos.append(movie.get_movie_metadata(normalized))
 
         out = "out-%s.mp4" % test_name
         out = str(Path(self.tmpdir) / out)
 
-        result = movie.build_playlist_movie(method, videos, out, width, height,
-                                            fps=5)
+        result = movie.build_playlist_movie(
+            method, videos, out, width, height, fps=5,
+            movie_infos=movie_infos if with_metadata else None
+        )
         self.assertTrue(result.get("success"))
         self.assertFalse(result.get("message"))
 
@@ -111,3 +156,7 @@ class MovieTestCase(unittest.TestCase):
     def test_concat_filter(self):
         test_name = inspect.currentframe().f_code.co_name
         self.concat(movie.concat_filter, test_name)
+
+    def test_concat_demuxer_with_metadata(self):
+        test_name = inspect.currentframe().f_code.co_name
+        self.concat(movie.concat_demuxer, test_name, with_metadata=True)
@@ -0,0 +1,32 @@
+import unittest
+
+from zou.app import config
+from zou.app.utils import redis_pools
+
+
+class RedisPoolsTestCase(unittest.TestCase):
+
+    def test_get_client(self):
+        client_a = redis_pools.get_client(config.MEMOIZE_DB_INDEX)
+        client_b = redis_pools.get_client(config.MEMOIZE_DB_INDEX)
+        client_c = redis_pools.get_client(
+            config.MEMOIZE_DB_INDEX, decode_responses=False
+        )
+        self.assertEqual(
+            client_a.connection_pool, client_b.connection_pool
+        )
+        self.assertNotEqual(
+            client_a.connection_pool, client_c.connection_pool
+        )
+
+    def test_get_pool_stats(self):
+        redis_pools.get_pool(config.KV_JOB_DB_INDEX)
+        stats = [
+            pool_stats
+            for pool_stats in redis_pools.get_pool_stats()
+            if pool_stats["db"] == config.KV_JOB_DB_INDEX
+        ]
+        self.assertEqual(
+            stats[0]["max_connections"], config.KV_MAX_CONNECTIONS
+        )
+        self.assertEqual(stats[0]["in_use_connections"], 0)
@@ -48,6 +48,13 @@ mail = Mail()
 mail.init_app(app)  # To send emails
 
 
+@app.teardown_request
+def flush_events(exception=None):
+    from zou.app.utils import events
+
+    events.flush_buffered_events()
+
+
 @app.teardown_appcontext
 def shutdown_session(exception=None):
     db.session.remove()
@@ -9,6 +9,7 @@ from .resources import (
     SceneAssetInstancesResource,
     SceneCameraInstancesResource,
     CastingResource,
+    ProjectCastInResource,
     AssetTypeCastingResource,
     SequenceCastingResource,
 )
@@ -27,6 +28,7 @@ routes = [
         "/data/projects/<project_id>/sequences/<sequence_id>/casting",
         SequenceCastingResource,
     ),
+    ("/data/projects/<project_id>/cast-in", ProjectCastInResource),
     ("/data/projects/<project_id>/entity-links", ProjectEntityLinksResource),
     ("/data/projects/<project_id>/entity-links/<entity_link_id>", ProjectEntityLinkResource),
     ("/data/scenes/<scene_id>/asset-instances", SceneAssetInstancesResource),
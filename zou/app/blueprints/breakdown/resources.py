@@ -58,6 +58,18 @@ class AssetTypeCastingResource(Resource):
         )
 
 
+class ProjectCastInResource(Resource):
+    @jwt_required
+    def get(self, project_id):
+        """
+        Resource to retrieve, for every asset of given project, the shots and
+        assets where it is casted in.
+        """
+        user_service.check_project_access(project_id)
+        projects_service.get_project(project_id)
+        return breakdown_service.get_project_cast_in(project_id)
+
+
 class ShotAssetInstancesResource(Resource, ArgsMixin):
     @jwt_required
     def get(self, shot_id):
@@ -136,22 +136,7 @@ class CommentManyTasksResource(Resource):
             user_service.check_manager_project_access(project_id)
         except permissions.PermissionDenied:
             comments = self.get_allowed_comments_only(comments, person_id)
-        result = []
-        for comment in comments:
-            try:
-                comment = comments_service.create_comment(
-                    person_id,
-                    comment["object_id"],
-                    comment["task_status_id"],
-                    comment["comment"],
-                    [],
-                    {},
-                    None
-                )
-                result.append(comment)
-            except KeyError:
-                pass
-        return result, 201
+        return comments_service.create_comments(person_id, comments), 201
 
     def get_allowed_comments_only(self, comments, person_id):
         allowed_comments = []
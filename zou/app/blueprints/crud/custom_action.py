@@ -15,6 +15,7 @@ class CustomActionsResource(BaseModelsResource):
 
     def post_creation(self, custom_action):
         custom_actions_service.clear_custom_action_cache()
+        user_service.clear_studio_context_cache()
         return custom_action.serialize()
 
 
@@ -24,8 +25,10 @@ class CustomActionResource(BaseModelResource):
 
     def post_update(self, custom_action):
         custom_actions_service.clear_custom_action_cache()
+        user_service.clear_studio_context_cache()
         return custom_action
 
     def post_delete(self, custom_action):
         custom_actions_service.clear_custom_action_cache()
+        user_service.clear_studio_context_cache()
         return custom_action
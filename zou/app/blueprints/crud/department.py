@@ -2,7 +2,7 @@ from .base import BaseModelResource, BaseModelsResource
 
 from zou.app.models.department import Department
 
-from zou.app.services import tasks_service
+from zou.app.services import tasks_service, user_service
 
 
 class DepartmentsResource(BaseModelsResource):
@@ -14,6 +14,7 @@ class DepartmentsResource(BaseModelsResource):
 
     def post_creation(self, instance):
         tasks_service.clear_department_cache(str(instance.id))
+        user_service.clear_studio_context_cache()
         return instance.serialize()
 
     def update_data(self, data):
@@ -44,6 +45,8 @@ class DepartmentResource(BaseModelResource):
         return data
     def post_update(self, instance_dict):
         tasks_service.clear_department_cache(instance_dict["id"])
+        user_service.clear_studio_context_cache()
 
     def post_delete(self, instance_dict):
         tasks_service.clear_department_cache(instance_dict["id"])
+        user_service.clear_studio_context_cache()
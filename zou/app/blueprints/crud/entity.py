@@ -9,6 +9,7 @@ from zou.app.models.entity import Entity, EntityVersion
 from zou.app.models.subscription import Subscription
 from zou.app.services import (
     assets_service,
+    breakdown_service,
     persons_service,
     shots_service,
     user_service
@@ -88,6 +89,7 @@ class EntityResource(BaseModelResource, EntityEventMixin):
     def pre_delete(self, entity):
         if shots_service.is_sequence(entity):
             Subscription.delete_all_by(entity_id=entity["id"])
+        breakdown_service.clear_casting_cache_for_entity(entity["id"])
         return entity
 
     @jwt_required
@@ -114,6 +116,7 @@ class EntityResource(BaseModelResource, EntityEventMixin):
                 data["source_id"] = None
             entity.update(data)
             entity_dict = entity.serialize()
+            breakdown_service.clear_casting_cache_for_entity(entity.id)
 
             if shots_service.is_shot(entity_dict):
                 shots_service.clear_shot_cache(entity_dict["id"])
@@ -2,7 +2,7 @@ from .base import BaseModelResource, BaseModelsResource
 
 from zou.app.models.entity_type import EntityType
 from zou.app.utils import events
-from zou.app.services import entities_service, assets_service
+from zou.app.services import entities_service, assets_service, user_service
 
 
 class EntityTypesResource(BaseModelsResource):
@@ -17,6 +17,7 @@ class EntityTypesResource(BaseModelsResource):
 
     def post_creation(self, instance):
         assets_service.clear_asset_type_cache()
+        user_service.clear_studio_context_cache()
         return instance.serialize()
 
 
@@ -36,7 +37,9 @@ class EntityTypeResource(BaseModelResource):
     def post_update(self, instance_dict):
         entities_service.clear_entity_type_cache(instance_dict["id"])
         assets_service.clear_asset_type_cache()
+        user_service.clear_studio_context_cache()
 
     def post_delete(self, instance_dict):
         entities_service.clear_entity_type_cache(instance_dict["id"])
         assets_service.clear_asset_type_cache()
+        user_service.clear_studio_context_cache()
@@ -1,4 +1,5 @@
 from zou.app.models.notification import Notification
+from zou.app.services import notifications_service
 from zou.app.utils import permissions
 
 from .base import BaseModelResource, BaseModelsResource
@@ -11,6 +12,12 @@ class NotificationsResource(BaseModelsResource):
     def check_create_permissions(self, data):
         return permissions.check_admin_permissions()
 
+    def post_creation(self, instance):
+        notifications_service.clear_unread_notifications_counts(
+            [instance.person_id]
+        )
+        return instance.serialize()
+
 
 class NotificationResource(BaseModelResource):
     def __init__(self):
@@ -24,3 +31,15 @@ class NotificationResource(BaseModelResource):
 
     def check_delete_permissions(self, instance):
         return permissions.check_admin_permissions()
+
+    def post_update(self, instance_dict):
+        notifications_service.clear_unread_notifications_counts(
+            [instance_dict["person_id"]]
+        )
+        return instance_dict
+
+    def post_delete(self, instance_dict):
+        notifications_service.clear_unread_notifications_counts(
+            [instance_dict["person_id"]]
+        )
+        return instance_dict
@@ -1,6 +1,7 @@
 from flask_jwt_extended import jwt_required
 from flask_restful import reqparse
 
+from zou.app import config
 from zou.app.models.project import Project
 from zou.app.models.project_status import ProjectStatus
 from zou.app.services import (
@@ -88,6 +89,11 @@ class ProjectResource(BaseModelResource):
         else:
             self.check_delete_permissions(project_dict)
             if args["force"] == True:
+                if config.ENABLE_JOB_QUEUE:
+                    progress = deletion_service.queue_project_deletion(
+                        instance_id
+                    )
+                    return progress, 202
                 deletion_service.remove_project(instance_id)
             else:
                 project.delete()
@@ -1,4 +1,5 @@
 from zou.app.models.project_status import ProjectStatus
+from zou.app.services import projects_service
 from .base import BaseModelResource, BaseModelsResource
 
 
@@ -9,6 +10,10 @@ class ProjectStatussResource(BaseModelsResource):
     def check_read_permissions(self):
         return True
 
+    def post_creation(self, instance):
+        projects_service.clear_project_status_cache()
+        return instance.serialize()
+
 
 class ProjectStatusResource(BaseModelResource):
     def __init__(self):
@@ -16,3 +21,9 @@ class ProjectStatusResource(BaseModelResource):
 
     def check_read_permissions(self, instance):
         return True
+
+    def post_update(self, instance_dict):
+        projects_service.clear_project_status_cache()
+
+    def post_delete(self, instance_dict):
+        projects_service.clear_project_status_cache()
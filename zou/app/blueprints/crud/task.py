@@ -8,7 +8,12 @@ from zou.app.models.person import Person
 from zou.app.models.project import Project
 from zou.app.models.task import Task
 
-from zou.app.services import user_service, tasks_service, deletion_service
+from zou.app.services import (
+    deletion_service,
+    persons_service,
+    tasks_service,
+    user_service,
+)
 from zou.app.utils import permissions
 
 from .base import BaseModelsResource, BaseModelResource
@@ -49,6 +54,9 @@ class TasksResource(BaseModelsResource):
             if assignees is not None:
                 instance.assignees = persons
             instance.save()
+            if assignees is not None:
+                for person in persons:
+                    persons_service.clear_access_snapshot(person.id)
 
             return tasks_service.get_task_with_relations(str(instance.id)), 201
 
@@ -74,8 +82,22 @@ class TaskResource(BaseModelResource):
     def check_delete_permissions(self, task):
         user_service.check_manager_project_access(task["project_id"])
 
+    def pre_update(self, instance_dict, data):
+        self.previous_assignee_ids = self.get_assignee_ids(instance_dict["id"])
+
     def post_update(self, instance_dict):
         tasks_service.clear_task_cache(instance_dict["id"])
+        # Only assignees snapshots list the task entity. People removed from
+        # the task lose access to it.
+        person_ids = self.previous_assignee_ids | self.get_assignee_ids(
+            instance_dict["id"]
+        )
+        for person_id in person_ids:
+            persons_service.clear_access_snapshot(person_id)
+
+    def get_assignee_ids(self, task_id):
+        task = tasks_service.get_task_raw(task_id)
+        return set(str(person.id) for person in task.assignees)
 
     @jwt_required
     def delete(self, instance_id):
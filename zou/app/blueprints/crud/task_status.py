@@ -1,5 +1,5 @@
 from zou.app.models.task_status import TaskStatus
-from zou.app.services import tasks_service
+from zou.app.services import tasks_service, user_service
 from .base import BaseModelResource, BaseModelsResource
 
 
@@ -12,6 +12,7 @@ class TaskStatusesResource(BaseModelsResource):
 
     def post_creation(self, instance):
         tasks_service.clear_task_status_cache(str(instance.id))
+        user_service.clear_studio_context_cache()
         return instance.serialize()
 
 
@@ -24,6 +25,8 @@ class TaskStatusResource(BaseModelResource):
 
     def post_update(self, instance_dict):
         tasks_service.clear_task_status_cache(instance_dict["id"])
+        user_service.clear_studio_context_cache()
 
     def post_delete(self, instance_dict):
         tasks_service.clear_task_status_cache(instance_dict["id"])
+        user_service.clear_studio_context_cache()
@@ -1,6 +1,6 @@
 from zou.app.models.task_type import TaskType
 from zou.app.services.exception import ArgumentsException
-from zou.app.services import tasks_service
+from zou.app.services import tasks_service, user_service
 
 from .base import BaseModelResource, BaseModelsResource
 
@@ -23,6 +23,7 @@ class TaskTypesResource(BaseModelsResource):
 
     def post_creation(self, instance):
         tasks_service.clear_task_type_cache(str(instance.id))
+        user_service.clear_studio_context_cache()
         return instance.serialize()
 
 
@@ -45,6 +46,8 @@ class TaskTypeResource(BaseModelResource):
 
     def post_update(self, instance_dict):
         tasks_service.clear_task_type_cache(instance_dict["id"])
+        user_service.clear_studio_context_cache()
 
     def post_delete(self, instance_dict):
         tasks_service.clear_task_type_cache(instance_dict["id"])
+        user_service.clear_studio_context_cache()
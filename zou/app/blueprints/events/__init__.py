@@ -1,11 +1,16 @@
 from flask import Blueprint
 from zou.app.utils.api import configure_api_from_blueprint
 
-from .resources import EventsResource, LoginLogsResource
+from .resources import (
+    EventsResource,
+    LoginLogsResource,
+    ProjectEventsReplayResource,
+)
 
 routes = [
     ("/data/events/last", EventsResource),
     ("/data/events/login-logs/last", LoginLogsResource),
+    ("/data/events/projects/<project_id>/replay", ProjectEventsReplayResource),
 ]
 
 blueprint = Blueprint("events", "events")
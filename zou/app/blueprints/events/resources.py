@@ -4,7 +4,7 @@ from flask_jwt_extended import jwt_required
 from zou.app.mixin import ArgsMixin
 from zou.app.utils import fields, permissions
 
-from zou.app.services import events_service
+from zou.app.services import events_service, user_service
 from zou.app.services.exception import WrongParameterException
 
 
@@ -38,6 +38,31 @@ class EventsResource(Resource, ArgsMixin):
             )
 
 
+class ProjectEventsReplayResource(Resource, ArgsMixin):
+    """
+    Return events of given project published after given sequence number. It
+    allows clients to catch up after a lost connection to the event stream.
+    """
+
+    @jwt_required
+    def get(self, project_id):
+        args = self.get_args([
+            ("after", 0, False),
+            ("limit", 1000, False),
+        ])
+        user_service.check_project_access(project_id)
+        try:
+            after = int(args["after"])
+            limit = min(int(args["limit"]), 1000)
+        except ValueError:
+            raise WrongParameterException(
+                "The after and limit parameters must be integers"
+            )
+        return events_service.get_project_events_after(
+            project_id, after, limit=limit
+        )
+
+
 class LoginLogsResource(Resource, ArgsMixin):
     @jwt_required
     def get(self):
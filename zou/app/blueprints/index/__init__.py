@@ -7,8 +7,11 @@ from zou.app.utils.api import configure_api_from_blueprint
 
 from .resources import (
     ConfigResource,
+    DeliveryStatusResource,
+    EventHandlersStatusResource,
     IndexResource,
     InfluxStatusResource,
+    KeyValueStoreStatusResource,
     StatusResource,
     StatsResource,
     TxtStatusResource,
@@ -19,6 +22,9 @@ routes = [
     ("/status", StatusResource),
     ("/status/influx", InfluxStatusResource),
     ("/status.txt", TxtStatusResource),
+    ("/status/event-handlers", EventHandlersStatusResource),
+    ("/status/delivery", DeliveryStatusResource),
+    ("/status/key-value-store", KeyValueStoreStatusResource),
     ("/stats", StatsResource),
     ("/config", ConfigResource),
 ]
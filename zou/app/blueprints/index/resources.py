@@ -8,7 +8,13 @@ from flask_restful import Resource
 from zou import __version__
 
 from zou.app import app, config
-from zou.app.utils import permissions, shell
+from zou.app.utils import (
+    delivery_worker,
+    handler_pool,
+    permissions,
+    redis_pools,
+    shell,
+)
 from zou.app.services import projects_service, stats_service
 
 from flask_jwt_extended import jwt_required
@@ -29,14 +35,8 @@ class BaseStatusResource(Resource):
 
         is_kv_up = True
         try:
-            store = redis.StrictRedis(
-                host=config.KEY_VALUE_STORE["host"],
-                port=config.KEY_VALUE_STORE["port"],
-                db=config.AUTH_TOKEN_BLACKLIST_KV_INDEX,
-                decode_responses=True,
-            )
-            store.get("test")
-        except redis.ConnectionError:
+            redis_pools.get_client(config.AUTH_TOKEN_BLACKLIST_KV_INDEX).ping()
+        except (redis.ConnectionError, redis.TimeoutError):
             is_kv_up = False
 
         is_es_up = True
@@ -135,6 +135,44 @@ class StatsResource(Resource):
         return stats_service.get_main_stats()
 
 
+class EventHandlersStatusResource(Resource):
+    """
+    Return counters of the in-process event handler pool: queue depth and
+    latency of each handler.
+    """
+
+    @jwt_required
+    def get(self):
+        if not permissions.has_admin_permissions():
+            abort(403)
+        return handler_pool.get_stats()
+
+
+class DeliveryStatusResource(Resource):
+    """
+    Return counters of the email and Slack delivery worker: queue depth,
+    number of messages sent and send latencies.
+    """
+
+    @jwt_required
+    def get(self):
+        if not permissions.has_admin_permissions():
+            abort(403)
+        return delivery_worker.get_stats()
+
+
+class KeyValueStoreStatusResource(Resource):
+    """
+    Return usage of the Redis connection pools of the current process.
+    """
+
+    @jwt_required
+    def get(self):
+        if not permissions.has_admin_permissions():
+            abort(403)
+        return redis_pools.get_pool_stats()
+
+
 class ConfigResource(Resource):
     def get(self):
         return {
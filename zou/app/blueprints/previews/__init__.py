@@ -21,6 +21,8 @@ from .resources import (
     LegacySetMainPreviewResource,
     SetMainPreviewResource,
     UpdatePreviewPositionResource,
+    PreviewFileTranscodingResource,
+    CancelPreviewFileTranscodingResource,
 )
 
 routes = [
@@ -93,7 +95,15 @@ routes = [
     (
         "/actions/preview-files/<preview_file_id>/update-position",
         UpdatePreviewPositionResource,
-    )
+    ),
+    (
+        "/data/preview-files/<preview_file_id>/transcoding",
+        PreviewFileTranscodingResource,
+    ),
+    (
+        "/actions/preview-files/<preview_file_id>/cancel-transcoding",
+        CancelPreviewFileTranscodingResource,
+    ),
 ]
 blueprint = Blueprint("thumbnails", "thumbnails")
 api = configure_api_from_blueprint(blueprint, routes)
@@ -20,9 +20,9 @@ from zou.app.services import (
     preview_files_service,
     shots_service,
     tasks_service,
+    transcoding_service,
     user_service,
 )
-from zou.app.stores import queue_store
 from zou.app.utils import (
     fs,
     events,
@@ -204,8 +204,11 @@ class CreatePreviewFilePictureResource(Resource, ArgsMixin):
             return preview_file, 201
 
         elif extension in ALLOWED_MOVIE_EXTENSION:
+            priority = transcoding_service.check_priority(
+                self.get_priority(transcoding_service.DEFAULT_PRIORITY)
+            )
             try:
-                self.save_movie_preview(instance_id, uploaded_file)
+                self.save_movie_preview(instance_id, uploaded_file, priority)
             except Exception as e:
                 current_app.logger.error(e, exc_info=1)
                 current_app.logger.error("Normalization failed.")
@@ -252,10 +255,16 @@ class CreatePreviewFilePictureResource(Resource, ArgsMixin):
             original_tmp_path
         )
 
-    def save_movie_preview(self, preview_file_id, uploaded_file):
+    def save_movie_preview(
+        self,
+        preview_file_id,
+        uploaded_file,
+        priority=transcoding_service.DEFAULT_PRIORITY,
+    ):
         """
         Get uploaded movie, normalize it then build thumbnails then save
-        everything in the file storage.
+        everything in the file storage. When the job queue is enabled, the
+        work is done by the transcoding workers, with given priority.
         """
         no_job = self.get_no_job()
         tmp_folder = current_app.config["TMP_DIR"]
@@ -263,10 +272,8 @@ class CreatePreviewFilePictureResource(Resource, ArgsMixin):
             tmp_folder, preview_file_id, uploaded_file
         )
         if config.ENABLE_JOB_QUEUE and not no_job:
-            queue_store.job_queue.enqueue(
-                preview_files_service.prepare_and_store_movie,
-                args=(preview_file_id, uploaded_movie_path),
-                job_timeout=600,
+            transcoding_service.queue_movie_transcoding(
+                preview_file_id, uploaded_movie_path, priority
             )
         else:
             preview_files_service.prepare_and_store_movie(
@@ -780,3 +787,34 @@ class UpdatePreviewPositionResource(Resource, ArgsMixin):
         return preview_files_service.update_preview_file_position(
             preview_file_id, args["position"]
         )
+
+
+class PreviewFileTranscodingResource(Resource):
+    """
+    Return transcoding status of given movie preview: status of the preview
+    file and, while it's handled by the transcoding workers, job status,
+    priority, current step and position in the queues.
+    """
+
+    @jwt_required
+    def get(self, preview_file_id):
+        preview_file = files_service.get_preview_file(preview_file_id)
+        task = tasks_service.get_task(preview_file["task_id"])
+        user_service.check_project_access(task["project_id"])
+        user_service.check_entity_access(task["entity_id"])
+        return transcoding_service.get_transcoding_status(preview_file_id)
+
+
+class CancelPreviewFileTranscodingResource(Resource):
+    """
+    Cancel the transcoding of given movie preview if it's still queued. The
+    preview file is then marked as broken.
+    """
+
+    @jwt_required
+    def post(self, preview_file_id):
+        preview_file = files_service.get_preview_file(preview_file_id)
+        task = tasks_service.get_task(preview_file["task_id"])
+        user_service.check_project_access(task["project_id"])
+        user_service.check_entity_access(task["entity_id"])
+        return transcoding_service.cancel_transcoding(preview_file_id)
@@ -21,6 +21,7 @@ from .resources import (
     ProductionEpisodesScheduleItemsResource,
     ProductionSequencesScheduleItemsResource,
     ProductionTimeSpentsResource,
+    ProductionDeletionProgressResource,
 )
 
 routes = [
@@ -85,6 +86,10 @@ routes = [
         ProductionSequencesScheduleItemsResource,
     ),
     ("/data/projects/<project_id>/time-spents", ProductionTimeSpentsResource),
+    (
+        "/data/projects/<project_id>/deletion-progress",
+        ProductionDeletionProgressResource,
+    ),
 ]
 
 blueprint = Blueprint("projects", "projects")
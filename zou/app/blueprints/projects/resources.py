@@ -5,6 +5,7 @@ from flask import request
 
 from zou.app.mixin import ArgsMixin
 from zou.app.services import (
+    deletion_service,
     projects_service,
     schedule_service,
     tasks_service,
@@ -345,3 +346,21 @@ class ProductionSequencesScheduleItemsResource(Resource):
         return schedule_service.get_sequences_schedule_items(
             project_id, task_type_id
         )
+
+
+class ProductionDeletionProgressResource(Resource):
+    """
+    Return the progress of the deletion of given production: status, current
+    step and number of files removed from the storage.
+    """
+
+    @jwt_required
+    def get(self, project_id):
+        permissions.check_admin_permissions()
+        progress = deletion_service.get_project_deletion_progress(project_id)
+        if progress is None:
+            return {
+                "error": True,
+                "message": "No deletion running for this production",
+            }, 404
+        return progress
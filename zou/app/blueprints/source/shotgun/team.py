@@ -1,8 +1,11 @@
+from flask import request
 from flask_restful import current_app
+from flask_jwt_extended import jwt_required
 
 from zou.app.models.project import Project
 from zou.app.models.project import ProjectPersonLink
 from zou.app.models.person import Person
+from zou.app.services import persons_service, projects_service
 
 from zou.app.blueprints.source.shotgun.base import (
     BaseImportShotgunResource,
@@ -40,6 +43,7 @@ class ImportShotgunProjectConnectionsResource(BaseImportShotgunResource):
             if project is not None and person is not None:
                 project.team.append(person)
                 project.save()
+                persons_service.clear_access_snapshot(person.id)
                 current_app.logger.info(
                     "Project Person Link created: %s" % project
                 )
@@ -54,4 +58,28 @@ class ImportRemoveShotgunProjectConnectionResource(
     ImportRemoveShotgunBaseResource
 ):
     def __init__(self):
-        ImportRemoveShotgunBaseResource.__init__(self, ProjectPersonLink)
+        ImportRemoveShotgunBaseResource.__init__(
+            self, ProjectPersonLink, self.delete_func
+        )
+
+    @jwt_required
+    def post(self):
+        sg_model = request.json
+        project_person_link = self.get_instance(sg_model)
+        if project_person_link is not None:
+            return {
+                "removed_instance_id": str(project_person_link.person_id),
+                "success": self.delete_instance(project_person_link),
+            }
+        else:
+            return {"success": True}
+
+    def get_instance(self, sg_model):
+        return ProjectPersonLink.query.filter(
+            ProjectPersonLink.shotgun_id == sg_model["id"]
+        ).first()
+
+    def delete_func(self, project_person_link):
+        projects_service.remove_team_member(
+            project_person_link.project_id, project_person_link.person_id
+        )
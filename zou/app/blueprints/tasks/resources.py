@@ -342,7 +342,7 @@ class ClearAssignationResource(Resource):
 class TasksAssignResource(Resource):
     """
     Assign given task lists to given person. If a given task ID is wrong,
-    it ignores it.
+    it ignores it. Only newly assigned tasks are notified.
     """
 
     @jwt_required
@@ -353,19 +353,22 @@ class TasksAssignResource(Resource):
             task = tasks_service.get_task(task_ids[0])
             user_service.check_manager_project_access(task["project_id"])
 
+        try:
+            assigned_tasks = tasks_service.assign_tasks(task_ids, person_id)
+        except PersonNotFoundException:
+            return {"error": "Assignee doesn't exist in database."}, 400
+
+        author = persons_service.get_current_user()
+        notifications_service.create_assignation_notifications(
+            assigned_tasks, person_id, author["id"]
+        )
+
         tasks = []
         for task_id in task_ids:
             try:
-                task = self.assign_task(task_id, person_id)
-                author = persons_service.get_current_user()
-                notifications_service.create_assignation_notification(
-                    task_id, person_id, author["id"]
-                )
-                tasks.append(task)
+                tasks.append(tasks_service.get_task(task_id))
             except TaskNotFoundException:
                 pass
-            except PersonNotFoundException:
-                return {"error": "Assignee doesn't exist in database."}, 400
 
         if len(tasks) > 0:
             projects_service.add_team_member(tasks[0]["project_id"], person_id)
@@ -383,9 +386,6 @@ class TasksAssignResource(Resource):
         args = parser.parse_args()
         return args["task_ids"]
 
-    def assign_task(self, task_id, person_id):
-        return tasks_service.assign_task(task_id, person_id)
-
 
 class TaskAssignResource(Resource):
     """
@@ -1,6 +1,6 @@
 import datetime
 
-from flask import request, abort
+from flask import abort, jsonify, request
 from flask_restful import Resource, reqparse
 from flask_jwt_extended import jwt_required
 
@@ -448,9 +448,17 @@ class DayOffResource(Resource):
 class ContextResource(Resource):
     """
     Return context required to run properly a full app connected to
-    the API (like the Kitsu web client).
+    the API (like the Kitsu web client). The studio wide part is omitted
+    when the client gives the current studio version. Responses come with
+    an ETag: if the context didn't change, a 304 response is returned.
     """
 
     @jwt_required
     def get(self):
-        return user_service.get_context()
+        context = user_service.get_context(
+            studio_version=request.args.get("studio_version", None)
+        )
+        response = jsonify(context)
+        response.set_etag(user_service.get_context_hash(context))
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response.make_conditional(request)
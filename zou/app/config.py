@@ -17,12 +17,19 @@ KEY_VALUE_STORE = {
     "host": os.getenv("KV_HOST", "localhost"),
     "port": os.getenv("KV_PORT", "6379"),
 }
+KV_MAX_CONNECTIONS = int(os.getenv("KV_MAX_CONNECTIONS", 50))
+KV_POOL_TIMEOUT = float(os.getenv("KV_POOL_TIMEOUT", 5))
+KV_SOCKET_TIMEOUT = float(os.getenv("KV_SOCKET_TIMEOUT", 5))
+KV_SOCKET_CONNECT_TIMEOUT = float(os.getenv("KV_SOCKET_CONNECT_TIMEOUT", 2))
+KV_HEALTH_CHECK_INTERVAL = int(os.getenv("KV_HEALTH_CHECK_INTERVAL", 30))
 AUTH_TOKEN_BLACKLIST_KV_INDEX = 0
 MEMOIZE_DB_INDEX = 1
 KV_EVENTS_DB_INDEX = 2
 KV_JOB_DB_INDEX = 3
+KV_NOTIFICATIONS_DB_INDEX = 4
 
 JWT_BLACKLIST_ENABLED = True
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", 30))
 JWT_BLACKLIST_TOKEN_CHECKS = ["access", "refresh"]
 JWT_ACCESS_TOKEN_EXPIRES = datetime.timedelta(days=7)
 JWT_REFRESH_TOKEN_EXPIRES = datetime.timedelta(days=15)
@@ -55,9 +62,20 @@ TMP_DIR = os.getenv("TMP_DIR", os.path.join(os.sep, "tmp", "zou"))
 
 EVENT_STREAM_HOST = os.getenv("EVENT_STREAM_HOST", "localhost")
 EVENT_STREAM_PORT = os.getenv("EVENT_STREAM_PORT", 5001)
+EVENT_BATCH_WINDOW = float(os.getenv("EVENT_BATCH_WINDOW", 0.1))
+EVENT_HISTORY_SIZE = int(os.getenv("EVENT_HISTORY_SIZE", 1000))
 EVENT_HANDLERS_FOLDER = os.getenv(
     "EVENT_HANDLERS_FOLDER", os.path.join(os.getcwd(), "event_handlers")
 )
+EVENT_HANDLERS_POOL_SIZE = int(os.getenv("EVENT_HANDLERS_POOL_SIZE", 0))
+EVENT_HANDLERS_QUEUE_SIZE = int(os.getenv("EVENT_HANDLERS_QUEUE_SIZE", 100))
+EVENT_HANDLERS_TIMEOUT = float(os.getenv("EVENT_HANDLERS_TIMEOUT", 10))
+
+# Due digests are sent by the send_notification_digests command, that must
+# run periodically (see README).
+NOTIFICATION_DIGEST_WINDOW = float(
+    os.getenv("NOTIFICATION_DIGEST_WINDOW", 0)
+)
 
 MAIL_SERVER = os.getenv("MAIL_SERVER", "localhost")
 MAIL_PORT = os.getenv("MAIL_PORT", 25)
@@ -67,6 +85,13 @@ MAIL_DEBUG = os.getenv("MAIL_DEBUG", 0) != 0
 MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "False").lower() == "true"
 MAIL_USE_SSL = os.getenv("MAIL_USE_SSL", "False").lower() == "true"
 MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER", "no-reply@cg-wire.com")
+MAIL_DELIVERY_BATCH_SIZE = int(os.getenv("MAIL_DELIVERY_BATCH_SIZE", 50))
+MAIL_DELIVERY_RATE = float(os.getenv("MAIL_DELIVERY_RATE", 10))
+MAIL_DELIVERY_MAX_RETRIES = int(os.getenv("MAIL_DELIVERY_MAX_RETRIES", 3))
+MAIL_DELIVERY_RETRY_DELAY = float(os.getenv("MAIL_DELIVERY_RETRY_DELAY", 2))
+MAIL_DELIVERY_IDLE_TIMEOUT = float(
+    os.getenv("MAIL_DELIVERY_IDLE_TIMEOUT", 30)
+)
 if os.getenv("MAIL_SUPPRESS_SEND") is not None:
     MAIL_SUPPRESS_SEND = os.getenv("MAIL_SUPPRESS_SEND")
 DOMAIN_NAME = os.getenv("DOMAIN_NAME", "localhost:8080")
@@ -93,6 +118,8 @@ ENABLE_JOB_QUEUE_REMOTE = os.getenv(
 ).lower() == "true"
 JOB_QUEUE_NOMAD_PLAYLIST_JOB = "zou-playlist"
 JOB_QUEUE_NOMAD_HOST = "zou-nomad-01.zou"
+TRANSCODING_CONCURRENCY = int(os.getenv("TRANSCODING_CONCURRENCY", 1))
+TRANSCODING_JOB_TIMEOUT = int(os.getenv("TRANSCODING_JOB_TIMEOUT", 600))
 
 
 LDAP_HOST = os.getenv("LDAP_HOST", "127.0.0.1")
@@ -78,6 +78,13 @@ class ArgsMixin(object):
         options = request.args
         return options.get("no_job", "false") == "true"
 
+    def get_priority(self, default="normal"):
+        """
+        Returns priority parameter.
+        """
+        options = request.args
+        return options.get("priority", default)
+
     def parse_date_parameter(self, param):
         date = None
         if param is None:
@@ -39,6 +39,11 @@ class EntityLink(db.Model, BaseMixin, SerializerMixin):
             "entity_out_id",
             name="entity_link_uc",
         ),
+        db.Index(
+            "ix_entity_link_entity_out_id_entity_in_id",
+            "entity_out_id",
+            "entity_in_id",
+        ),
     )
 
     @classmethod
@@ -1,3 +1,7 @@
+import datetime
+
+from sqlalchemy import DDL, event
+from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy_utils import UUIDType
 
 from zou.app import db
@@ -11,8 +15,19 @@ class ApiEvent(db.Model, BaseMixin, SerializerMixin):
     """
     Represent notable events occuring on database (asset creation,
     task assignation, etc.).
+
+    On PostgreSQL 11 and later, events are stored in a table partitioned by
+    month on the creation date. Monthly partitions are managed by the events
+    service, rows that don't fit in any of them are stored in the default
+    partition. On older versions, the table is not partitioned.
     """
 
+    created_at = db.Column(
+        db.DateTime,
+        default=datetime.datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
     name = db.Column(db.String(80), nullable=False, index=True)
     user_id = db.Column(
         UUIDType(binary=False), db.ForeignKey("person.id"), index=True
@@ -21,3 +36,50 @@ class ApiEvent(db.Model, BaseMixin, SerializerMixin):
         UUIDType(binary=False), db.ForeignKey("project.id"), index=True
     )
     data = db.Column(JSONB)
+
+    @declared_attr
+    def __mapper_args__(cls):
+        # The primary key of a partitioned table includes the creation date.
+        # For the ORM, the id column is enough to identify an event.
+        return {"primary_key": [cls.__table__.c.id]}
+
+
+
+def is_partitioning_supported(connection):
+    """
+    Declarative partitioning with a default partition and foreign keys
+    requires PostgreSQL 11.
+    """
+    return (
+        connection.dialect.name == "postgresql" and
+        connection.dialect.server_version_info >= (11,)
+    )
+
+
+@event.listens_for(ApiEvent.__table__, "before_create")
+def set_partitioning(table, connection, **kw):
+    """
+    The model primary key is the id column, as on tables that are not
+    partitioned. The partition key must be part of the primary key of a
+    partitioned table, so the creation date is added to it in that case.
+    """
+    if is_partitioning_supported(connection):
+        if table.c.created_at not in table.primary_key.columns:
+            table.primary_key._reload([table.c.created_at])
+        partition_by = "RANGE (created_at)"
+    else:
+        partition_by = None
+    table.dialect_options["postgresql"]["partition_by"] = partition_by
+
+
+event.listen(
+    ApiEvent.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS api_event_default "
+        "PARTITION OF api_event DEFAULT"
+    ).execute_if(
+        callable_=lambda ddl, target, bind, **kw:
+            is_partitioning_supported(bind)
+    ),
+)
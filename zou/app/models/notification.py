@@ -54,6 +54,12 @@ class Notification(db.Model, BaseMixin, SerializerMixin):
             "type",
             name="notification_uc",
         ),
+        db.Index(
+            "ix_notification_person_id_read_created_at",
+            "person_id",
+            "read",
+            "created_at",
+        ),
     )
 
     def serialize(self, obj_type=None, relations=False):
@@ -31,6 +31,7 @@ class PreviewFile(db.Model, BaseMixin, SerializerMixin):
     file_size = db.Column(db.Integer(), default=0)
     status = db.Column(ChoiceType(STATUSES), default="processing")
     annotations = db.Column(JSONB)
+    movie_info = db.Column(JSONB)
 
     task_id = db.Column(
         UUIDType(binary=False), db.ForeignKey("task.id"), index=True
@@ -409,6 +409,10 @@ def get_or_create_asset_type(name):
     if asset_type is None:
         asset_type = EntityType.create(name=name)
         clear_asset_type_cache()
+        # The studio context embeds the asset type list.
+        from zou.app.services import user_service
+
+        user_service.clear_studio_context_cache()
 
         events.emit(
             "asset-type:new", {"name": asset_type.name, "id": asset_type.id}
@@ -504,8 +508,11 @@ def create_asset(
 
 
 def update_asset(asset_id, data):
+    from zou.app.services import breakdown_service
+
     asset = get_asset_raw(asset_id)
     asset.update(data)
+    breakdown_service.clear_casting_cache_for_entity(asset_id)
     events.emit(
         "asset:update",
         {"asset_id": asset_id, "data": data},
@@ -515,7 +522,10 @@ def update_asset(asset_id, data):
 
 
 def remove_asset(asset_id, force=False):
+    from zou.app.services import breakdown_service
+
     asset = get_asset_raw(asset_id)
+    breakdown_service.clear_casting_cache_for_entity(asset_id)
     is_tasks_related = Task.query.filter_by(entity_id=asset_id).count() > 0
 
     if is_tasks_related and not force:
@@ -548,12 +558,15 @@ def add_asset_link(asset_in_id, asset_out_id):
     """
     Link asset together, mark asset_in as asset out dependency.
     """
+    from zou.app.services import breakdown_service
+
     asset_in = get_asset_raw(asset_in_id)
     asset_out = get_asset_raw(asset_out_id)
 
     if asset_out not in asset_in.entities_out:
         asset_in.entities_out.append(asset_out)
         asset_in.save()
+        breakdown_service.clear_casting_cache(asset_out.project_id)
         events.emit(
             "asset:new-link",
             {"asset_in": asset_in.id, "asset_out": asset_out.id},
@@ -566,6 +579,8 @@ def remove_asset_link(asset_in_id, asset_out_id):
     """
     Remove link asset together, unmark asset_in as asset out dependency.
     """
+    from zou.app.services import breakdown_service
+
     asset_in = get_asset_raw(asset_in_id)
     asset_out = get_asset_raw(asset_out_id)
 
@@ -574,6 +589,7 @@ def remove_asset_link(asset_in_id, asset_out_id):
             x for x in asset_in.entities_out if x.id != asset_out_id
         ]
         asset_in.save()
+        breakdown_service.clear_casting_cache(asset_out.project_id)
         events.emit(
             "asset:remove-link",
             {"asset_in": asset_in.id, "asset_out": asset_out.id},
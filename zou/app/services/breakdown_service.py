@@ -1,12 +1,12 @@
 from slugify import slugify
-from sqlalchemy import desc
+from sqlalchemy import desc, or_
 from sqlalchemy.orm import aliased
 
 from zou.app.models.asset_instance import AssetInstance
 from zou.app.models.entity import Entity, EntityLink
 from zou.app.models.entity_type import EntityType
 
-from zou.app.utils import fields, events
+from zou.app.utils import cache, fields, events
 
 from zou.app.services import assets_service, entities_service, shots_service
 
@@ -146,6 +146,7 @@ def update_casting(entity_id, casting):
     two fields: `asset_id` and `nb_occurences`.
     """
     entity = entities_service.get_entity_raw(entity_id)
+    clear_casting_cache_for_entity(entity.id)
     entity.update({"entities_out": []})
     for cast in casting:
         if "asset_id" in cast and "nb_occurences" in cast:
@@ -176,6 +177,9 @@ def create_casting_link(entity_in_id, asset_id, nb_occurences=1, label=""):
     link = EntityLink.get_by(entity_in_id=entity_in_id, entity_out_id=asset_id)
     entity = entities_service.get_entity(entity_in_id)
     project_id = str(entity["project_id"])
+    asset = Entity.get(asset_id)
+    if asset is not None:
+        clear_casting_cache(asset.project_id)
     if link is None:
         link = EntityLink.create(
             entity_in_id=entity_in_id,
@@ -198,15 +202,96 @@ def create_casting_link(entity_in_id, asset_id, nb_occurences=1, label=""):
     return link
 
 
+def clear_casting_cache(project_id):
+    cache.cache.delete_memoized(get_project_cast_in, str(project_id))
+
+
+def clear_casting_cache_for_entity(entity_id):
+    """
+    Clear the reverse casting indexes listing given entity: the ones of the
+    projects of the assets casted in it or in its children (shots of a
+    sequence, shots of the sequences of an episode). Indexes are keyed by
+    asset project.
+    """
+    child_ids = Entity.query.filter(Entity.parent_id == entity_id) \
+        .with_entities(Entity.id)
+    grandchild_ids = Entity.query.filter(Entity.parent_id.in_(child_ids)) \
+        .with_entities(Entity.id)
+    project_ids = (
+        Entity.query.join(EntityLink, EntityLink.entity_out_id == Entity.id)
+        .filter(
+            or_(
+                EntityLink.entity_in_id == entity_id,
+                EntityLink.entity_in_id.in_(child_ids),
+                EntityLink.entity_in_id.in_(grandchild_ids),
+            )
+        )
+        .with_entities(Entity.project_id)
+        .distinct()
+        .all()
+    )
+    for (project_id,) in project_ids:
+        clear_casting_cache(project_id)
+
+
 def get_cast_in(asset_id):
     """
     Get the list of shots where an asset is casted in.
     """
-    cast_in = []
+    return get_cast_in_many([asset_id])[str(asset_id)]
+
+
+def get_cast_in_many(asset_ids):
+    """
+    Get the list of shots and assets where each given asset is casted in.
+    Result is returned as a map where keys are asset IDs and values are the
+    cast in lists. Data are read from the reverse casting index of the projects
+    the assets belong to.
+    """
+    asset_ids = [str(asset_id) for asset_id in asset_ids]
+    cast_in_map = {asset_id: [] for asset_id in asset_ids}
+    if len(asset_ids) == 0:
+        return cast_in_map
+
+    project_ids = (
+        Entity.query.filter(Entity.id.in_(asset_ids))
+        .with_entities(Entity.project_id)
+        .distinct()
+        .all()
+    )
+    for (project_id,) in project_ids:
+        project_cast_in = get_project_cast_in(str(project_id))
+        for asset_id in asset_ids:
+            if asset_id in project_cast_in:
+                cast_in_map[asset_id] = project_cast_in[asset_id]
+    return cast_in_map
+
+
+@cache.memoize_function(120)
+def get_project_cast_in(project_id):
+    """
+    Return the reverse casting index of given project. Result is returned as a
+    map where keys are asset IDs and values are the list of shots and assets
+    where the asset is casted in. The index is cleared on every casting change.
+    """
+    project_asset_ids = Entity.query.filter(
+        Entity.project_id == project_id
+    ).with_entities(Entity.id)
+    return _build_cast_in_map(
+        EntityLink.entity_out_id.in_(project_asset_ids)
+    )
+
+
+def _build_cast_in_map(link_filter):
+    """
+    Run the set-based cast in queries for entity links matching given filter
+    and group results by casted asset.
+    """
+    cast_in_map = {}
     Sequence = aliased(Entity, name="sequence")
     Episode = aliased(Entity, name="episode")
     links = (
-        EntityLink.query.filter_by(entity_out_id=asset_id)
+        EntityLink.query.filter(link_filter)
         .filter(Entity.canceled != True)
         .join(Entity, EntityLink.entity_in_id == Entity.id)
         .join(Sequence, Entity.parent_id == Sequence.id)
@@ -238,10 +323,11 @@ def get_cast_in(asset_id):
             "preview_file_id": fields.serialize_value(entity_preview_file_id),
             "nb_occurences": link.nb_occurences,
         }
-        cast_in.append(shot)
+        asset_id = str(link.entity_out_id)
+        cast_in_map.setdefault(asset_id, []).append(shot)
 
     links = (
-        EntityLink.query.filter_by(entity_out_id=asset_id)
+        EntityLink.query.filter(link_filter)
         .filter(Entity.canceled != True)
         .filter(assets_service.build_entity_type_asset_type_filter())
         .join(Entity, EntityLink.entity_in_id == Entity.id)
@@ -258,9 +344,10 @@ def get_cast_in(asset_id):
             "preview_file_id": fields.serialize_value(entity_preview_file_id),
             "nb_occurences": link.nb_occurences,
         }
-        cast_in.append(shot)
+        asset_id = str(link.entity_out_id)
+        cast_in_map.setdefault(asset_id, []).append(shot)
 
-    return cast_in
+    return cast_in_map
 
 
 def get_asset_instances_for_scene(scene_id, asset_type_id=None):
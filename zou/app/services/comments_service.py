@@ -6,6 +6,7 @@ from flask import current_app
 from zou.app.models.attachment_file import AttachmentFile
 from zou.app.models.comment import Comment
 from zou.app.models.project import Project
+from zou.app.models.task import Task
 
 from zou.app.services import (
     base_service,
@@ -19,8 +20,8 @@ from zou.app.services.exception import (
 )
 
 from zou.app.utils import cache, events, fs, fields
-from zou.app.stores import file_store
-from zou.app import config
+from zou.app.stores import file_store, queue_store
+from zou.app import config, db
 
 
 def get_attachment_file_raw(attachment_file_id):
@@ -86,6 +87,129 @@ def create_comment(
     return comment
 
 
+def create_comments(person_id, comments):
+    """
+    Create several comments at once. Comments and related task changes are
+    stored in a single transaction. News, notifications and emails are
+    produced afterwards for all comments at once, through the job queue if it
+    is activated.
+    """
+    author = _get_comment_author(person_id)
+    comments = [
+        comment for comment in comments
+        if "object_id" in comment and "task_status_id" in comment
+    ]
+    task_ids = set(comment["object_id"] for comment in comments)
+    tasks = {}
+    if len(task_ids) > 0:
+        tasks = {
+            str(task.id): task
+            for task in Task.query.filter(Task.id.in_(task_ids)).all()
+        }
+
+    teams = {}
+    created_comments = []
+    try:
+        for comment_data in comments:
+            task = tasks.get(comment_data["object_id"])
+            if task is None:
+                continue
+            task_status = tasks_service.get_task_status(
+                comment_data["task_status_id"]
+            )
+            project_id = str(task.project_id)
+            if project_id not in teams:
+                teams[project_id] = Project.get(project_id).team
+            text = comment_data.get("comment", "")
+            created_at = datetime.datetime.utcnow()
+            comment = Comment.create_no_commit(
+                object_id=task.id,
+                object_type="Task",
+                task_status_id=task_status["id"],
+                person_id=author["id"],
+                mentions=get_mentions_in_team(teams[project_id], text),
+                checklist=[],
+                text=text,
+                created_at=created_at
+            )
+            task_dict = task.serialize()
+            new_data, status_changed = _build_status_change_data(
+                task_status, task_dict, created_at
+            )
+            for key, value in new_data.items():
+                setattr(task, key, value)
+            task.updated_at = datetime.datetime.now()
+            created_comments.append(
+                (comment, task_dict, task_status, new_data, status_changed)
+            )
+        db.session.commit()
+    except:
+        db.session.rollback()
+        db.session.remove()
+        raise
+
+    result = []
+    comment_changes = []
+    for (
+        comment,
+        task_dict,
+        task_status,
+        new_data,
+        status_changed
+    ) in created_comments:
+        comment_dict = comment.serialize(relations=True)
+        comment_dict["attachment_files"] = []
+        comment_dict["task_status"] = task_status
+        comment_dict["person"] = author
+        tasks_service.clear_task_cache(task_dict["id"])
+        events.emit(
+            "comment:new",
+            {"comment_id": comment_dict["id"]},
+            project_id=task_dict["project_id"]
+        )
+        events.emit(
+            "task:update",
+            {"task_id": task_dict["id"]},
+            project_id=task_dict["project_id"]
+        )
+        if status_changed:
+            _emit_status_changed_event(task_dict, new_data, author["id"])
+        comment_changes.append((comment_dict["id"], status_changed))
+        result.append(comment_dict)
+
+    if len(comment_changes) > 0:
+        if config.ENABLE_JOB_QUEUE:
+            queue_store.job_queue.enqueue(
+                create_side_effects_for_comments,
+                args=(comment_changes,),
+                job_timeout=600,
+            )
+        else:
+            create_side_effects_for_comments(comment_changes)
+    return result
+
+
+def create_side_effects_for_comments(comment_changes):
+    """
+    Produce news, notifications and emails for given comments. Comment changes
+    are tuples made of a comment ID and a flag telling if the comment changed
+    the task status.
+    """
+    from zou.app import app as current_app
+    with current_app.app_context():
+        tasks_and_comments = []
+        for (comment_id, status_changed) in comment_changes:
+            comment = tasks_service.get_comment_with_relations(comment_id)
+            task = tasks_service.get_task_with_relations(comment["object_id"])
+            tasks_and_comments.append((task, comment, status_changed))
+
+        news_service.create_news_for_tasks_and_comments(tasks_and_comments)
+        for (task, comment, status_changed) in tasks_and_comments:
+            notifications_service.create_notifications_for_task_and_comment(
+                task, comment, change=status_changed
+            )
+
+
 def _get_comment_author(person_id):
     if person_id:
         person = persons_service.get_person(person_id)
@@ -95,10 +219,25 @@ def _get_comment_author(person_id):
 
 
 def _manage_status_change(task_status, task, comment):
+    new_data, status_changed = _build_status_change_data(
+        task_status, task, comment["created_at"]
+    )
+    tasks_service.update_task(task["id"], new_data)
+    task.update(new_data)
+    if status_changed:
+        _emit_status_changed_event(task, new_data, comment["person_id"])
+    return task, status_changed
+
+
+def _build_status_change_data(task_status, task, comment_date):
+    """
+    Compute the task fields to update when a comment with given task status is
+    posted on given task.
+    """
     status_changed = task_status["id"] != task["task_status_id"]
     new_data = {
         "task_status_id": task_status["id"],
-        "last_comment_date": comment["created_at"],
+        "last_comment_date": comment_date,
     }
     if status_changed:
         if task_status["is_retake"]:
@@ -117,21 +256,20 @@ def _manage_status_change(task_status, task, comment):
             task["real_start_date"] is None
         ):
             new_data["real_start_date"] = datetime.datetime.now()
+    return new_data, status_changed
 
-    tasks_service.update_task(task["id"], new_data)
-    task.update(new_data)
-    if status_changed:
-        events.emit(
-            "task:status-changed",
-            {
-                "task_id": task["id"],
-                "new_task_status_id": new_data["task_status_id"],
-                "previous_task_status_id": task["task_status_id"],
-                "person_id": comment["person_id"]
-            },
-            project_id=task["project_id"]
-        )
-    return task, status_changed
+
+def _emit_status_changed_event(task, new_data, person_id):
+    events.emit(
+        "task:status-changed",
+        {
+            "task_id": task["id"],
+            "new_task_status_id": new_data["task_status_id"],
+            "previous_task_status_id": task["task_status_id"],
+            "person_id": person_id
+        },
+        project_id=task["project_id"]
+    )
 
 
 def _manage_subscriptions(task, comment, status_changed):
@@ -194,8 +332,15 @@ def get_comment_mentions(object_id, text):
     """
     task = tasks_service.get_task_raw(object_id)
     project = Project.get(task.project_id)
+    return get_mentions_in_team(project.team, text)
+
+
+def get_mentions_in_team(team, text):
+    """
+    Return the persons of given team mentioned (@full name) in given text.
+    """
     mentions = []
-    for person in project.team:
+    for person in team:
         if re.search("@%s( |$)" % person.full_name(), text) is not None:
             mentions.append(person)
     return mentions
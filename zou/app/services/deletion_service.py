@@ -1,10 +1,25 @@
 import datetime
+from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
-
-
-from zou.app.models.comment import Comment
+from sqlalchemy.orm import Query
+
+from zou.app import db
+from zou.app.models.asset_instance import AssetInstance
+from zou.app.models.attachment_file import AttachmentFile
+from zou.app.models.build_job import BuildJob
+from zou.app.models.comment import (
+    Comment,
+    acknowledgements_table,
+    mentions_table,
+    preview_link_table,
+)
 from zou.app.models.desktop_login_log import DesktopLoginLog
-from zou.app.models.entity import Entity, EntityLink, EntityVersion
+from zou.app.models.entity import (
+    AssetInstanceLink,
+    Entity,
+    EntityLink,
+    EntityVersion,
+)
 from zou.app.models.event import ApiEvent
 from zou.app.models.metadata_descriptor import MetadataDescriptor
 from zou.app.models.login_log import LoginLog
@@ -15,30 +30,45 @@ from zou.app.models.output_file import OutputFile
 from zou.app.models.person import Person
 from zou.app.models.playlist import Playlist
 from zou.app.models.preview_file import PreviewFile
-from zou.app.models.project import Project
+from zou.app.models.project import (
+    Project,
+    ProjectAssetTypeLink,
+    ProjectPersonLink,
+    ProjectTaskStatusLink,
+    ProjectTaskTypeLink,
+)
 from zou.app.models.schedule_item import ScheduleItem
 from zou.app.models.search_filter import SearchFilter
 from zou.app.models.subscription import Subscription
-from zou.app.models.task import Task
+from zou.app.models.task import Task, assignees_table
 from zou.app.models.time_spent import TimeSpent
 from zou.app.models.working_file import WorkingFile
 
-from zou.app.utils import events, fields
-from zou.app.stores import file_store
+from zou.app.utils import cache, events, fields
+from zou.app.stores import file_store, queue_store
+from zou.app.services import notifications_service, persons_service
 
 from zou.app.services.exception import (
     CommentNotFoundException,
     ModelWithRelationsDeletionException,
 )
 
+STORAGE_DELETION_CHUNK_SIZE = 200
+PROJECT_DELETION_JOB_TIMEOUT = 3600 * 6
+PROJECT_DELETION_PROGRESS_TIMEOUT = 3600 * 24
+EVENT_DELETION_CHUNK_SIZE = 10000
+
 
 def remove_comment(comment_id):
     comment = Comment.get(comment_id)
     task = Task.get(comment.object_id)
     if comment is not None:
-        notifications = Notification.query.filter_by(comment_id=comment.id)
+        notifications = Notification.get_all_by(comment_id=comment.id)
         for notification in notifications:
             notification.delete()
+        notifications_service.clear_unread_notifications_counts(
+            [notification.person_id for notification in notifications]
+        )
 
         news_list = News.query.filter_by(comment_id=comment.id)
         for news in news_list:
@@ -86,9 +116,12 @@ def remove_task(task_id, force=False):
 
         comments = Comment.query.filter_by(object_id=task_id)
         for comment in comments:
-            notifications = Notification.query.filter_by(comment_id=comment.id)
+            notifications = Notification.get_all_by(comment_id=comment.id)
             for notification in notifications:
                 notification.delete()
+            notifications_service.clear_unread_notifications_counts(
+                [notification.person_id for notification in notifications]
+            )
             news_list = News.query.filter_by(comment_id=comment.id)
             for news in news_list:
                 news.delete()
@@ -106,15 +139,21 @@ def remove_task(task_id, force=False):
         for time_spent in time_spents:
             time_spent.delete()
 
-        notifications = Notification.query.filter_by(task_id=task_id)
+        notifications = Notification.get_all_by(task_id=task_id)
         for notification in notifications:
             notification.delete()
+        notifications_service.clear_unread_notifications_counts(
+            [notification.person_id for notification in notifications]
+        )
 
         news_list = News.query.filter_by(task_id=task.id)
         for news in news_list:
             news.delete()
 
+    assignee_ids = [person.id for person in task.assignees]
     task.delete()
+    for assignee_id in assignee_ids:
+        persons_service.clear_access_snapshot(assignee_id)
     tasks_service.clear_task_cache(task_id)
     events.emit(
         "task:delete",
@@ -234,45 +273,260 @@ def remove_tasks_for_project_and_task_type(project_id, task_type_id):
 
 
 def remove_project(project_id):
-    from zou.app.services import playlists_service
-
-    tasks = Task.query.filter_by(project_id=project_id)
-    for task in tasks:
-        remove_task(task.id, force=True)
+    """
+    Remove given project and all related data. Rows are removed with set-based
+    delete statements, table after table, in dependency order. Then preview
+    and attachment files are removed from the storage by chunks. Progress is
+    stored in the cache and can be read with get_project_deletion_progress.
+    """
+    task_ids = Task.query.filter_by(project_id=project_id) \
+        .with_entities(Task.id)
+    entity_ids = Entity.query.filter_by(project_id=project_id) \
+        .with_entities(Entity.id)
+    comment_ids = Comment.query.filter(Comment.object_id.in_(task_ids)) \
+        .with_entities(Comment.id)
+    preview_file_ids = PreviewFile.query \
+        .filter(PreviewFile.task_id.in_(task_ids)) \
+        .with_entities(PreviewFile.id)
+    working_file_ids = WorkingFile.query \
+        .filter(WorkingFile.task_id.in_(task_ids)) \
+        .with_entities(WorkingFile.id)
+    asset_instance_ids = AssetInstance.query.filter(
+        or_(
+            AssetInstance.asset_id.in_(entity_ids),
+            AssetInstance.entity_id.in_(entity_ids),
+            AssetInstance.scene_id.in_(entity_ids),
+            AssetInstance.target_asset_id.in_(entity_ids),
+        )
+    ).with_entities(AssetInstance.id)
+    playlist_ids = Playlist.query.filter_by(project_id=project_id) \
+        .with_entities(Playlist.id)
+
+    preview_files = preview_file_ids \
+        .add_columns(PreviewFile.extension).all()
+    attachment_ids = [
+        attachment_file_id
+        for (attachment_file_id,) in AttachmentFile.query
+        .filter(AttachmentFile.comment_id.in_(comment_ids))
+        .with_entities(AttachmentFile.id)
+    ]
+    build_job_ids = [
+        build_job_id
+        for (build_job_id,) in BuildJob.query
+        .filter(BuildJob.playlist_id.in_(playlist_ids))
+        .with_entities(BuildJob.id)
+    ]
 
-    query = EntityLink.query.join(
-        Entity, EntityLink.entity_in_id == Entity.id
-    ).filter(Entity.project_id == project_id)
-    for link in query:
-        link.delete_no_commit()
-    EntityLink.commit()
-
-    query = EntityVersion.query.join(
-        Entity, EntityVersion.entity_id == Entity.id
-    ).filter(Entity.project_id == project_id)
-    for version in query:
-        version.delete_no_commit()
-    EntityLink.commit()
-
-    playlists = Playlist.query.filter_by(project_id=project_id)
-    for playlist in playlists:
-        playlists_service.remove_playlist(playlist.id)
-
-    ApiEvent.delete_all_by(project_id=project_id)
-    Entity.delete_all_by(project_id=project_id)
-    MetadataDescriptor.delete_all_by(project_id=project_id)
-    Milestone.delete_all_by(project_id=project_id)
-    ScheduleItem.delete_all_by(project_id=project_id)
-    SearchFilter.delete_all_by(project_id=project_id)
-
-    for news in News.query.join(Task).filter_by(project_id=project_id).all():
-        news.delete_no_commit()
-    News.commit()
-    project = Project.get(project_id)
-    project.delete()
+    steps = [
+        News.query.filter(News.task_id.in_(task_ids)),
+        Notification.query.filter(Notification.task_id.in_(task_ids)),
+        AttachmentFile.query.filter(
+            AttachmentFile.comment_id.in_(comment_ids)
+        ),
+        preview_link_table.delete().where(
+            preview_link_table.c.comment.in_(comment_ids)
+        ),
+        mentions_table.delete().where(
+            mentions_table.c.comment.in_(comment_ids)
+        ),
+        acknowledgements_table.delete().where(
+            acknowledgements_table.c.comment.in_(comment_ids)
+        ),
+        Comment.query.filter(Comment.object_id.in_(task_ids)),
+        preview_link_table.delete().where(
+            preview_link_table.c.preview_file.in_(preview_file_ids)
+        ),
+        PreviewFile.query.filter(PreviewFile.task_id.in_(task_ids)),
+        OutputFile.query.filter(
+            or_(
+                OutputFile.source_file_id.in_(working_file_ids),
+                OutputFile.entity_id.in_(entity_ids),
+                OutputFile.temporal_entity_id.in_(entity_ids),
+                OutputFile.asset_instance_id.in_(asset_instance_ids),
+            )
+        ),
+        WorkingFile.query.filter(
+            or_(
+                WorkingFile.task_id.in_(task_ids),
+                WorkingFile.entity_id.in_(entity_ids),
+            )
+        ),
+        Subscription.query.filter(
+            or_(
+                Subscription.task_id.in_(task_ids),
+                Subscription.entity_id.in_(entity_ids),
+            )
+        ),
+        TimeSpent.query.filter(TimeSpent.task_id.in_(task_ids)),
+        assignees_table.delete().where(assignees_table.c.task.in_(task_ids)),
+        Task.query.filter_by(project_id=project_id),
+        EntityLink.query.filter(
+            or_(
+                EntityLink.entity_in_id.in_(entity_ids),
+                EntityLink.entity_out_id.in_(entity_ids),
+            )
+        ),
+        EntityVersion.query.filter(EntityVersion.entity_id.in_(entity_ids)),
+        AssetInstanceLink.query.filter(
+            or_(
+                AssetInstanceLink.entity_id.in_(entity_ids),
+                AssetInstanceLink.asset_instance_id.in_(asset_instance_ids),
+            )
+        ),
+        AssetInstance.query.filter(
+            or_(
+                AssetInstance.asset_id.in_(entity_ids),
+                AssetInstance.entity_id.in_(entity_ids),
+                AssetInstance.scene_id.in_(entity_ids),
+                AssetInstance.target_asset_id.in_(entity_ids),
+            )
+        ),
+        BuildJob.query.filter(BuildJob.playlist_id.in_(playlist_ids)),
+        Playlist.query.filter_by(project_id=project_id),
+        ApiEvent.query.filter_by(project_id=project_id),
+        MetadataDescriptor.query.filter_by(project_id=project_id),
+        Milestone.query.filter_by(project_id=project_id),
+        ScheduleItem.query.filter_by(project_id=project_id),
+        SearchFilter.query.filter_by(project_id=project_id),
+        Entity.query.filter_by(project_id=project_id),
+        ProjectPersonLink.query.filter_by(project_id=project_id),
+        ProjectTaskTypeLink.query.filter_by(project_id=project_id),
+        ProjectTaskStatusLink.query.filter_by(project_id=project_id),
+        ProjectAssetTypeLink.query.filter_by(project_id=project_id),
+        Project.query.filter_by(id=project_id),
+    ]
+    nb_files = len(preview_files) + len(attachment_ids) + \
+        len(build_job_ids)
+    progress = {
+        "status": "running",
+        "step": 0,
+        "nb_steps": len(steps),
+        "nb_files_removed": 0,
+        "nb_files": nb_files,
+    }
+
+    set_project_deletion_progress(project_id, progress)
+    try:
+        # Main previews of entities point to preview files.
+        Entity.query.filter_by(project_id=project_id).update(
+            {"preview_file_id": None}, synchronize_session=False
+        )
+        for (index, step) in enumerate(steps):
+            if isinstance(step, Query):
+                step.delete(synchronize_session=False)
+            else:
+                db.session.execute(step)
+            db.session.commit()
+            progress["step"] = index + 1
+            set_project_deletion_progress(project_id, progress)
+    except:
+        db.session.rollback()
+        db.session.remove()
+        progress["status"] = "failed"
+        set_project_deletion_progress(project_id, progress)
+        raise
+
+    files_to_remove = \
+        [(clear_preview_files, preview) for preview in preview_files] + \
+        [(clear_attachment_file, file_id) for file_id in attachment_ids] + \
+        [(clear_build_job_files, job_id) for job_id in build_job_ids]
+    for index in range(0, nb_files, STORAGE_DELETION_CHUNK_SIZE):
+        chunk = files_to_remove[index:index + STORAGE_DELETION_CHUNK_SIZE]
+        for (clear_function, file_data) in chunk:
+            clear_function(file_data)
+        progress["nb_files_removed"] += len(chunk)
+        set_project_deletion_progress(project_id, progress)
+
+    persons_service.clear_access_snapshot()
+    notifications_service.clear_unread_notifications_counts()
+    progress["status"] = "succeeded"
+    set_project_deletion_progress(project_id, progress)
+    events.emit("project:delete", {"project_id": project_id}, persist=False)
     return project_id
 
 
+def remove_project_job(project_id):
+    """
+    Job version of the project deletion, it runs in its own application
+    context. Failures are recorded in the deletion progress, then raised again
+    so the job is flagged as failed.
+    """
+    from zou.app import app as current_app
+    from zou.app.services import projects_service
+
+    with current_app.app_context():
+        try:
+            remove_project(project_id)
+        except Exception:
+            current_app.logger.error(
+                "Project deletion failed: %s" % project_id, exc_info=1
+            )
+            progress = get_project_deletion_progress(project_id) or {}
+            progress["status"] = "failed"
+            set_project_deletion_progress(project_id, progress)
+            raise
+        finally:
+            projects_service.clear_project_cache(project_id)
+
+
+def queue_project_deletion(project_id):
+    """
+    Run the project deletion in the job queue. It returns the deletion
+    progress.
+    """
+    set_project_deletion_progress(project_id, {"status": "queued"})
+    queue_store.job_queue.enqueue(
+        remove_project_job,
+        args=(project_id,),
+        job_timeout=PROJECT_DELETION_JOB_TIMEOUT,
+    )
+    return get_project_deletion_progress(project_id)
+
+
+def get_project_deletion_progress(project_id):
+    """
+    Return the deletion progress of given project as a dict (status, current
+    step and number of removed files). It returns None if no deletion occured
+    recently for this project.
+    """
+    return cache.cache.get("project-deletion-%s" % project_id)
+
+
+def set_project_deletion_progress(project_id, progress):
+    cache.cache.set(
+        "project-deletion-%s" % project_id,
+        progress,
+        timeout=PROJECT_DELETION_PROGRESS_TIMEOUT,
+    )
+
+
+def clear_preview_files(preview_file):
+    """
+    Remove storage files of given (preview file id, extension) pair.
+    """
+    (preview_file_id, extension) = preview_file
+    if extension == "png":
+        clear_picture_files(preview_file_id)
+    elif extension == "mp4":
+        clear_movie_files(preview_file_id)
+    else:
+        clear_generic_files(preview_file_id)
+
+
+def clear_attachment_file(attachment_file_id):
+    try:
+        file_store.remove_file("attachments", attachment_file_id)
+    except:
+        pass
+
+
+def clear_build_job_files(build_job_id):
+    try:
+        file_store.remove_movie("playlists", build_job_id)
+    except:
+        pass
+
+
 def remove_person(person_id, force=True):
     person = Person.get(person_id)
     if force:
@@ -289,6 +543,7 @@ def remove_person(person_id, force=True):
             comment.save()
         ApiEvent.delete_all_by(user_id=person_id)
         Notification.delete_all_by(person_id=person_id)
+        notifications_service.clear_unread_notifications_counts([person_id])
         SearchFilter.delete_all_by(person_id=person_id)
         DesktopLoginLog.delete_all_by(person_id=person_id)
         LoginLog.delete_all_by(person_id=person_id)
@@ -328,11 +583,32 @@ def remove_person(person_id, force=True):
 
 def remove_old_events(days_old=90):
     """
-    Remove events older than *days_old*.
+    Remove events older than *days_old*. Monthly partitions entirely older
+    than the limit are dropped. Remaining old events (from the default
+    partition or from the month of the limit date) are deleted by chunks.
+    Partitions for the coming months are created at the same time.
     """
-    limit_date = datetime.datetime.now() - datetime.timedelta(days=90)
-    ApiEvent.query.filter(ApiEvent.created_at < limit_date).delete()
-    ApiEvent.commit()
+    from zou.app.services import events_service
+
+    limit_date = datetime.datetime.utcnow() - \
+        datetime.timedelta(days=days_old)
+    events_service.create_event_partitions()
+    for (partition_name, _, end_date) in events_service.get_event_partitions():
+        if end_date <= limit_date:
+            events_service.drop_event_partition(partition_name)
+
+    while True:
+        event_ids = ApiEvent.query \
+            .filter(ApiEvent.created_at < limit_date) \
+            .with_entities(ApiEvent.id) \
+            .limit(EVENT_DELETION_CHUNK_SIZE)
+        nb_deleted = ApiEvent.query \
+            .filter(ApiEvent.created_at < limit_date) \
+            .filter(ApiEvent.id.in_(event_ids)) \
+            .delete(synchronize_session=False)
+        ApiEvent.commit()
+        if nb_deleted < EVENT_DELETION_CHUNK_SIZE:
+            break
 
 
 def remove_old_login_logs(days_old=90):
@@ -351,14 +627,21 @@ def remove_old_notifications(days_old=90):
     limit_date = datetime.datetime.now() - datetime.timedelta(days=90)
     Notification.query.filter(Notification.created_at < limit_date).delete()
     Notification.commit()
+    notifications_service.clear_unread_notifications_counts()
 
 
 def remove_episode(episode_id, force=False):
     """
     Remove an episode and all related sequences and shots.
     """
-    from zou.app.services import shots_service, assets_service
+    from zou.app.services import (
+        assets_service,
+        breakdown_service,
+        shots_service,
+    )
     episode = shots_service.get_episode_raw(episode_id)
+    # Cast in indexes list episode names.
+    breakdown_service.clear_casting_cache_for_entity(episode_id)
     if force:
         for sequence in Entity.get_all_by(parent_id=episode_id):
             shots_service.remove_sequence(sequence.id, force=True)
@@ -1,5 +1,5 @@
-from zou.app import config
-from zou.app.utils import emails, chats
+from zou.app import app, config
+from zou.app.utils import chats, delivery_worker, emails
 
 from zou.app.services import (
     entities_service,
@@ -8,13 +8,78 @@ from zou.app.services import (
     projects_service,
     tasks_service,
 )
-from zou.app.stores import queue_store
+from zou.app.stores import notifications_store, queue_store
 
 
 def send_notification(person_id, subject, messages):
     """
-    Send email notification to given person. Use the job queue if it is
-    activated.
+    Send email notification to given person. When a digest window is
+    configured, the notifications received by a person during the window are
+    gathered in a single message, sent once the window is over (see
+    send_due_digests). Otherwise, it is delivered right away.
+    """
+    person = persons_service.get_person(person_id)
+    if not (
+        person["notifications_enabled"]
+        or person["notifications_slack_enabled"]
+    ):
+        return True
+
+    window = config.NOTIFICATION_DIGEST_WINDOW
+    if window > 0:
+        entry = {"subject": subject}
+        entry.update(messages)
+        notifications_store.add_to_digest(person_id, entry, window)
+        if notifications_store.is_digest_due(person_id):
+            send_digest(person_id)
+    else:
+        deliver_notification(person_id, subject, messages)
+    return True
+
+
+def send_due_digests():
+    """
+    Send the digests of all people whose digest window is over. It is run
+    periodically by the send_notification_digests command.
+    """
+    nb_sent = 0
+    for person_id in notifications_store.get_due_digests():
+        try:
+            if send_digest(person_id):
+                nb_sent += 1
+        except Exception:
+            app.logger.error("Notification digest failed", exc_info=1)
+    return nb_sent
+
+
+def send_digest(person_id):
+    """
+    Send all notifications gathered for given person since the digest window
+    started, in a single message.
+    """
+    entries = notifications_store.pop_digest(person_id)
+    if len(entries) == 0:
+        return False
+    elif len(entries) == 1:
+        subject = entries[0]["subject"]
+    else:
+        subject = "[Kitsu] You have %s new notifications" % len(entries)
+    messages = {
+        "email_message": "\n<hr>\n".join(
+            entry["email_message"] for entry in entries
+        ),
+        "slack_message": "\n---\n".join(
+            entry["slack_message"] for entry in entries
+        ),
+    }
+    return deliver_notification(person_id, subject, messages)
+
+
+def deliver_notification(person_id, subject, messages):
+    """
+    Deliver notification to given person by email and by Slack, depending
+    on its settings. Messages are sent by the job queue if it is activated,
+    by the delivery worker of the current process otherwise.
     """
     person = persons_service.get_person(person_id)
     email_message = messages["email_message"]
@@ -26,7 +91,7 @@ def send_notification(person_id, subject, messages):
                 args=(subject, email_message + get_signature(), person["email"]),
             )
         else:
-            emails.send_email(
+            delivery_worker.get_delivery_worker(app).send_email(
                 subject, email_message + get_signature(), person["email"]
             )
 
@@ -39,7 +104,9 @@ def send_notification(person_id, subject, messages):
                 chats.send_to_slack, args=(token, userid, slack_message)
             )
         else:
-            chats.send_to_slack(token, userid, slack_message)
+            delivery_worker.get_delivery_worker(app).send_to_slack(
+                token, userid, slack_message
+            )
 
     return True
 
@@ -174,6 +241,52 @@ def send_assignation_notification(person_id, author_id, task):
     return True
 
 
+def send_assignation_digest(person_id, author_id, tasks):
+    """
+    Send a single notification email telling that somenone assigned several
+    tasks to the person matching given person id.
+    """
+    if len(tasks) == 1:
+        return send_assignation_notification(person_id, author_id, tasks[0])
+
+    person = persons_service.get_person(person_id)
+    if person["notifications_enabled"] or person["notifications_slack_enabled"]:
+        author = persons_service.get_person(author_id)
+        subject = "[Kitsu] You were assigned to %s tasks" % len(tasks)
+        email_lines = []
+        slack_lines = []
+        for task in tasks:
+            (_, task_name, task_url) = get_task_descriptors(author_id, task)
+            email_lines.append(
+                """<li><a href="%s">%s</a></li>""" % (task_url, task_name)
+            )
+            slack_lines.append("• <%s|%s>" % (task_url, task_name))
+        email_message = """<p><strong>%s</strong> assigned you to %s tasks:</p>
+
+<ul>
+%s
+</ul>
+""" % (
+            author["full_name"],
+            len(tasks),
+            "\n".join(email_lines),
+        )
+        slack_message = """*%s* assigned you to %s tasks:
+
+%s
+""" % (
+            author["full_name"],
+            len(tasks),
+            "\n".join(slack_lines),
+        )
+        messages = {
+            "email_message": email_message,
+            "slack_message": slack_message,
+        }
+        return send_notification(person_id, subject, messages)
+    return True
+
+
 def get_signature():
     """
     Build signature for Zou emails.
@@ -70,6 +70,8 @@ def update_entity_preview(entity_id, preview_file_id):
     Update given entity main preview. If entity or preview is not found, it
     raises an exception.
     """
+    from zou.app.services import breakdown_service
+
     entity = Entity.get(entity_id)
     if entity is None:
         raise EntityNotFoundException
@@ -80,6 +82,7 @@ def update_entity_preview(entity_id, preview_file_id):
 
     entity.update({"preview_file_id": preview_file.id})
     clear_entity_cache(str(entity.id))
+    breakdown_service.clear_casting_cache_for_entity(entity.id)
     events.emit(
         "preview-file:set-main",
         {"entity_id": entity_id, "preview_file_id": preview_file_id},
@@ -208,9 +211,13 @@ def get_entities_and_tasks(criterions={}):
 
 
 def remove_entity_link(link_id):
+    from zou.app.services import breakdown_service
+
     try:
         link = EntityLink.get_by(id=link_id)
+        asset = Entity.get(link.entity_out_id)
         link.delete()
+        breakdown_service.clear_casting_cache(asset.project_id)
         return link.serialize()
     except:
         raise EntityLinkNotFoundException
@@ -1,7 +1,16 @@
+import datetime
+
+from dateutil import relativedelta
+from sqlalchemy import text
+
+from zou.app import db
 from zou.app.models.event import ApiEvent
 from zou.app.models.login_log import LoginLog
+from zou.app.stores import publisher_store
 from zou.app.utils import fields
 
+EVENT_PARTITION_NAME = "api_event_y%Ym%m"
+
 
 def get_last_events(
     after=None,
@@ -12,7 +21,8 @@ def get_last_events(
 ):
     """
     Return last 100 events published. If before parameter is set, it returns
-    last 100 events before this date.
+    last 100 events before this date. When the event table is partitioned,
+    date bounds restrict the query to the matching partitions.
     """
     query = ApiEvent.query.order_by(ApiEvent.created_at.desc())
 
@@ -46,6 +56,119 @@ def get_last_events(
     ]
 
 
+def get_project_events_after(project_id, sequence, limit=1000):
+    """
+    Return events published for given project after given sequence number.
+    If the history doesn't cover all the events missed since this sequence
+    number, *is_complete* is false and the client should reload its data.
+    """
+    (events, last_sequence, is_complete) = publisher_store.get_events_after(
+        project_id, sequence, limit=limit
+    )
+    return {
+        "events": events,
+        "sequence": last_sequence,
+        "is_complete": is_complete,
+    }
+
+
+def get_month_start(date):
+    return datetime.datetime(date.year, date.month, 1)
+
+
+def get_event_partition_name(month_start):
+    return month_start.strftime(EVENT_PARTITION_NAME)
+
+
+def is_event_table_partitioned():
+    """
+    Tell if the event table is partitioned. It's not the case on PostgreSQL
+    versions older than 11.
+    """
+    relkind = db.session.execute(text(
+        "SELECT relkind FROM pg_class WHERE relname = 'api_event'"
+    )).scalar()
+    return relkind == "p"
+
+
+def get_event_partitions():
+    """
+    Return monthly partitions of the event table as a list of (name, start
+    date, end date) tuples sorted by date. The default partition is not
+    listed.
+    """
+    rows = db.session.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = 'api_event'"
+    ))
+    partitions = []
+    for (partition_name,) in rows:
+        try:
+            start_date = datetime.datetime.strptime(
+                partition_name, EVENT_PARTITION_NAME
+            )
+        except ValueError:
+            continue
+        end_date = start_date + relativedelta.relativedelta(months=1)
+        partitions.append((partition_name, start_date, end_date))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_event_partitions(nb_months_ahead=3):
+    """
+    Make sure that a partition exists for the current month and for the
+    *nb_months_ahead* next months. Events of the month already stored in the
+    default partition are moved to the new partition. Nothing is done if the
+    event table is not partitioned.
+    """
+    if not is_event_table_partitioned():
+        return []
+    existing_names = [name for (name, _, _) in get_event_partitions()]
+    month_start = get_month_start(datetime.datetime.utcnow())
+    created_names = []
+    for index in range(nb_months_ahead + 1):
+        start_date = month_start + relativedelta.relativedelta(months=index)
+        partition_name = get_event_partition_name(start_date)
+        if partition_name not in existing_names:
+            create_event_partition(start_date)
+            created_names.append(partition_name)
+    return created_names
+
+
+def create_event_partition(start_date):
+    """
+    Create the partition for the month starting at *start_date*. The
+    partition is filled before being attached, so it doesn't fail if the
+    default partition already contains events for this month.
+    """
+    end_date = start_date + relativedelta.relativedelta(months=1)
+    params = {"start_date": start_date, "end_date": end_date}
+    partition_name = get_event_partition_name(start_date)
+    db.session.execute(
+        "CREATE TABLE %s (LIKE api_event INCLUDING DEFAULTS "
+        "INCLUDING CONSTRAINTS)" % partition_name
+    )
+    db.session.execute(text(
+        "WITH moved_events AS ("
+        "DELETE FROM api_event_default WHERE created_at >= :start_date "
+        "AND created_at < :end_date RETURNING *) "
+        "INSERT INTO %s SELECT * FROM moved_events" % partition_name
+    ), params)
+    db.session.execute(text(
+        "ALTER TABLE api_event ATTACH PARTITION %s "
+        "FOR VALUES FROM (:start_date) TO (:end_date)" % partition_name
+    ), params)
+    db.session.commit()
+    return partition_name
+
+
+def drop_event_partition(partition_name):
+    db.session.execute("DROP TABLE IF EXISTS %s" % partition_name)
+    db.session.commit()
+
+
 def create_login_log(person_id, ip_address, origin):
     """
     Create a new entry to register that someone logged in.
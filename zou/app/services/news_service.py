@@ -9,6 +9,7 @@ from zou.app.models.preview_file import PreviewFile
 from zou.app.models.project import Project
 from zou.app.models.task import Task
 
+from zou.app import db
 from zou.app.utils import cache, events, fields
 from zou.app.services import names_service, tasks_service
 
@@ -63,6 +64,45 @@ def create_news_for_task_and_comment(
     return news
 
 
+def create_news_for_tasks_and_comments(tasks_and_comments):
+    """
+    Create news for several tasks and comments at once. Data are given as a
+    list of (task, comment, change) tuples. News are stored in a single
+    transaction.
+    """
+    news_list = []
+    try:
+        for (task, comment, change) in tasks_and_comments:
+            news = News.create_no_commit(
+                change=change,
+                author_id=comment["person_id"],
+                comment_id=comment["id"],
+                preview_file_id=comment["preview_file_id"],
+                task_id=comment["object_id"],
+            )
+            news_list.append((news, task, comment))
+        News.commit()
+    except:
+        db.session.rollback()
+        db.session.remove()
+        raise
+
+    result = []
+    for (news, task, comment) in news_list:
+        news_dict = news.serialize()
+        events.emit(
+            "news:new",
+            {
+                "news_id": news_dict["id"],
+                "task_status_id": comment["task_status_id"],
+                "task_type_id": task["task_type_id"],
+            },
+            project_id=task["project_id"],
+        )
+        result.append(news_dict)
+    return result
+
+
 def delete_news_for_comment(comment_id):
     """
     Delete all news related to comment. It's mandatory to be able to delete the
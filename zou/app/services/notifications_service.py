@@ -1,5 +1,6 @@
-from sqlalchemy.exc import StatementError
+from sqlalchemy.exc import SQLAlchemyError, StatementError
 
+from zou.app import db
 from zou.app.models.comment import Comment
 from zou.app.models.project import Project
 from zou.app.models.entity import Entity
@@ -10,6 +11,7 @@ from zou.app.models.task_type import TaskType
 
 from zou.app.services import emails_service, tasks_service
 from zou.app.services.exception import PersonNotFoundException
+from zou.app.stores import notifications_store
 from zou.app.utils import events, fields, query as query_utils
 
 
@@ -37,6 +39,8 @@ def create_notification(
         type=type,
         created_at=creation_date
     )
+    if not read:
+        notifications_store.increment_unread_count(person_id)
     return notification.serialize()
 
 
@@ -90,59 +94,85 @@ def create_notifications_for_task_and_comment(task, comment, change=False):
     """
     For given task and comment, create a notification for every assignee
     to the task and to every person participating to this task.
+    Notifications are stored in a single transaction. Emails are queued, they
+    are sent in the background.
     """
     recipient_ids = get_notification_recipients(task)
     recipient_ids.remove(comment["person_id"])
     author_id = comment["person_id"]
     task = tasks_service.get_task(comment["object_id"])
-
-    for recipient_id in recipient_ids:
+    mention_ids = [
+        recipient_id
+        for recipient_id in comment["mentions"]
+        if recipient_id != author_id
+    ]
+
+    notifications = [
+        (fields.gen_uuid(), recipient_id, "comment", change)
+        for recipient_id in recipient_ids
+    ] + [
+        (fields.gen_uuid(), recipient_id, "mention", False)
+        for recipient_id in mention_ids
+    ]
+    creation_date = fields.get_default_date_object(None)
+    notifications_data = [
+        dict(
+            id=notification_id,
+            read=False,
+            change=is_change,
+            person_id=recipient_id,
+            author_id=author_id,
+            comment_id=comment["id"],
+            task_id=task["id"],
+            type=type,
+            created_at=creation_date,
+        )
+        for (notification_id, recipient_id, type, is_change) in notifications
+    ]
+    try:
+        for notification_data in notifications_data:
+            Notification.create_no_commit(**notification_data)
+        Notification.commit()
+    except SQLAlchemyError:
+        # A recipient may have been removed in the meantime. Notifications
+        # are then created one by one to skip only the failing recipients.
+        db.session.rollback()
+        db.session.remove()
+        created_ids = set()
+        for notification_data in notifications_data:
+            try:
+                Notification.create(**notification_data)
+                created_ids.add(notification_data["id"])
+            except SQLAlchemyError:
+                pass
+        notifications = [
+            notification
+            for notification in notifications
+            if notification[0] in created_ids
+        ]
+
+    for (notification_id, recipient_id, type, _) in notifications:
         try:
-            notification = create_notification(
-                recipient_id,
-                comment_id=comment["id"],
-                author_id=author_id,
-                task_id=task["id"],
-                read=False,
-                change=change,
-                type="comment",
-            )
-            emails_service.send_comment_notification(
-                recipient_id, author_id, comment, task
-            )
-            events.emit(
-                "notification:new",
-                {
-                    "notification_id": notification["id"],
-                    "person_id": recipient_id,
-                },
-                project_id=task["project_id"],
-                persist=False
-            )
+            notifications_store.increment_unread_count(recipient_id)
+            if type == "comment":
+                emails_service.send_comment_notification(
+                    recipient_id, author_id, comment, task
+                )
+            else:
+                emails_service.send_mention_notification(
+                    recipient_id, author_id, comment, task
+                )
         except PersonNotFoundException:
-            pass
-
-    for recipient_id in comment["mentions"]:
-        if recipient_id != comment["person_id"]:
-            notification = create_notification(
-                recipient_id,
-                comment_id=comment["id"],
-                author_id=comment["person_id"],
-                task_id=comment["object_id"],
-                type="mention",
-            )
-            emails_service.send_mention_notification(
-                recipient_id, author_id, comment, task
-            )
-            events.emit(
-                "notification:new",
-                {
-                    "notification_id": notification["id"],
-                    "person_id": recipient_id,
-                },
-                project_id=task["project_id"],
-                persist=False,
-            )
+            continue
+        events.emit(
+            "notification:new",
+            {
+                "notification_id": str(notification_id),
+                "person_id": recipient_id,
+            },
+            project_id=task["project_id"],
+            persist=False,
+        )
 
     return recipient_ids
 
@@ -153,7 +183,13 @@ def reset_notifications_for_mentions(comment):
     to the comment and recreate notifications for the mentions listed in the
     comment.
     """
+    mentions = Notification.get_all_by(
+        type="mention", comment_id=comment["id"]
+    )
     Notification.delete_all_by(type="mention", comment_id=comment["id"])
+    clear_unread_notifications_counts(
+        [notification.person_id for notification in mentions]
+    )
     notifications = []
     task = tasks_service.get_task(comment["object_id"])
     author_id = comment["person_id"]
@@ -205,6 +241,49 @@ def create_assignation_notification(task_id, person_id, author_id=None):
         return None
 
 
+def create_assignation_notifications(tasks, person_id, author_id):
+    """
+    Create notifications following the assignation of several tasks to given
+    person. Notifications are stored in a single transaction and the person
+    receives a single email digest listing all the tasks.
+    """
+    if str(author_id) == str(person_id) or len(tasks) == 0:
+        return []
+
+    creation_date = fields.get_default_date_object(None)
+    try:
+        notifications = [
+            Notification.create_no_commit(
+                read=False,
+                change=False,
+                person_id=person_id,
+                author_id=author_id,
+                task_id=task["id"],
+                type="assignation",
+                created_at=creation_date
+            )
+            for task in tasks
+        ]
+        Notification.commit()
+    except:
+        db.session.rollback()
+        db.session.remove()
+        raise
+
+    notifications_store.increment_unread_count(person_id, len(notifications))
+
+    notifications = fields.serialize_models(notifications)
+    emails_service.send_assignation_digest(person_id, author_id, tasks)
+    for notification, task in zip(notifications, tasks):
+        events.emit(
+            "notification:new",
+            {"notification_id": notification["id"], "person_id": person_id},
+            project_id=task["project_id"],
+            persist=False,
+        )
+    return notifications
+
+
 def get_task_subscription_raw(person_id, task_id):
     """
     Return subscription matching given person and task.
@@ -324,6 +403,9 @@ def delete_notifications_for_comment(comment_id):
     notifications = Notification.get_all_by(comment_id=comment_id)
     for notification in notifications:
         notification.delete()
+    clear_unread_notifications_counts(
+        [notification.person_id for notification in notifications]
+    )
     return fields.serialize_list(notifications)
 
 
@@ -358,3 +440,39 @@ def get_notifications_for_project(project_id, page=0):
         .order_by(Notification.updated_at.desc())
     )
     return query_utils.get_paginated_results(query, page)
+
+
+def get_unread_notifications_count(person_id):
+    """
+    Return the number of unread notifications of given person. The count is
+    read from the key value store, it is computed from the database only
+    when the counter is not set.
+    """
+    count = notifications_store.get_unread_count(person_id)
+    if count is None:
+        count = Notification.query.filter_by(
+            person_id=person_id,
+            read=False
+        ).count()
+        notifications_store.set_unread_count(person_id, count)
+    return count
+
+
+def decrement_unread_notifications_count(person_id, amount=1):
+    """
+    Update the unread notifications counter of given person after some of
+    its notifications were marked as read.
+    """
+    notifications_store.increment_unread_count(person_id, -amount)
+
+
+def clear_unread_notifications_counts(person_ids=None):
+    """
+    Clear the unread notifications counters of given people (or of everyone
+    if no person is given). They will be recomputed on next read. It must
+    be called after changes that are not tracked by the counters, like
+    notification deletions.
+    """
+    if person_ids is not None:
+        person_ids = set(str(person_id) for person_id in person_ids)
+    return notifications_store.clear_unread_counts(person_ids)
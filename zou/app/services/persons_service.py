@@ -6,12 +6,15 @@ from dateutil import relativedelta
 
 from sqlalchemy.exc import StatementError
 
+from flask import g, has_request_context
 from flask_jwt_extended import get_jwt_identity
 
 from zou.app.models.department import Department
 from zou.app.models.desktop_login_log import DesktopLoginLog
 from zou.app.models.organisation import Organisation
 from zou.app.models.person import Person
+from zou.app.models.project import ProjectPersonLink
+from zou.app.models.task import Task, assignees_table
 
 from zou.app.utils import fields, events, cache, emails
 from zou.app import config
@@ -26,6 +29,12 @@ def clear_person_cache():
     cache.cache.delete_memoized(get_person_by_desktop_login)
     cache.cache.delete_memoized(get_active_persons)
     cache.cache.delete_memoized(get_persons)
+    cache.cache.delete_memoized(get_access_snapshot)
+    clear_current_user()
+    # The studio context embeds the person list.
+    from zou.app.services import user_service
+
+    user_service.clear_studio_context_cache()
 
 
 @cache.memoize_function(120)
@@ -138,17 +147,101 @@ def get_person_by_desktop_login(desktop_login):
 def get_current_user():
     """
     Return person from its auth token (the one that does the request) as a
-    dictionary.
+    dictionary. The person is resolved once per request, then pinned to the
+    request context.
     """
-    return get_person_by_email(get_jwt_identity())
+    email = get_jwt_identity()
+    if not has_request_context():
+        return get_person_by_email(email)
+
+    pinned_user = g.get("current_user")
+    if pinned_user is None or pinned_user[0] != email:
+        pinned_user = (email, get_person_by_email(email))
+        g.current_user = pinned_user
+    return pinned_user[1]
+
+
+def get_current_user_id():
+    """
+    Return id of the person that does the request. It doesn't require any
+    database access once the current user is pinned to the request context.
+    """
+    return get_current_user()["id"]
 
 
 def get_current_user_raw():
     """
     Return person from its auth token (the one that does the request) as an
-    active record.
+    active record. Like for the dictionary, the record is fetched once per
+    request.
+    """
+    email = get_jwt_identity()
+    if not has_request_context():
+        return get_person_by_email_raw(email)
+
+    pinned_user = g.get("current_user_raw")
+    if pinned_user is None or pinned_user[0] != email:
+        pinned_user = (email, get_person_by_email_raw(email))
+        g.current_user_raw = pinned_user
+    return pinned_user[1]
+
+
+def clear_current_user():
+    """
+    Remove current user from the request context, it will be fetched again
+    on next access.
+    """
+    if has_request_context():
+        g.pop("current_user", None)
+        g.pop("current_user_raw", None)
+
+
+@cache.memoize_function(120)
+def get_access_snapshot(person_id):
+    """
+    Return what given person can access: role flags, ids of the projects
+    where the person is part of the team and ids of the entities for which
+    the person has a task assigned. Ids are stored in sets for constant time
+    membership checks. The snapshot is cleared when teams, assignations or
+    people change (see clear_access_snapshot).
+    """
+    person = get_person_raw(person_id)
+    project_ids = ProjectPersonLink.query \
+        .filter(ProjectPersonLink.person_id == person_id) \
+        .with_entities(ProjectPersonLink.project_id)
+    entity_ids = Task.query \
+        .join(assignees_table, assignees_table.c.task == Task.id) \
+        .filter(assignees_table.c.person == person_id) \
+        .with_entities(Task.entity_id) \
+        .distinct()
+    return {
+        "person_id": str(person.id),
+        "role": person.role,
+        "is_admin": person.role == "admin",
+        "is_manager": person.role in ["admin", "manager"],
+        "is_client": person.role == "client",
+        "is_vendor": person.role == "vendor",
+        "project_ids": set(str(project_id) for (project_id,) in project_ids),
+        "entity_ids": set(str(entity_id) for (entity_id,) in entity_ids),
+    }
+
+
+def get_current_access_snapshot():
     """
-    return get_person_by_email_raw(get_jwt_identity())
+    Return access snapshot of the current user.
+    """
+    return get_access_snapshot(get_current_user_id())
+
+
+def clear_access_snapshot(person_id=None):
+    """
+    Clear the access snapshot of given person, or of everyone if no person
+    is given.
+    """
+    if person_id is None:
+        cache.cache.delete_memoized(get_access_snapshot)
+    else:
+        cache.cache.delete_memoized(get_access_snapshot, str(person_id))
 
 
 def create_person(
@@ -370,7 +370,14 @@ def playlist_previews(shots, only_movies=False):
             ):
                 preview_files.append(preview_file)
 
-    return [{'id': x['id'], 'extension': x['extension']} for x in preview_files]
+    return [
+        {
+            "id": x["id"],
+            "extension": x["extension"],
+            "movie_info": x.get("movie_info"),
+        }
+        for x in preview_files
+    ]
 
 
 def retrieve_playlist_tmp_files(preview_files):
@@ -441,19 +448,25 @@ def build_playlist_movie_file(playlist, shots, params, remote):
         previews = playlist_previews(shots, only_movies=True)
         movie_file_path = get_playlist_movie_file_path(job)
         tmp_file_paths = retrieve_playlist_tmp_files(previews)
+        movie_infos = [preview["movie_info"] for preview in previews]
 
-        # First, try using concat demuxer
-        success = _run_concatenation(
-            playlist, job, tmp_file_paths, movie_file_path, params,
-            movie.concat_demuxer
-        )
+        # First, try using concat demuxer, unless stored movie metadata
+        # show it can't work.
+        if (
+            movie.is_demuxer_compatible(movie_infos) or
+            any(info is None for info in movie_infos)
+        ):
+            success = _run_concatenation(
+                playlist, job, tmp_file_paths, movie_file_path, params,
+                movie.concat_demuxer, movie_infos
+            )
 
         # Try again using concat filter
         if not success:
             if not remote:
                 success = _run_concatenation(
                     playlist, job, tmp_file_paths, movie_file_path, params,
-                    movie.concat_filter
+                    movie.concat_filter, movie_infos
                 )
             else:
                 from zou.app import app
@@ -472,7 +485,8 @@ def build_playlist_movie_file(playlist, shots, params, remote):
 
 
 def _run_concatenation(
-    playlist, job, tmp_file_paths, movie_file_path, params, mode
+    playlist, job, tmp_file_paths, movie_file_path, params, mode,
+    movie_infos=None
 ):
     success = False
     try:
@@ -480,6 +494,7 @@ def _run_concatenation(
             mode,
             tmp_file_paths,
             movie_file_path,
+            movie_infos=movie_infos,
             **params._asdict()
         )
         if result["success"] and os.path.exists(movie_file_path):
@@ -3,6 +3,8 @@ import re
 
 import ffmpeg
 
+from rq import get_current_job
+
 from zou.app.stores import file_store
 
 from zou.app.models.preview_file import PreviewFile
@@ -76,6 +78,17 @@ def set_preview_file_as_ready(preview_file_id):
     return update_preview_file(preview_file_id, {"status": "ready"})
 
 
+def set_transcoding_progress(step):
+    """
+    Store the current step of the transcoding in the job metadata, when the
+    transcoding runs in a worker.
+    """
+    job = get_current_job()
+    if job is not None:
+        job.meta["progress"] = step
+        job.save_meta()
+
+
 def prepare_and_store_movie(preview_file_id, uploaded_movie_path):
     """
     Prepare movie preview, normalize the movie as a .mp4, build the thumbnails
@@ -89,6 +102,7 @@ def prepare_and_store_movie(preview_file_id, uploaded_movie_path):
 
         # Build movie
         current_app.logger.info("start normalization")
+        set_transcoding_progress("normalizing")
         try:
             (
                 normalized_movie_path,
@@ -105,6 +119,7 @@ def prepare_and_store_movie(preview_file_id, uploaded_movie_path):
                 current_app.logger.error(err)
 
             current_app.logger.info("file normalized %s" % normalized_movie_path)
+            set_transcoding_progress("storing")
             file_store.add_movie(
                 "previews",
                 preview_file_id,
@@ -124,7 +139,9 @@ def prepare_and_store_movie(preview_file_id, uploaded_movie_path):
             return preview_file
 
         # Build thumbnails
-        size = movie.get_movie_size(normalized_movie_path)
+        set_transcoding_progress("thumbnails")
+        movie_info = movie.get_movie_metadata(normalized_movie_path)
+        size = (movie_info["width"], movie_info["height"])
         original_picture_path = \
             movie.generate_thumbnail(normalized_movie_path)
         tile_picture_path = \
@@ -137,9 +154,11 @@ def prepare_and_store_movie(preview_file_id, uploaded_movie_path):
         # Remove files and update status
         os.remove(uploaded_movie_path)
         os.remove(normalized_movie_path)
+        set_transcoding_progress("done")
         preview_file = update_preview_file(preview_file_id, {
             "status": "ready",
-            "file_size": file_size
+            "file_size": file_size,
+            "movie_info": movie_info,
         })
         return preview_file
 
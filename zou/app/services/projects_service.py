@@ -8,7 +8,7 @@ from zou.app.models.project import Project
 from zou.app.models.project_status import ProjectStatus
 from zou.app.models.task_type import TaskType
 from zou.app.models.task_status import TaskStatus
-from zou.app.services import base_service
+from zou.app.services import base_service, persons_service
 from zou.app.services.exception import (
     ProjectNotFoundException,
     MetadataDescriptorNotFoundException,
@@ -17,6 +17,7 @@ from zou.app.services.exception import (
 from zou.app.utils import fields, events, cache
 
 from sqlalchemy.exc import StatementError
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.exc import ObjectDeletedError
 
 
@@ -27,6 +28,16 @@ def clear_project_cache(project_id):
     cache.cache.delete_memoized(open_projects)
 
 
+def clear_project_status_cache():
+    cache.cache.delete_memoized(get_project_statuses)
+    cache.cache.delete_memoized(get_open_status)
+    cache.cache.delete_memoized(get_closed_status)
+    # The studio context embeds the project status list.
+    from zou.app.services import user_service
+
+    user_service.clear_studio_context_cache()
+
+
 @cache.memoize_function(120)
 def open_projects(name=None, for_client=False):
     """
@@ -50,45 +61,80 @@ def get_projects_with_extra_data(query, for_client=False):
     Helpers function to attach:
     * First episode name to current project when it's a TV Show.
     * Add metadata descriptors for this project.
-    """
-    projects = []
-    for project in query.all():
+
+    Relations, descriptors and first episodes are retrieved for all projects
+    at once.
+    """
+    projects = query.options(
+        selectinload(Project.team),
+        selectinload(Project.asset_types),
+        selectinload(Project.task_statuses),
+        selectinload(Project.task_types),
+    ).all()
+    project_ids = [project.id for project in projects]
+    descriptors = get_descriptors_by_project(project_ids, for_client)
+    first_episode_ids = get_first_episode_ids([
+        project.id
+        for project in projects
+        if project.production_type == "tvshow"
+    ])
+
+    result = []
+    for project in projects:
         project_dict = project.serialize(relations=True)
-        if for_client:
-            descriptors = MetadataDescriptor.get_all_by(
-                project_id=project.id,
-                for_client=True
-            )
-        else:
-            descriptors = MetadataDescriptor.get_all_by(project_id=project.id)
-        project_dict["descriptors"] = []
-        for descriptor in descriptors:
-            project_dict["descriptors"].append(
-                {
-                    "id": fields.serialize_value(descriptor.id),
-                    "name": descriptor.name,
-                    "field_name": descriptor.field_name,
-                    "choices": descriptor.choices,
-                    "for_client": descriptor.for_client or False,
-                    "entity_type": descriptor.entity_type,
-                }
+        project_dict["descriptors"] = descriptors.get(project.id, [])
+        if project.id in first_episode_ids:
+            project_dict["first_episode_id"] = fields.serialize_value(
+                first_episode_ids[project.id]
             )
+        result.append(project_dict)
+    return result
 
-        if project.production_type == "tvshow":
-            first_episode = (
-                Entity.query.join(EntityType)
-                .filter(EntityType.name == "Episode")
-                .filter(Entity.project_id == project.id)
-                .order_by(Entity.name)
-                .first()
-            )
-            if first_episode is not None:
-                project_dict["first_episode_id"] = fields.serialize_value(
-                    first_episode.id
-                )
 
-        projects.append(project_dict)
-    return projects
+def get_descriptors_by_project(project_ids, for_client=False):
+    """
+    Return metadata descriptors of given projects, grouped by project id.
+    """
+    descriptors = {}
+    if len(project_ids) == 0:
+        return descriptors
+
+    query = MetadataDescriptor.query.filter(
+        MetadataDescriptor.project_id.in_(project_ids)
+    )
+    if for_client:
+        query = query.filter(MetadataDescriptor.for_client == True)
+    for descriptor in query.all():
+        descriptors.setdefault(descriptor.project_id, []).append(
+            {
+                "id": fields.serialize_value(descriptor.id),
+                "name": descriptor.name,
+                "field_name": descriptor.field_name,
+                "choices": descriptor.choices,
+                "for_client": descriptor.for_client or False,
+                "entity_type": descriptor.entity_type,
+            }
+        )
+    return descriptors
+
+
+def get_first_episode_ids(project_ids):
+    """
+    Return id of the first episode (by name) of given projects, grouped by
+    project id.
+    """
+    if len(project_ids) == 0:
+        return {}
+
+    episodes = (
+        Entity.query.join(EntityType)
+        .filter(EntityType.name == "Episode")
+        .filter(Entity.project_id.in_(project_ids))
+        .distinct(Entity.project_id)
+        .order_by(Entity.project_id, Entity.name)
+        .with_entities(Entity.project_id, Entity.id)
+    )
+    return {project_id: episode_id for (project_id, episode_id) in episodes}
 
 
 def get_projects():
@@ -147,6 +193,7 @@ def get_or_create_status(name):
     if project_status is None:
         project_status = ProjectStatus(name=name, color="#000000")
         project_status.save()
+        clear_project_status_cache()
     return project_status.serialize()
 
 
@@ -238,14 +285,18 @@ def add_team_member(project_id, person_id):
     """
     Add a person listed in database to the the project team.
     """
-    return _add_to_list_attr(project_id, Person, person_id, 'team')
+    project = _add_to_list_attr(project_id, Person, person_id, 'team')
+    persons_service.clear_access_snapshot(person_id)
+    return project
 
 
 def remove_team_member(project_id, person_id):
     """
     Remove a person listed in database from the the project team.
     """
-    return _remove_from_list_attr(project_id, Person, person_id, 'team')
+    project = _remove_from_list_attr(project_id, Person, person_id, 'team')
+    persons_service.clear_access_snapshot(person_id)
+    return project
 
 
 def add_asset_type_setting(project_id, asset_type_id):
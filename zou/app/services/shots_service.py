@@ -794,12 +794,15 @@ def remove_shot(shot_id, force=False):
     Remove given shot from database. If it has tasks linked to it, it marks
     the shot as canceled. Deletion can be forced.
     """
+    from zou.app.services import breakdown_service
+
     shot = get_shot_raw(shot_id)
     is_tasks_related = Task.query.filter_by(entity_id=shot_id).count() > 0
 
     if is_tasks_related and not force:
         shot.update({"canceled": True})
         clear_shot_cache(shot_id)
+        breakdown_service.clear_casting_cache_for_entity(shot_id)
         events.emit(
             "shot:update",
             {"shot_id": shot_id},
@@ -815,6 +818,7 @@ def remove_shot(shot_id, force=False):
 
         EntityVersion.delete_all_by(entity_id=shot_id)
         Subscription.delete_all_by(entity_id=shot_id)
+        breakdown_service.clear_casting_cache_for_entity(shot_id)
         EntityLink.delete_all_by(entity_in_id=shot_id)
         shot.delete()
         clear_shot_cache(shot_id)
@@ -851,7 +855,11 @@ def remove_sequence(sequence_id, force=False):
     """
     Remove a sequence and all related shots.
     """
+    from zou.app.services import breakdown_service
+
     sequence = get_sequence_raw(sequence_id)
+    # Cast in indexes list sequence names.
+    breakdown_service.clear_casting_cache_for_entity(sequence_id)
     if force:
         for shot in Entity.get_all_by(parent_id=sequence_id):
             remove_shot(shot.id, force=True)
@@ -979,9 +987,12 @@ def update_shot(shot_id, data_dict):
     """
     Update shot fields matching given id with data from dict given in parameter.
     """
+    from zou.app.services import breakdown_service
+
     shot = get_shot_raw(shot_id)
     shot.update(data_dict)
     clear_shot_cache(shot_id)
+    breakdown_service.clear_casting_cache_for_entity(shot_id)
     events.emit(
         "shot:update",
         {"shot_id": shot_id},
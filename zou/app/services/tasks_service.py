@@ -22,7 +22,7 @@ from zou.app.models.news import News
 from zou.app.models.person import Person
 from zou.app.models.preview_file import PreviewFile
 from zou.app.models.project import Project
-from zou.app.models.task import Task
+from zou.app.models.task import Task, assignees_table
 from zou.app.models.task_type import TaskType
 from zou.app.models.task_status import TaskStatus
 from zou.app.models.time_spent import TimeSpent
@@ -64,12 +64,29 @@ def clear_department_cache(department_id):
     cache.cache.delete_memoized(get_departments)
 
 
+def clear_studio_context_cache():
+    # The studio context embeds task statuses, task types and departments.
+    from zou.app.services import user_service
+
+    user_service.clear_studio_context_cache()
+
+
 def clear_task_cache(task_id):
     cache.cache.delete_memoized(get_task, task_id)
     cache.cache.delete_memoized(get_task_with_relations, task_id)
     cache.cache.delete_memoized(get_full_task, task_id)
 
 
+def clear_tasks_cache():
+    """
+    Invalidate cached data of every task at once. It's used by bulk operations
+    for which clearing task entries one by one would be too slow.
+    """
+    cache.cache.delete_memoized(get_task)
+    cache.cache.delete_memoized(get_task_with_relations)
+    cache.cache.delete_memoized(get_full_task)
+
+
 @cache.memoize_function(120)
 def clear_comment_cache(comment_id):
     cache.cache.delete_memoized(get_comment, comment_id)
@@ -675,8 +692,10 @@ def get_person_tasks(person_id, projects, is_done=None):
     """
     Retrieve all tasks for given person and projects.
     """
-    person = Person.get(person_id)
     project_ids = [project["id"] for project in projects]
+    assigned_task_ids = db.session.query(assignees_table.c.task).filter(
+        assignees_table.c.person == person_id
+    )
 
     Sequence = aliased(Entity, name="sequence")
     Episode = aliased(Entity, name="episode")
@@ -686,7 +705,7 @@ def get_person_tasks(person_id, projects, is_done=None):
         .join(EntityType, EntityType.id == Entity.entity_type_id)
         .outerjoin(Sequence, Sequence.id == Entity.parent_id)
         .outerjoin(Episode, Episode.id == Sequence.parent_id)
-        .filter(Task.assignees.contains(person))
+        .filter(Task.id.in_(assigned_task_ids))
         .filter(Project.id.in_(project_ids))
         .add_columns(
             Project.name,
@@ -804,7 +823,9 @@ def get_last_comment_map(task_ids):
 
 def create_tasks(task_type, entities):
     """
-    Create a new task for given task type and for each entity.
+    Create a new task for given task type and for each entity. Existing tasks
+    are detected with a single query and new tasks are inserted in bulk. A
+    single *task:new-batch* event is emitted per project.
     """
     task_status = get_todo_status()
     current_user_id = None
@@ -813,39 +834,69 @@ def create_tasks(task_type, entities):
     except RuntimeError:
         pass
 
-    tasks = []
-    for entity in entities:
-        existing_task = Task.query \
-            .filter_by(
-                entity_id=entity["id"],
-                task_type_id=task_type["id"]
-            ) \
-            .scalar()
-        if existing_task is None:
-            task = Task.create_no_commit(
-                name="main",
-                duration=0,
-                estimation=0,
-                completion_rate=0,
-                start_date=None,
-                end_date=None,
-                due_date=None,
-                real_start_date=None,
-                project_id=entity["project_id"],
-                task_type_id=task_type["id"],
-                task_status_id=task_status["id"],
-                entity_id=entity["id"],
-                assigner_id=current_user_id,
-                assignees=[],
+    entity_ids = [entity["id"] for entity in entities]
+    existing_entity_ids = set()
+    if len(entity_ids) > 0:
+        existing_entity_ids = set(
+            str(entity_id)
+            for (entity_id,) in Task.query.filter(
+                Task.task_type_id == task_type["id"]
             )
-            tasks.append(task)
-    Task.commit()
+            .filter(Task.entity_id.in_(entity_ids))
+            .with_entities(Task.entity_id)
+        )
+
+    now = datetime.datetime.utcnow()
+    task_rows = []
+    for entity in entities:
+        if entity["id"] not in existing_entity_ids:
+            existing_entity_ids.add(entity["id"])
+            task_rows.append({
+                "id": fields.gen_uuid(),
+                "name": "main",
+                "priority": 0,
+                "duration": 0,
+                "estimation": 0,
+                "completion_rate": 0,
+                "retake_count": 0,
+                "sort_order": 0,
+                "project_id": entity["project_id"],
+                "task_type_id": task_type["id"],
+                "task_status_id": task_status["id"],
+                "entity_id": entity["id"],
+                "assigner_id": current_user_id,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+    try:
+        db.session.bulk_insert_mappings(Task, task_rows)
+        db.session.commit()
+    except:
+        db.session.rollback()
+        db.session.remove()
+        raise
 
     task_dicts = []
-    for task in tasks:
-        task_dict = _finalize_task_creation(task_type, task_status, task)
-        task_dicts.append(task_dict)
+    task_ids_by_project = collections.OrderedDict()
+    for task_row in task_rows:
+        task_dict = {column.name: None for column in Task.__table__.columns}
+        task_dict.update(task_row)
+        task_dict = fields.serialize_dict(task_dict)
+        task_dict["type"] = "Task"
+        task_dicts.append(
+            _add_task_type_and_status_fields(task_dict, task_type, task_status)
+        )
+        task_ids_by_project.setdefault(
+            task_dict["project_id"], []
+        ).append(task_dict["id"])
 
+    for project_id, task_ids in task_ids_by_project.items():
+        events.emit(
+            "task:new-batch",
+            {"task_type_id": task_type["id"], "task_ids": task_ids},
+            project_id=project_id
+        )
     return task_dicts
 
 
@@ -883,7 +934,18 @@ def create_task(task_type, entity, name="main"):
 
 
 def _finalize_task_creation(task_type, task_status, task):
-    task_dict = task.serialize()
+    task_dict = _add_task_type_and_status_fields(
+        task.serialize(), task_type, task_status
+    )
+    events.emit(
+        "task:new",
+        {"task_id": task.id},
+        project_id=task_dict["project_id"]
+    )
+    return task_dict
+
+
+def _add_task_type_and_status_fields(task_dict, task_type, task_status):
     task_dict["assignees"] = []
     task_dict.update(
         {
@@ -897,11 +959,6 @@ def _finalize_task_creation(task_type, task_status, task):
             "task_type_priority": task_type["priority"],
         }
     )
-    events.emit(
-        "task:new",
-        {"task_id": task.id},
-        project_id=task_dict["project_id"]
-    )
     return task_dict
 
 
@@ -944,6 +1001,8 @@ def get_or_create_status(
             is_done=is_done,
             is_retake=is_retake,
         )
+        clear_task_status_cache(str(task_status.id))
+        clear_studio_context_cache()
         events.emit("task-status:new", {"task_status_id": task_status.id})
     return task_status.serialize()
 
@@ -968,7 +1027,8 @@ def get_or_create_department(name):
     if department is None:
         department = Department(name=name, color="#000000")
         department.save()
-        clear_department_cache(department.id)
+        clear_department_cache(str(department.id))
+        clear_studio_context_cache()
         events.emit("department:new", {"department_id": department.id})
     return department.serialize()
 
@@ -998,6 +1058,8 @@ def get_or_create_task_type(
             for_shots=for_shots,
             shotgun_id=shotgun_id,
         )
+        clear_task_type_cache(str(task_type.id))
+        clear_studio_context_cache()
         events.emit("task-type:new", {"task_type_id": task_type.id})
     return task_type.serialize()
 
@@ -1074,6 +1136,8 @@ def clear_assignation(task_id):
     assignees = [person.serialize() for person in task.assignees]
     task.update({"assignees": []})
     clear_task_cache(task_id)
+    for assignee in assignees:
+        persons_service.clear_access_snapshot(assignee["id"])
     task_dict = task.serialize()
     for assignee in assignees:
         events.emit(
@@ -1101,10 +1165,71 @@ def assign_task(task_id, person_id):
         project_id=project_id
     )
     clear_task_cache(task_id)
+    persons_service.clear_access_snapshot(person_id)
     events.emit("task:update", {"task_id": task_id}, project_id=project_id)
     return task_dict
 
 
+def assign_tasks(task_ids, person_id):
+    """
+    Assign given person to given tasks. Assignations are inserted with a single
+    statement. Wrong task IDs are ignored, like tasks already assigned to the
+    person. Emit a *task:assign* event for each new assignation and return the
+    newly assigned tasks.
+    """
+    person = persons_service.get_person_raw(person_id)
+    person_id = str(person.id)
+    task_ids = [task_id for task_id in task_ids if fields.is_valid_id(task_id)]
+    if len(task_ids) == 0:
+        return []
+
+    tasks = Task.query.filter(Task.id.in_(task_ids)).all()
+    already_assigned_ids = set(
+        str(task_id)
+        for (task_id,) in db.session.query(assignees_table.c.task)
+        .filter(assignees_table.c.person == person_id)
+        .filter(assignees_table.c.task.in_(task_ids))
+    )
+    tasks_to_assign = [
+        task for task in tasks if str(task.id) not in already_assigned_ids
+    ]
+
+    try:
+        now = datetime.datetime.now()
+        for task in tasks_to_assign:
+            task.updated_at = now
+        task_dicts = [task.serialize() for task in tasks_to_assign]
+        if len(tasks_to_assign) > 0:
+            db.session.execute(
+                assignees_table.insert(),
+                [
+                    {"task": task.id, "person": person_id}
+                    for task in tasks_to_assign
+                ],
+            )
+        db.session.commit()
+    except:
+        db.session.rollback()
+        db.session.remove()
+        raise
+
+    clear_tasks_cache()
+    persons_service.clear_access_snapshot(person_id)
+    for task_dict in task_dicts:
+        project_id = task_dict["project_id"]
+        events.emit(
+            "task:assign",
+            {"task_id": task_dict["id"], "person_id": person_id},
+            project_id=project_id
+        )
+        events.emit(
+            "task:update",
+            {"task_id": task_dict["id"]},
+            project_id=project_id
+        )
+    return task_dicts
+
+
 def start_task(task_id):
     """
     Deprecated
@@ -0,0 +1,134 @@
+"""
+Movie previews are transcoded by dedicated workers listening to the
+transcoding queues (one queue per priority). This module enqueues the
+transcoding jobs, cancels them and reports their status.
+"""
+import os
+
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+
+from zou.app import config
+from zou.app.services import files_service, preview_files_service
+from zou.app.services.exception import WrongParameterException
+from zou.app.stores import queue_store
+
+DEFAULT_PRIORITY = "normal"
+
+
+def get_job_id(preview_file_id):
+    return "transcoding-%s" % preview_file_id
+
+
+def check_priority(priority):
+    """
+    Raise a WrongParameterException if given priority is not a transcoding
+    priority.
+    """
+    if priority not in queue_store.TRANSCODING_PRIORITIES:
+        raise WrongParameterException(
+            "Priority must be one of: %s"
+            % ", ".join(queue_store.TRANSCODING_PRIORITIES)
+        )
+    return priority
+
+
+def queue_movie_transcoding(
+    preview_file_id, uploaded_movie_path, priority=DEFAULT_PRIORITY
+):
+    """
+    Add the transcoding of given uploaded movie to the queue of given
+    priority.
+    """
+    check_priority(priority)
+    return queue_store.transcoding_queues[priority].enqueue(
+        preview_files_service.prepare_and_store_movie,
+        args=(preview_file_id, uploaded_movie_path),
+        job_id=get_job_id(preview_file_id),
+        job_timeout=config.TRANSCODING_JOB_TIMEOUT,
+        meta={"priority": priority, "progress": "queued"},
+    )
+
+
+def get_job(preview_file_id):
+    """
+    Return the transcoding job of given preview file, None if there is no job
+    (not queued or expired).
+    """
+    if not config.ENABLE_JOB_QUEUE:
+        return None
+    try:
+        return Job.fetch(
+            get_job_id(preview_file_id), connection=queue_store.queue_store
+        )
+    except NoSuchJobError:
+        return None
+
+
+def get_queue_position(job):
+    """
+    Return the number of jobs to process before given queued job, including
+    jobs of higher priority queues.
+    """
+    priority = job.meta.get("priority", DEFAULT_PRIORITY)
+    position = 0
+    for (queue_priority, queue) in queue_store.transcoding_queues.items():
+        if queue_priority == priority:
+            job_ids = queue.job_ids
+            if job.id in job_ids:
+                return position + job_ids.index(job.id)
+            return None
+        position += queue.count
+    return None
+
+
+def get_transcoding_status(preview_file_id):
+    """
+    Return status of the preview file and of its transcoding job: job status,
+    priority, current step and position in the queues.
+    """
+    preview_file = files_service.get_preview_file(preview_file_id)
+    result = {
+        "preview_file_id": preview_file_id,
+        "status": preview_file["status"],
+        "job_status": None,
+        "priority": None,
+        "progress": None,
+        "queue_position": None,
+    }
+    job = get_job(preview_file_id)
+    if job is not None:
+        job_status = job.get_status()
+        result.update({
+            "job_status": job_status,
+            "priority": job.meta.get("priority"),
+            "progress": job.meta.get("progress"),
+        })
+        if job_status == "queued":
+            result["queue_position"] = get_queue_position(job)
+    return result
+
+
+def cancel_transcoding(preview_file_id):
+    """
+    Cancel the transcoding of given preview file. Only queued jobs can be
+    cancelled: the job is removed from its queue, then the uploaded movie is
+    removed and the preview file is marked as broken.
+    """
+    job = get_job(preview_file_id)
+    if job is None:
+        raise WrongParameterException(
+            "No queued transcoding for this preview file."
+        )
+    priority = job.meta.get("priority", DEFAULT_PRIORITY)
+    queue = queue_store.transcoding_queues[priority]
+    # Removing the job from the queue fails if a worker already took it.
+    if queue.remove(job) == 0:
+        raise WrongParameterException(
+            "No queued transcoding for this preview file."
+        )
+    (_, uploaded_movie_path) = job.args
+    job.delete(remove_from_queue=False)
+    if os.path.exists(uploaded_movie_path):
+        os.remove(uploaded_movie_path)
+    return preview_files_service.set_preview_file_as_broken(preview_file_id)
@@ -1,13 +1,18 @@
+import hashlib
+import json
+
 from sqlalchemy.orm import aliased
 
+from zou.app import db
+
 from zou.app.models.comment import Comment
 from zou.app.models.entity import Entity
 from zou.app.models.entity_type import EntityType
 from zou.app.models.notification import Notification
-from zou.app.models.project import Project
+from zou.app.models.project import Project, ProjectPersonLink
 from zou.app.models.project_status import ProjectStatus
 from zou.app.models.search_filter import SearchFilter
-from zou.app.models.task import Task
+from zou.app.models.task import Task, assignees_table
 from zou.app.models.task_type import TaskType
 
 from zou.app.services import (
@@ -39,8 +44,10 @@ def build_assignee_filter():
     """
     Query filter for task to retrieve only tasks assigned to current user.
     """
-    current_user = persons_service.get_current_user_raw()
-    return Task.assignees.contains(current_user)
+    assigned_task_ids = db.session.query(assignees_table.c.task).filter(
+        assignees_table.c.person == persons_service.get_current_user_id()
+    )
+    return Task.id.in_(assigned_task_ids)
 
 
 def build_team_filter():
@@ -48,8 +55,10 @@ def build_team_filter():
     Query filter for task to retrieve only models from project for which the
     user is part of the team.
     """
-    current_user = persons_service.get_current_user_raw()
-    return Project.team.contains(current_user)
+    team_project_ids = db.session.query(ProjectPersonLink.project_id).filter(
+        ProjectPersonLink.person_id == persons_service.get_current_user_id()
+    )
+    return Project.id.in_(team_project_ids)
 
 
 def build_open_project_filter():
@@ -296,12 +305,8 @@ def check_working_on_entity(entity_id):
     """
     Return True if user has task assigned which is related to given entity.
     """
-    current_user = persons_service.get_current_user_raw()
-    query = Task.query.filter(Task.assignees.contains(current_user)).filter(
-        Task.entity_id == entity_id
-    )
-
-    if query.first() is None:
+    snapshot = persons_service.get_current_access_snapshot()
+    if str(entity_id) not in snapshot["entity_ids"]:
         raise permissions.PermissionDenied
 
     return True
@@ -326,12 +331,8 @@ def check_belong_to_project(project_id):
     if project_id is None:
         return False
 
-    project = projects_service.get_project_with_relations(str(project_id))
-    current_user = persons_service.get_current_user()
-    if current_user["id"] in project["team"]:
-        return True
-    else:
-        return False
+    snapshot = persons_service.get_current_access_snapshot()
+    return str(project_id) in snapshot["project_ids"]
 
 
 def check_project_access(project_id):
@@ -363,14 +364,8 @@ def check_entity_access(entity_id):
     """
     is_allowed = not permissions.has_vendor_permissions()
     if not is_allowed:
-        nb_tasks = (
-            Task
-            .query
-            .filter(Task.entity_id == entity_id)
-            .filter(build_assignee_filter())
-            .count()
-        )
-        if nb_tasks == 0:
+        snapshot = persons_service.get_current_access_snapshot()
+        if str(entity_id) not in snapshot["entity_ids"]:
             raise permissions.PermissionDenied
         is_allowed = True
     return is_allowed
@@ -519,12 +514,8 @@ def get_unread_notifications_count(notification_id=None):
     """
     Return the number of unread notifications.
     """
-    current_user = persons_service.get_current_user()
-    return (
-        Notification.query.filter_by(
-            person_id=current_user["id"],
-            read=False
-        ).count()
+    return notifications_service.get_unread_notifications_count(
+        persons_service.get_current_user_id()
     )
 
 
@@ -625,6 +616,9 @@ def mark_notifications_as_read():
 
     for notification in notifications:
         notification.update({"read": True})
+    notifications_service.decrement_unread_notifications_count(
+        current_user["id"], len(notifications)
+    )
 
     return fields.serialize_list(notifications)
 
@@ -708,33 +702,66 @@ def get_timezone():
     return timezone or "Europe/Paris"
 
 
-def get_context():
+def clear_studio_context_cache():
+    cache.cache.delete_memoized(get_studio_context)
+
+
+@cache.memoize_function(120)
+def get_studio_context(minimal=False):
+    """
+    Return the part of the context shared by the whole studio: asset types,
+    custom actions, departments, people, project statuses, task types and
+    task statuses. It comes with a version (a hash of its content) that
+    changes every time the studio context is modified.
+    """
+    context = {
+        "asset_types": assets_service.get_asset_types(),
+        "custom_actions": custom_actions_service.get_custom_actions(),
+        "departments": tasks_service.get_departments(),
+        "persons": persons_service.get_persons(minimal=minimal),
+        "project_status": projects_service.get_project_statuses(),
+        "task_types": tasks_service.get_task_types(),
+        "task_status": tasks_service.get_task_statuses(),
+    }
+    return {"version": get_context_hash(context), "context": context}
+
+
+def get_user_context():
+    """
+    Return the part of the context specific to current user: open projects,
+    unread notification count and search filters.
+    """
     if permissions.has_admin_permissions():
         projects = projects_service.open_projects()
     else:
         projects = get_open_projects()
 
-    asset_types = assets_service.get_asset_types()
-    custom_actions = custom_actions_service.get_custom_actions()
-    persons = persons_service.get_persons(
-        minimal=not permissions.has_manager_permissions()
-    )
-    notification_count = get_unread_notifications_count()
-    project_status_list = projects_service.get_project_statuses()
-    departments = tasks_service.get_departments()
-    task_types = tasks_service.get_task_types()
-    task_status_list = tasks_service.get_task_statuses()
-    search_filters = get_filters()
-
     return {
-        "asset_types": asset_types,
-        "custom_actions": custom_actions,
-        "departments": departments,
-        "notification_count": notification_count,
-        "persons": persons,
-        "project_status": project_status_list,
+        "notification_count": get_unread_notifications_count(),
         "projects": projects,
-        "task_types": task_types,
-        "task_status": task_status_list,
-        "search_filters": search_filters,
+        "search_filters": get_filters(),
     }
+
+
+def get_context(studio_version=None):
+    """
+    Return context required to run a full app connected to the API. If the
+    given studio version is the current one, the studio context is not
+    included: the client already has it.
+    """
+    studio_context = get_studio_context(
+        minimal=not permissions.has_manager_permissions()
+    )
+    context = get_user_context()
+    context["studio_version"] = studio_context["version"]
+    if studio_version != studio_context["version"]:
+        context.update(studio_context["context"])
+    return context
+
+
+def get_context_hash(context):
+    """
+    Return a hash of given context, suitable for versioning and ETags.
+    """
+    content = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
@@ -1,18 +1,29 @@
 import sys
-import redis
+import threading
+import time
 
 from zou.app import config
-
-
-try:
-    revoked_tokens_store = redis.StrictRedis(
-        host=config.KEY_VALUE_STORE["host"],
-        port=config.KEY_VALUE_STORE["port"],
-        db=config.AUTH_TOKEN_BLACKLIST_KV_INDEX,
-        decode_responses=True,
+from zou.app.utils import redis_pools
+
+KEY_BATCH_SIZE = 1000
+INVALIDATION_CHANNEL = "auth-tokens:invalidations"
+LOCAL_CACHE_MAX_SIZE = 100000
+
+# Revocation statuses read recently: jti -> (status, expiration time). The
+# cache is only used while this process listens to invalidation messages.
+local_cache = {}
+local_cache_lock = threading.Lock()
+is_listening = False
+listener_thread = None
+# Incremented on each eviction. A status read from Redis is not cached if an
+# eviction occured during the read.
+nb_evictions = 0
+
+if redis_pools.is_kv_available():
+    revoked_tokens_store = redis_pools.get_client(
+        config.AUTH_TOKEN_BLACKLIST_KV_INDEX
     )
-    revoked_tokens_store.get("test")
-except redis.ConnectionError:
+else:
     try:
         import fakeredis
 
@@ -26,7 +37,9 @@ def add(key, token, ttl=None):
     """
     Store a token with key as access key.
     """
-    return revoked_tokens_store.set(key.encode("utf-8"), token, ex=ttl)
+    result = revoked_tokens_store.set(key.encode("utf-8"), token, ex=ttl)
+    invalidate(key)
+    return result
 
 
 def get(key):
@@ -43,32 +56,175 @@ def delete(key):
     """
     Remove auth token corresponding at given key.
     """
-    return revoked_tokens_store.delete(key.encode("utf-8"))
+    result = revoked_tokens_store.delete(key.encode("utf-8"))
+    invalidate(key)
+    return result
 
 
 def keys():
     """
-    Get all keys available in the store.
+    Get all keys available in the store. Keys are listed with SCAN, so the
+    store is not blocked while listing them.
     """
-    keys = revoked_tokens_store.keys()
-    if len(keys) > 0 and hasattr(keys[0], "decode"):
-        return [x.decode("utf-8") for x in revoked_tokens_store.keys()]
-    else:
-        return [x for x in revoked_tokens_store.keys()]
+    return [
+        decode_key(key)
+        for keys_batch in iter_key_batches()
+        for key in keys_batch
+    ]
+
+
+def iter_key_batches(batch_size=KEY_BATCH_SIZE):
+    """
+    Iterate over the keys of the store by batches of *batch_size* keys.
+    """
+    keys_batch = []
+    for key in revoked_tokens_store.scan_iter(count=batch_size):
+        keys_batch.append(key)
+        if len(keys_batch) >= batch_size:
+            yield keys_batch
+            keys_batch = []
+    if len(keys_batch) > 0:
+        yield keys_batch
+
+
+def decode_key(key):
+    if hasattr(key, "decode"):
+        return key.decode("utf-8")
+    return key
 
 
 def clear():
     """
     Clear all auth token stored in the store.
     """
-    for key in keys():
-        delete(key)
+    nb_deleted = 0
+    for keys_batch in iter_key_batches():
+        nb_deleted += redis_pools.delete_many(revoked_tokens_store, keys_batch)
+    invalidate("*")
+    return nb_deleted
+
+
+def clean():
+    """
+    Remove keys stored without expiration (tokens stored by former versions).
+    Other keys are set with a TTL and expire by themselves. TTLs are read
+    with a pipeline for each batch of keys.
+    """
+    nb_deleted = 0
+    for keys_batch in iter_key_batches():
+        pipeline = revoked_tokens_store.pipeline(transaction=False)
+        for key in keys_batch:
+            pipeline.ttl(key)
+        ttls = pipeline.execute()
+        keys_to_delete = [
+            key for (key, ttl) in zip(keys_batch, ttls) if ttl == -1
+        ]
+        nb_deleted += redis_pools.delete_many(
+            revoked_tokens_store, keys_to_delete
+        )
+    return nb_deleted
 
 
 def is_revoked(decrypted_token):
     """
-    Tell if a stored auth token is revoked or not.
+    Tell if a stored auth token is revoked or not. Statuses are kept in a
+    local cache for a few seconds. Changes made to a token by any process are
+    broadcast, so they evict the cached status immediately.
     """
     jti = decrypted_token["jti"]
-    is_revoked = get(jti)
-    return (is_revoked is None) or (is_revoked == "true")
+    is_revoked = get_cached_status(jti)
+    if is_revoked is None:
+        evictions_before_read = nb_evictions
+        value = get(jti)
+        is_revoked = (value is None) or (value == "true")
+        set_cached_status(jti, is_revoked, evictions_before_read)
+    return is_revoked
+
+
+def get_cached_status(jti):
+    if not is_local_cache_enabled():
+        return None
+    with local_cache_lock:
+        (status, expiration) = local_cache.get(jti, (None, 0))
+    if expiration < time.monotonic():
+        return None
+    return status
+
+
+def set_cached_status(jti, status, evictions_before_read):
+    if not is_local_cache_enabled():
+        return
+    expiration = time.monotonic() + config.AUTH_TOKEN_CACHE_TTL
+    with local_cache_lock:
+        if nb_evictions != evictions_before_read:
+            return
+        if len(local_cache) >= LOCAL_CACHE_MAX_SIZE:
+            local_cache.clear()
+        local_cache[jti] = (status, expiration)
+
+
+def is_local_cache_enabled():
+    """
+    The local cache is enabled only when invalidation messages are received,
+    otherwise a revoked token could be accepted until its status expires.
+    """
+    if config.AUTH_TOKEN_CACHE_TTL <= 0:
+        return False
+    start_listener()
+    return is_listening
+
+
+def invalidate(key):
+    """
+    Evict given key (or all keys when key is "*") from the local cache of
+    every process.
+    """
+    evict(key)
+    try:
+        revoked_tokens_store.publish(INVALIDATION_CHANNEL, key)
+    except Exception:
+        pass
+
+
+def evict(key):
+    global nb_evictions
+    with local_cache_lock:
+        nb_evictions += 1
+        if key == "*":
+            local_cache.clear()
+        else:
+            local_cache.pop(key, None)
+
+
+def start_listener():
+    global listener_thread
+    if listener_thread is None:
+        listener_thread = threading.Thread(
+            target=listen_invalidations, name="auth-tokens-invalidations"
+        )
+        listener_thread.daemon = True
+        listener_thread.start()
+
+
+def listen_invalidations():
+    """
+    Evict keys from the local cache when invalidation messages are received.
+    On connection loss, the cache is disabled and emptied until the
+    subscription is restored.
+    """
+    global is_listening
+    while True:
+        try:
+            pubsub = revoked_tokens_store.pubsub(
+                ignore_subscribe_messages=True
+            )
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            is_listening = True
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message is not None and message["type"] == "message":
+                    evict(decode_key(message["data"]))
+        except Exception:
+            is_listening = False
+            evict("*")
+            time.sleep(1)
@@ -0,0 +1,138 @@
+import json
+import sys
+import time
+
+from zou.app import config
+from zou.app.utils import redis_pools
+
+# Counters are rebuilt from the database once expired. It bounds the time a
+# counter can stay wrong after a concurrent update during a rebuild.
+COUNTER_TTL = 3600
+KEY_BATCH_SIZE = 1000
+# Sorted set of people with a pending digest, scored by the time their
+# digest is due.
+DIGEST_DEADLINES_KEY = "notifications:digest-deadlines"
+
+if redis_pools.is_kv_available():
+    notifications_store = redis_pools.get_client(
+        config.KV_NOTIFICATIONS_DB_INDEX
+    )
+else:
+    try:
+        import fakeredis
+
+        notifications_store = fakeredis.FakeStrictRedis(decode_responses=True)
+    except:
+        print("Cannot access to the required Redis instance")
+        sys.exit(1)
+
+
+def get_unread_count_key(person_id):
+    return "notifications:unread:%s" % person_id
+
+
+def get_unread_count(person_id):
+    """
+    Return the unread notification counter of given person. None is
+    returned if the counter is not set (or is inconsistent).
+    """
+    key = get_unread_count_key(person_id)
+    value = notifications_store.get(key)
+    if value is None:
+        return None
+    elif int(value) < 0:
+        notifications_store.delete(key)
+        return None
+    return int(value)
+
+
+def set_unread_count(person_id, count):
+    """
+    Initialize the unread notification counter of given person. An existing
+    counter is not overwritten: it was updated in the meantime.
+    """
+    return notifications_store.set(
+        get_unread_count_key(person_id), count, nx=True, ex=COUNTER_TTL
+    )
+
+
+def increment_unread_count(person_id, amount=1):
+    """
+    Add given amount (it can be negative) to the unread notification
+    counter of given person. Nothing is done if the counter is not set, it
+    will be rebuilt on next read.
+    """
+    key = get_unread_count_key(person_id)
+
+    def increment(pipeline):
+        if pipeline.exists(key):
+            pipeline.multi()
+            pipeline.incrby(key, amount)
+
+    notifications_store.transaction(increment, key)
+
+
+def clear_unread_counts(person_ids=None):
+    """
+    Remove the unread notification counters of given people, or of everyone
+    if no person is given. Counters are rebuilt on next read.
+    """
+    if person_ids is None:
+        keys = notifications_store.scan_iter(
+            match=get_unread_count_key("*"), count=KEY_BATCH_SIZE
+        )
+    else:
+        keys = [get_unread_count_key(person_id) for person_id in person_ids]
+    return redis_pools.delete_many(notifications_store, keys)
+
+
+def get_digest_key(person_id):
+    return "notifications:digest:%s" % person_id
+
+
+def add_to_digest(person_id, entry, window):
+    """
+    Add given entry to the digest of given person. It returns True if the
+    entry starts a new digest window. The digest is due once the window is
+    over, it is kept until it is popped.
+    """
+    pipeline = notifications_store.pipeline()
+    pipeline.rpush(get_digest_key(person_id), json.dumps(entry))
+    pipeline.zadd(
+        DIGEST_DEADLINES_KEY, {person_id: time.time() + window}, nx=True
+    )
+    (_, is_first) = pipeline.execute()
+    return bool(is_first)
+
+
+def get_due_digests(now=None):
+    """
+    Return ids of people whose digest window is over.
+    """
+    if now is None:
+        now = time.time()
+    return notifications_store.zrangebyscore(DIGEST_DEADLINES_KEY, "-inf", now)
+
+
+def is_digest_due(person_id, now=None):
+    """
+    Return True if the digest window of given person is over.
+    """
+    if now is None:
+        now = time.time()
+    deadline = notifications_store.zscore(DIGEST_DEADLINES_KEY, person_id)
+    return deadline is not None and deadline <= now
+
+
+def pop_digest(person_id):
+    """
+    Return all entries of the digest of given person and empty it. Next
+    entry will start a new digest window.
+    """
+    key = get_digest_key(person_id)
+    pipeline = notifications_store.pipeline()
+    pipeline.lrange(key, 0, -1)
+    pipeline.delete(key)
+    pipeline.zrem(DIGEST_DEADLINES_KEY, person_id)
+    (entries, _, _) = pipeline.execute()
+    return [json.loads(entry) for entry in entries]
@@ -1,8 +1,14 @@
-import redis
+import atexit
+import json
+import threading
 
+from collections import OrderedDict
+
+from flask import has_request_context
 from flask_socketio import SocketIO
 
 from zou.app import config
+from zou.app.utils import redis_pools
 
 host = config.KEY_VALUE_STORE["host"]
 port = config.KEY_VALUE_STORE["port"]
@@ -10,28 +16,233 @@ redis_db = config.KV_EVENTS_DB_INDEX
 redis_url = "redis://%s:%s/%s" % (host, port, redis_db)
 
 socketio = None
+publisher_store = None
+add_to_history_script = None
+
+ALL_EVENTS_ROOM = "all"
+
+# Increment the project sequence and store the event in the project history
+# atomically, so stream entry IDs always follow sequence numbers.
+ADD_TO_HISTORY_SCRIPT = """
+local sequence = redis.call("INCR", KEYS[1])
+redis.call(
+    "XADD", KEYS[2], "MAXLEN", "~", ARGV[1], sequence .. "-0",
+    "name", ARGV[2], "data", ARGV[3]
+)
+return sequence
+"""
+
+batches = {}
+batches_lock = threading.Lock()
 
 
 def publish(event, data):
+    """
+    Send event to the event stream. Events sent to project rooms during a
+    request are coalesced during a short window (see add_to_batch). Clients
+    of the room that listens to all projects still receive events one by
+    one.
+    """
+    project_id = data.get("project_id", None)
+    if publisher_store is not None and project_id not in [None, "None"]:
+        data = dict(data)
+        data["sequence"] = add_to_history(project_id, event, data)
     if socketio is not None:
-        socketio.emit(event, data, namespace="/events")
+        for room in get_event_rooms(event, data):
+            if is_batched(event, room):
+                add_to_batch(room, event, data)
+            else:
+                socketio.emit(event, data, namespace="/events", room=room)
+
+
+def get_event_rooms(event, data):
+    """
+    Return the rooms to which given event must be sent. Notifications go to
+    the room of their recipient. Project events go to the project room and
+    to the room of clients listening to all projects. Other events are sent
+    to every client (None room).
+    """
+    person_id = data.get("person_id", None)
+    project_id = data.get("project_id", None)
+    if event.startswith("notification:") and person_id is not None:
+        return [get_person_room(person_id)]
+    elif project_id not in [None, "None"]:
+        return [get_project_room(project_id), ALL_EVENTS_ROOM]
+    else:
+        return [None]
+
+
+def add_to_history(project_id, event, data):
+    """
+    Store event in the history of given project and return its sequence
+    number. Sequence numbers increase by one for each event of a project.
+    Only the last EVENT_HISTORY_SIZE events (approximately) are kept.
+    """
+    return add_to_history_script(
+        keys=[get_sequence_key(project_id), get_history_key(project_id)],
+        args=[config.EVENT_HISTORY_SIZE, event, json.dumps(data)],
+    )
+
+
+def get_events_after(project_id, sequence, limit=1000):
+    """
+    Return events of given project published after given sequence number,
+    each event being a dict with name, sequence and data keys. The last
+    published sequence number and a flag telling if the history still
+    contains all the events following the given sequence are returned too.
+    """
+    if publisher_store is None:
+        return ([], 0, False)
+
+    last_sequence = int(publisher_store.get(get_sequence_key(project_id)) or 0)
+    entries = publisher_store.xrange(
+        get_history_key(project_id),
+        min="%s-0" % (int(sequence) + 1),
+        max="+",
+        count=limit,
+    )
+    events = []
+    for (entry_id, fields) in entries:
+        data = json.loads(fields["data"])
+        data["sequence"] = int(entry_id.split("-")[0])
+        events.append({
+            "name": fields["name"],
+            "sequence": data["sequence"],
+            "data": data,
+        })
+    first_sequence = events[0]["sequence"] if events else last_sequence + 1
+    is_complete = int(sequence) >= last_sequence or \
+        first_sequence == int(sequence) + 1
+    return (events, last_sequence, is_complete)
+
+
+def get_sequence_key(project_id):
+    return "event-sequence:%s" % project_id
+
+
+def get_history_key(project_id):
+    return "event-history:%s" % project_id
+
+
+def is_batched(event, room):
+    """
+    Events are batched only inside requests: other processes, like job
+    queue workers, can exit before the batch timer runs.
+    """
+    return (
+        config.EVENT_BATCH_WINDOW > 0
+        and has_request_context()
+        and room is not None
+        and room.startswith("project:")
+        and not event.endswith("-batch")
+    )
+
+
+def add_to_batch(room, event, data):
+    """
+    Store event in the batch of given room. The first event of a batch
+    starts a timer that sends the whole batch when the window is over.
+    """
+    with batches_lock:
+        if room not in batches:
+            batches[room] = OrderedDict()
+            timer = threading.Timer(
+                config.EVENT_BATCH_WINDOW, flush_batch, args=(room,)
+            )
+            timer.daemon = True
+            timer.start()
+        batches[room].setdefault(event, []).append(data)
+
+
+def flush_batch(room):
+    """
+    Send one message per event name for the batch of given room. Messages
+    are sent in the order of the first occurrence of each event name. An
+    event that is alone in its batch is sent as is.
+    """
+    with batches_lock:
+        room_batch = batches.pop(room, {})
+    for (event, events_data) in room_batch.items():
+        if len(events_data) == 1:
+            socketio.emit(
+                event, events_data[0], namespace="/events", room=room
+            )
+        else:
+            socketio.emit(
+                "%s-batch" % event,
+                build_batch_data(events_data),
+                namespace="/events",
+                room=room,
+            )
+
+
+@atexit.register
+def flush_batches():
+    for room in list(batches.keys()):
+        flush_batch(room)
+
+
+def build_batch_data(events_data):
+    """
+    Wrap event data into a single dict: the data of each event are kept as
+    is in the events list. The project ID is the one of the events and the
+    sequence number is the one of the last event.
+    """
+    batch_data = {
+        "nb_events": len(events_data),
+        "events": list(events_data),
+    }
+    for data in events_data:
+        if "project_id" in data:
+            batch_data["project_id"] = data["project_id"]
+        if "sequence" in data:
+            batch_data["sequence"] = max(
+                batch_data.get("sequence", 0), data["sequence"]
+            )
+    return batch_data
+
+
+def get_project_room(project_id):
+    return "project:%s" % project_id
+
+
+def get_person_room(person_id):
+    return "person:%s" % person_id
 
 
 def init():
     """
     Initialize key value store that will be used for the event publishing.
     That way the main API takes advantage of Redis pub/sub capabilities to push
-    events to the event stream API.
+    events to the event stream API. Without Redis, events are not pushed
+    but project histories are still kept in a local fake store, if it
+    can run the history script.
     """
-    global socketio
+    global socketio, publisher_store, add_to_history_script
 
-    try:
-        publisher_store = redis.StrictRedis(
-            host=host, port=port, db=redis_db, decode_responses=True
-        )
-        publisher_store.get("test")
+    if redis_pools.is_kv_available():
+        publisher_store = redis_pools.get_client(redis_db)
         socketio = SocketIO(message_queue=redis_url)
-    except redis.ConnectionError:
-        pass
+        add_to_history_script = publisher_store.register_script(
+            ADD_TO_HISTORY_SCRIPT
+        )
+    else:
+        try:
+            import fakeredis
+
+            publisher_store = fakeredis.FakeStrictRedis(decode_responses=True)
+            add_to_history_script = publisher_store.register_script(
+                ADD_TO_HISTORY_SCRIPT
+            )
+            add_to_history_script(
+                keys=["event-sequence:check", "event-history:check"],
+                args=[1, "check", "{}"],
+            )
+            publisher_store.delete(
+                "event-sequence:check", "event-history:check"
+            )
+        except Exception:
+            publisher_store = None
+            add_to_history_script = None
 
     return socketio
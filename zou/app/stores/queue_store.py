@@ -1,26 +1,41 @@
-import redis
 import sys
 
+from collections import OrderedDict
+
 from rq import Queue
 from zou.app import config
+from zou.app.utils import redis_pools
 
+# Transcoding queues, from the highest priority to the lowest. Transcoding
+# workers empty a queue before taking jobs from the next one.
+TRANSCODING_PRIORITIES = ["high", "normal", "low"]
 
-try:
-    if config.ENABLE_JOB_QUEUE:
-        queue_store = redis.StrictRedis(
-            host=config.KEY_VALUE_STORE["host"],
-            port=config.KEY_VALUE_STORE["port"],
-            db=config.KV_JOB_DB_INDEX,
-            decode_responses=True,
-        )
-        queue_store.get("test")
-except redis.ConnectionError:
-    try:
-        import fakeredis
 
-        revoked_tokens_store = fakeredis.FakeStrictRedis()
-    except:
-        sys.exit(1)
+def get_transcoding_queue_name(priority):
+    return "transcoding-%s" % priority
+
 
 if config.ENABLE_JOB_QUEUE:
+    if redis_pools.is_kv_available():
+        # rq stores pickled data, responses must not be decoded.
+        queue_store = redis_pools.get_client(
+            config.KV_JOB_DB_INDEX, decode_responses=False
+        )
+    else:
+        try:
+            import fakeredis
+
+            queue_store = fakeredis.FakeStrictRedis()
+        except:
+            sys.exit(1)
+
     job_queue = Queue(connection=queue_store)
+    transcoding_queues = OrderedDict(
+        (
+            priority,
+            Queue(
+                get_transcoding_queue_name(priority), connection=queue_store
+            ),
+        )
+        for priority in TRANSCODING_PRIORITIES
+    )
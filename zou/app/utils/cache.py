@@ -3,35 +3,29 @@ This module is a wrapper for flask_caching. It configures it and rename
 the memoize function. The aim with that cache is to minimize the requests
 made on the target database.
 """
-import redis
-
 from functools import wraps
 from flask_caching import Cache
 from zou.app import config
+from zou.app.utils import redis_pools
 
 
 cache = None
 
-try:
-    redis_cache = redis.StrictRedis(
-        host=config.KEY_VALUE_STORE["host"],
-        port=config.KEY_VALUE_STORE["port"],
-        db=config.MEMOIZE_DB_INDEX,
-        decode_responses=True,
-    )
-    redis_cache.get("test")
+if redis_pools.is_kv_available():
+    # flask_caching accepts a Redis client instead of a host name. Cached
+    # values are pickled, responses must not be decoded.
     cache = Cache(
         config={
             "CACHE_TYPE": "redis",
-            "CACHE_REDIS_HOST": config.KEY_VALUE_STORE["host"],
-            "CACHE_REDIS_PORT": config.KEY_VALUE_STORE["port"],
-            "CACHE_REDIS_DB": config.MEMOIZE_DB_INDEX,
+            "CACHE_REDIS_HOST": redis_pools.get_client(
+                config.MEMOIZE_DB_INDEX, decode_responses=False
+            ),
         }
     )
 
 # This is needed to run tests which. This way they do not require a Redis
 # instance to work properly
-except redis.ConnectionError:
+else:
     cache = Cache(config={"CACHE_TYPE": "simple"})
 
 memoize_function = cache.memoize
@@ -3,6 +3,13 @@ from slackclient import SlackClient
 
 def send_to_slack(app_token, userid, message):
     client = SlackClient(token=app_token)
+    post_to_slack(client, userid, message)
+
+
+def post_to_slack(client, userid, message):
+    """
+    Send given message to given Slack user with an existing client.
+    """
     blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": message}}]
     client.api_call(
         "chat.postMessage", channel="@%s" % userid, blocks=blocks, as_user=True
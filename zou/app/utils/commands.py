@@ -1,8 +1,7 @@
 # coding: utf-8
 
 import os
-import json
-import datetime
+import time
 
 
 from ldap3 import Server, Connection, ALL, NTLM, SIMPLE
@@ -12,6 +11,8 @@ from zou.app.services import (
     assets_service,
     backup_service,
     deletion_service,
+    emails_service,
+    events_service,
     persons_service,
     projects_service,
     shots_service,
@@ -24,30 +25,19 @@ from zou.app.services.exception import PersonNotFoundException
 
 def clean_auth_tokens():
     """
-    Remove all revoked tokens (most of the time outdated) from the key value
-    store.
+    Remove tokens stored without expiration from the key value store. Other
+    tokens expire through their TTL.
     """
-    for key in auth_tokens_store.keys():
-        value = json.loads(auth_tokens_store.get(key))
-
-        if type(value) is bool:
-            auth_tokens_store.delete(key)
-
-        else:
-            is_revoked = value["revoked"] == True
-            expiration = datetime.datetime.fromtimestamp(value["token"]["exp"])
-            is_expired = expiration < datetime.datetime.now()
-
-            if is_revoked or is_expired:
-                auth_tokens_store.delete(key)
+    nb_deleted = auth_tokens_store.clean()
+    print("%s auth tokens removed." % nb_deleted)
 
 
 def clear_all_auth_tokens():
     """
     Remove all authentication tokens from the key value store.
     """
-    for key in auth_tokens_store.keys():
-        auth_tokens_store.delete(key)
+    nb_deleted = auth_tokens_store.clear()
+    print("%s auth tokens removed." % nb_deleted)
 
 
 def init_data():
@@ -436,3 +426,122 @@ def remove_old_data(days_old=90):
     print("Removing old notitfications...")
     deletion_service.remove_old_notifications(days_old)
     print("Old data removed.")
+
+
+def create_event_partitions(nb_months_ahead=3):
+    partition_names = events_service.create_event_partitions(nb_months_ahead)
+    for partition_name in partition_names:
+        print("Event partition %s created." % partition_name)
+
+
+def send_notification_digests(interval=None):
+    """
+    Send due notification digests. If an interval (in seconds) is given,
+    it runs until stopped and sends due digests at each interval.
+    """
+    while True:
+        nb_sent = emails_service.send_due_digests()
+        if interval is None:
+            print("%s notification digests sent." % nb_sent)
+            break
+        elif nb_sent > 0:
+            print("%s notification digests sent." % nb_sent)
+        time.sleep(interval)
+
+
+def load_test_event_stream(
+    url, email, nb_clients=100, rate=10, duration=10, pid=None
+):
+    from flask_jwt_extended import create_access_token, get_jti
+    from zou.app import app
+    from zou.app.services import auth_service
+    from zou.app.utils import event_stream_load
+
+    with app.app_context():
+        access_token = create_access_token(identity=email)
+        auth_service.register_tokens(app, access_token)
+
+    print(
+        "Connecting %s clients to %s, then sending %s events per second "
+        "during %s seconds..." % (nb_clients, url, rate, duration)
+    )
+    try:
+        report = event_stream_load.run_load_test(
+            url,
+            access_token,
+            nb_clients=nb_clients,
+            rate=rate,
+            duration=duration,
+            event_stream_pid=pid,
+        )
+    finally:
+        with app.app_context():
+            auth_service.revoke_tokens(app, get_jti(access_token))
+
+    print(
+        "Clients connected: %s (%s failures)"
+        % (report["nb_clients"], report["nb_connection_failures"])
+    )
+    print("Events sent: %s" % report["nb_events"])
+    print(
+        "Deliveries: %s / %s"
+        % (report["nb_deliveries"], report["nb_expected_deliveries"])
+    )
+    for (name, value) in report["latencies"].items():
+        if value is not None:
+            print("Latency %s: %.2f ms" % (name, value))
+    if report["memory_per_connection"] is not None:
+        print(
+            "Memory per connection: %.1f KB"
+            % (report["memory_per_connection"] / 1024)
+        )
+
+
+def run_transcoding_workers(concurrency=None):
+    """
+    Start given number of transcoding workers, each one in its own process.
+    Workers listen to the transcoding queues from the highest priority to
+    the lowest.
+    """
+    import multiprocessing
+
+    from zou.app import config
+    from zou.app.stores import queue_store
+
+    if not config.ENABLE_JOB_QUEUE:
+        print("The job queue is disabled (ENABLE_JOB_QUEUE).")
+        return
+
+    if concurrency is None:
+        concurrency = config.TRANSCODING_CONCURRENCY
+    print(
+        "Starting %s transcoding workers on queues: %s"
+        % (
+            concurrency,
+            ", ".join(
+                queue.name for queue in queue_store.transcoding_queues.values()
+            ),
+        )
+    )
+    processes = [
+        multiprocessing.Process(target=run_transcoding_worker)
+        for _ in range(concurrency)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def run_transcoding_worker():
+    """
+    Process transcoding jobs until the worker is stopped.
+    """
+    from rq import Worker
+
+    from zou.app.stores import queue_store
+
+    Worker(
+        list(queue_store.transcoding_queues.values()),
+        connection=queue_store.queue_store,
+    ).work()
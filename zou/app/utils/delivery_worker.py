@@ -0,0 +1,271 @@
+import atexit
+import heapq
+import itertools
+import queue
+import threading
+import time
+
+from slackclient import SlackClient
+
+from zou.app.utils import chats, emails
+
+
+delivery_worker = None
+delivery_worker_lock = threading.Lock()
+
+
+class DeliveryWorker(object):
+    """
+    Send emails and Slack messages from a background thread.
+
+    The SMTP connection is kept open between messages and closed once the
+    worker is idle. A Slack client is kept for each token. Messages are
+    taken from the queue by batches and sent at a limited rate. Failed sends
+    are kept aside and retried with an increasing delay, without delaying
+    the other messages. Once stopped, pending retries are tried one last
+    time.
+    """
+
+    def __init__(
+        self,
+        app,
+        mail,
+        batch_size=50,
+        rate=0,
+        max_retries=3,
+        retry_delay=2,
+        idle_timeout=30,
+    ):
+        self.app = app
+        self.mail = mail
+        self.batch_size = batch_size
+        self.rate = rate
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.idle_timeout = idle_timeout
+        self.queue = queue.Queue()
+        self.retries = []
+        self.retry_counter = itertools.count()
+        self.is_stopping = False
+        self.smtp_connection = None
+        self.slack_clients = {}
+        self.last_send_time = 0
+        self.lock = threading.Lock()
+        self.stats = {
+            "sent": 0,
+            "failures": 0,
+            "retries": 0,
+            "smtp_connections": 0,
+            "total_time": 0.0,
+            "max_time": 0.0,
+        }
+        self.thread = threading.Thread(
+            target=self.run, name="delivery-worker", daemon=True
+        )
+        self.thread.start()
+
+    def send_email(self, subject, body, recipient_email, html=None):
+        """
+        Add an email to the delivery queue.
+        """
+        self.put(("email", (subject, body, recipient_email, html)))
+
+    def send_to_slack(self, token, userid, message):
+        """
+        Add a Slack message to the delivery queue.
+        """
+        self.put(("slack", (token, userid, message)))
+
+    def put(self, message):
+        self.queue.put((message, time.monotonic(), 0, 0))
+
+    def run(self):
+        with self.app.app_context():
+            while True:
+                batch = self.get_batch()
+                if batch is None:
+                    break
+                elif len(batch) == 0:
+                    self.close_smtp_connection()
+                for item in batch:
+                    self.deliver(*item)
+            self.close_smtp_connection()
+
+    def get_batch(self):
+        """
+        Return next messages to send: retries that are due, then queued
+        messages. It waits for a message until the idle timeout or the next
+        retry is reached, then it returns an empty batch. None is returned
+        when the worker is stopped and nothing is left to send.
+        """
+        batch = self.pop_due_retries()
+        try:
+            if len(batch) > 0:
+                item = self.queue.get_nowait()
+            else:
+                item = self.queue.get(timeout=self.get_wait_timeout())
+        except queue.Empty:
+            return batch
+        while item is not None:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return batch
+
+        # The worker is stopped: pending retries are not delayed anymore.
+        self.is_stopping = True
+        batch += [retry for (_, _, retry) in self.retries]
+        self.retries = []
+        if len(batch) > 0:
+            # Stop once the current batch is sent.
+            self.queue.put(None)
+            return batch
+        return None
+
+    def pop_due_retries(self):
+        due_retries = []
+        now = time.time()
+        while len(self.retries) > 0 and self.retries[0][0] <= now:
+            (_, _, retry) = heapq.heappop(self.retries)
+            due_retries.append(retry)
+        return due_retries
+
+    def get_wait_timeout(self):
+        if len(self.retries) > 0:
+            return max(
+                0, min(self.idle_timeout, self.retries[0][0] - time.time())
+            )
+        return self.idle_timeout
+
+    def deliver(self, message, queued_at, nb_attempts, not_before):
+        self.wait()
+        (message_type, args) = message
+        try:
+            if message_type == "email":
+                self.deliver_email(*args)
+            else:
+                self.deliver_slack_message(*args)
+        except Exception:
+            self.close_smtp_connection()
+            if nb_attempts < self.max_retries and not self.is_stopping:
+                not_before = time.time() + self.retry_delay * 2 ** nb_attempts
+                with self.lock:
+                    self.stats["retries"] += 1
+                heapq.heappush(
+                    self.retries,
+                    (
+                        not_before,
+                        next(self.retry_counter),
+                        (message, queued_at, nb_attempts + 1, not_before),
+                    ),
+                )
+            else:
+                with self.lock:
+                    self.stats["failures"] += 1
+                self.app.logger.error("Message delivery failed", exc_info=1)
+            return
+
+        duration = time.monotonic() - queued_at
+        with self.lock:
+            self.stats["sent"] += 1
+            self.stats["total_time"] += duration
+            self.stats["max_time"] = max(self.stats["max_time"], duration)
+
+    def wait(self):
+        """
+        Wait until the rate limit allows a new send.
+        """
+        if self.rate > 0:
+            not_before = self.last_send_time + 1.0 / self.rate
+            now = time.time()
+            if not_before > now:
+                time.sleep(not_before - now)
+        self.last_send_time = time.time()
+
+    def deliver_email(self, subject, body, recipient_email, html):
+        message = emails.build_email(subject, body, recipient_email, html)
+        self.get_smtp_connection().send(message)
+
+    def deliver_slack_message(self, token, userid, message):
+        if token not in self.slack_clients:
+            self.slack_clients[token] = SlackClient(token=token)
+        chats.post_to_slack(self.slack_clients[token], userid, message)
+
+    def get_smtp_connection(self):
+        if self.smtp_connection is None:
+            self.smtp_connection = self.mail.connect().__enter__()
+            with self.lock:
+                self.stats["smtp_connections"] += 1
+        return self.smtp_connection
+
+    def close_smtp_connection(self):
+        if self.smtp_connection is not None:
+            try:
+                self.smtp_connection.__exit__(None, None, None)
+            except Exception:
+                pass
+            self.smtp_connection = None
+
+    def get_stats(self):
+        """
+        Return delivery counters: queue depth, number of messages sent,
+        retried and given up, number of SMTP connections opened, and average
+        and maximum latencies from queueing to sending (in seconds).
+        """
+        with self.lock:
+            nb_sent = self.stats["sent"]
+            return {
+                "queue_depth": self.queue.qsize() + len(self.retries),
+                "sent": nb_sent,
+                "failures": self.stats["failures"],
+                "retries": self.stats["retries"],
+                "smtp_connections": self.stats["smtp_connections"],
+                "average_time": (
+                    self.stats["total_time"] / nb_sent if nb_sent else 0.0
+                ),
+                "max_time": self.stats["max_time"],
+            }
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker once the messages already queued and the pending
+        retries are sent.
+        """
+        self.queue.put(None)
+        if wait:
+            self.thread.join()
+
+
+def get_delivery_worker(app):
+    """
+    Return the delivery worker of the current process. It is built on first
+    call from the application configuration. Its queue is flushed when the
+    process exits. Processes that may exit without running exit handlers,
+    like job queue workers, should enqueue messages in the job queue
+    instead.
+    """
+    global delivery_worker
+    with delivery_worker_lock:
+        if delivery_worker is None:
+            from zou.app import mail
+
+            delivery_worker = DeliveryWorker(
+                app,
+                mail,
+                batch_size=app.config["MAIL_DELIVERY_BATCH_SIZE"],
+                rate=app.config["MAIL_DELIVERY_RATE"],
+                max_retries=app.config["MAIL_DELIVERY_MAX_RETRIES"],
+                retry_delay=app.config["MAIL_DELIVERY_RETRY_DELAY"],
+                idle_timeout=app.config["MAIL_DELIVERY_IDLE_TIMEOUT"],
+            )
+            atexit.register(delivery_worker.shutdown)
+    return delivery_worker
+
+
+def get_stats():
+    if delivery_worker is None:
+        return {}
+    return delivery_worker.get_stats()
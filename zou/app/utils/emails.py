@@ -3,19 +3,27 @@ from flask_mail import Message
 from zou.app import mail, app
 
 
-def send_email(subject, body, recipient_email, html=None):
+def build_email(subject, body, recipient_email, html=None):
     """
-    Send an email with given subject and body to given recipient.
+    Build an email message with given subject and body for given recipient.
+    It must be called inside an application context.
     """
     if html is None:
         html = body
+    mail_default_sender = app.config["MAIL_DEFAULT_SENDER"]
+    return Message(
+        sender="Kitsu Bot <%s>" % mail_default_sender,
+        body=body,
+        html=html,
+        subject=subject,
+        recipients=[recipient_email]
+    )
+
+
+def send_email(subject, body, recipient_email, html=None):
+    """
+    Send an email with given subject and body to given recipient.
+    """
     with app.app_context():
-        mail_default_sender = app.config["MAIL_DEFAULT_SENDER"]
-        message = Message(
-            sender="Kitsu Bot <%s>" % mail_default_sender,
-            body=body,
-            html=html,
-            subject=subject,
-            recipients=[recipient_email]
-        )
+        message = build_email(subject, body, recipient_email, html=html)
         mail.send(message)
@@ -0,0 +1,144 @@
+"""
+Load test for the event stream daemon. Simulated socket clients connect to a
+running event stream while events are published through the Redis message
+queue, like the API does. Delivery latencies are measured from publishing
+to reception by each client.
+"""
+import threading
+import time
+
+import socketio
+
+from zou.app.stores import publisher_store
+
+LOAD_TEST_EVENT = "load-test:ping"
+
+
+class LoadTestClient(object):
+    """
+    Socket client that records the delivery latency of every load test
+    event it receives.
+    """
+
+    def __init__(self, url, access_token, latencies, lock):
+        self.url = url
+        self.access_token = access_token
+        self.latencies = latencies
+        self.lock = lock
+        self.client = socketio.Client(reconnection=False)
+        self.client.on(LOAD_TEST_EVENT, self.on_ping, namespace="/events")
+
+    def connect(self):
+        self.client.connect(
+            self.url,
+            headers={"Authorization": "Bearer %s" % self.access_token},
+            namespaces=["/events"],
+        )
+
+    def disconnect(self):
+        self.client.disconnect()
+
+    def on_ping(self, data):
+        latency = time.time() - data["sent_at"]
+        with self.lock:
+            self.latencies.append(latency)
+
+
+def run_load_test(
+    url,
+    access_token,
+    nb_clients=100,
+    rate=10,
+    duration=10,
+    event_stream_pid=None,
+):
+    """
+    Connect *nb_clients* clients to the event stream at given URL, then
+    publish *rate* events per second during *duration* seconds. It returns
+    a report with delivery statistics, latency percentiles (in
+    milliseconds) and memory used per connection by the event stream
+    process (when its PID is given).
+    """
+    if publisher_store.init() is None:
+        raise RuntimeError("The key value store is not available")
+
+    latencies = []
+    lock = threading.Lock()
+    memory_before = get_process_memory(event_stream_pid)
+    clients = []
+    nb_failures = 0
+    for _ in range(nb_clients):
+        client = LoadTestClient(url, access_token, latencies, lock)
+        try:
+            client.connect()
+            clients.append(client)
+        except Exception:
+            nb_failures += 1
+    memory_after = get_process_memory(event_stream_pid)
+
+    nb_events = 0
+    interval = 1.0 / rate
+    start = time.time()
+    while time.time() - start < duration:
+        publisher_store.publish(
+            LOAD_TEST_EVENT, {"sent_at": time.time(), "index": nb_events}
+        )
+        nb_events += 1
+        next_time = start + nb_events * interval
+        time.sleep(max(0, next_time - time.time()))
+    # Leave time to the last events to be delivered.
+    time.sleep(1)
+
+    for client in clients:
+        try:
+            client.disconnect()
+        except Exception:
+            pass
+
+    memory_per_connection = None
+    if memory_before is not None and memory_after is not None and clients:
+        memory_per_connection = (memory_after - memory_before) / len(clients)
+    with lock:
+        received_latencies = sorted(latencies)
+    return {
+        "nb_clients": len(clients),
+        "nb_connection_failures": nb_failures,
+        "nb_events": nb_events,
+        "nb_expected_deliveries": nb_events * len(clients),
+        "nb_deliveries": len(received_latencies),
+        "latencies": get_percentiles(
+            [latency * 1000 for latency in received_latencies]
+        ),
+        "memory_per_connection": memory_per_connection,
+    }
+
+
+def get_percentiles(sorted_values, percentiles=(50, 90, 99, 100)):
+    """
+    Return given percentiles of a sorted list of values as a dict.
+    """
+    result = {}
+    for percentile in percentiles:
+        if len(sorted_values) == 0:
+            result["p%s" % percentile] = None
+        else:
+            index = int(round(percentile / 100.0 * (len(sorted_values) - 1)))
+            result["p%s" % percentile] = sorted_values[index]
+    return result
+
+
+def get_process_memory(pid):
+    """
+    Return resident memory (in bytes) of the process with given PID. It
+    relies on the /proc file system, None is returned if it's not available.
+    """
+    if pid is None:
+        return None
+    try:
+        with open("/proc/%s/status" % pid) as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (IOError, ValueError):
+        return None
+    return None
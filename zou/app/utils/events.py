@@ -1,14 +1,19 @@
+import datetime
+
 from collections import OrderedDict
 
-from flask import current_app
+from flask import current_app, g, has_request_context
 
+from zou.app import db
 from zou.app.stores import publisher_store
 from zou.app.models.event import ApiEvent
-from zou.app.utils import fields
+from zou.app.utils import fields, handler_pool
 
 
 handlers = {}
 
+EVENT_INSERT_CHUNK_SIZE = 1000
+
 publisher_store.init()
 
 
@@ -70,15 +75,23 @@ def emit(event, data={}, persist=True, project_id=None):
     data = fields.serialize_dict(data)
     publisher_store.publish(event, data)
     if persist:
-        save_event(event, data, project_id=project_id)
+        if has_request_context():
+            buffer_event(event, data, project_id=project_id)
+        else:
+            save_event(event, data, project_id=project_id)
 
-    from zou.app.config import ENABLE_JOB_QUEUE
+    from zou.app.config import ENABLE_JOB_QUEUE, EVENT_HANDLERS_POOL_SIZE
 
-    for func in event_handlers.values():
+    for (name, func) in event_handlers.items():
         if ENABLE_JOB_QUEUE:
             from zou.app.stores.queue_store import job_queue
 
             job_queue.enqueue(func.handle_event, data)
+        elif EVENT_HANDLERS_POOL_SIZE > 0:
+            pool = handler_pool.get_handler_pool(
+                current_app._get_current_object()
+            )
+            pool.submit(name, func, data)
         else:
             try:
                 func.handle_event(data)
@@ -90,17 +103,68 @@ def save_event(event, data, project_id=None):
     """
     Store event information in the database.
     """
-    try:
-        from zou.app.services.persons_service import get_current_user_raw
+    event_row = build_event_row(
+        event, data, get_current_user_id(), project_id=project_id
+    )
+    return ApiEvent.create(**event_row)
+
+
+def buffer_event(event, data, project_id=None):
+    """
+    Add event to the buffer of the current request. Buffered events are
+    written at the end of the request with a single insert (see
+    flush_buffered_events).
+    """
+    if "event_buffer" not in g:
+        g.event_buffer = []
+        g.event_user_id = get_current_user_id()
+    g.event_buffer.append(
+        build_event_row(event, data, g.event_user_id, project_id=project_id)
+    )
 
-        person = get_current_user_raw()
-        person_id = person.id
-    except:
-        person_id = None
 
+def flush_buffered_events():
+    """
+    Write events buffered during the current request to the database. Events
+    are inserted with multi-row insert statements, in the emission order.
+    """
+    event_rows = g.pop("event_buffer", [])
+    if len(event_rows) == 0:
+        return []
+
+    try:
+        # Changes not committed by the request are dropped anyway.
+        db.session.rollback()
+        for index in range(0, len(event_rows), EVENT_INSERT_CHUNK_SIZE):
+            chunk = event_rows[index:index + EVENT_INSERT_CHUNK_SIZE]
+            db.session.execute(ApiEvent.__table__.insert().values(chunk))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.error("Error saving events", exc_info=1)
+    return event_rows
+
+
+def build_event_row(event, data, user_id, project_id=None):
     if project_id == 'None':
         project_id = None
 
-    return ApiEvent.create(
-        name=event, data=data, user_id=person_id, project_id=project_id
-    )
+    now = datetime.datetime.utcnow()
+    return {
+        "id": fields.gen_uuid(),
+        "created_at": now,
+        "updated_at": now,
+        "name": event,
+        "data": data,
+        "user_id": user_id,
+        "project_id": project_id,
+    }
+
+
+def get_current_user_id():
+    try:
+        from zou.app.services.persons_service import get_current_user_id
+
+        return get_current_user_id()
+    except:
+        return None
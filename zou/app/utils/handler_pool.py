@@ -0,0 +1,137 @@
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+handler_pool = None
+handler_pool_lock = threading.Lock()
+
+
+class HandlerPool(object):
+    """
+    Run event handlers in a fixed size pool of threads, each call running in
+    its own application context.
+
+    The number of pending calls is bounded: when the queue is full, the
+    emitter waits for a free slot (backpressure). Python threads can't be
+    interrupted, so handler calls lasting longer than the timeout are not
+    stopped. They are logged and counted as timeouts instead.
+    """
+
+    def __init__(self, app, pool_size, queue_size, timeout):
+        self.app = app
+        self.pool_size = pool_size
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=pool_size)
+        self.slots = threading.BoundedSemaphore(pool_size + queue_size)
+        self.lock = threading.Lock()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.handler_stats = {}
+
+    def submit(self, name, handler, data):
+        """
+        Add a call of given handler to the queue. It blocks while the queue
+        is full.
+        """
+        self.slots.acquire()
+        with self.lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            return self.executor.submit(self.run, name, handler, data)
+        except Exception:
+            self.release_slot()
+            raise
+
+    def run(self, name, handler, data):
+        start = time.monotonic()
+        is_failed = False
+        try:
+            with self.app.app_context():
+                handler.handle_event(data)
+        except Exception:
+            is_failed = True
+            self.app.logger.error("Error handling event", exc_info=1)
+        finally:
+            duration = time.monotonic() - start
+            self.release_slot()
+            self.record_call(name, duration, is_failed)
+
+    def release_slot(self):
+        with self.lock:
+            self.queue_depth -= 1
+        self.slots.release()
+
+    def record_call(self, name, duration, is_failed):
+        is_timeout = duration > self.timeout
+        if is_timeout:
+            self.app.logger.warning(
+                "Event handler %s took %.2fs (timeout: %ss)"
+                % (name, duration, self.timeout)
+            )
+        with self.lock:
+            stats = self.handler_stats.setdefault(name, {
+                "calls": 0,
+                "failures": 0,
+                "timeouts": 0,
+                "total_time": 0.0,
+                "max_time": 0.0,
+            })
+            stats["calls"] += 1
+            stats["failures"] += int(is_failed)
+            stats["timeouts"] += int(is_timeout)
+            stats["total_time"] += duration
+            stats["max_time"] = max(stats["max_time"], duration)
+
+    def get_stats(self):
+        """
+        Return pool counters: current and maximum queue depth, and for each
+        handler the number of calls, failures, timeouts and the average and
+        maximum latencies (in seconds).
+        """
+        with self.lock:
+            handlers = {}
+            for (name, stats) in self.handler_stats.items():
+                handlers[name] = {
+                    "calls": stats["calls"],
+                    "failures": stats["failures"],
+                    "timeouts": stats["timeouts"],
+                    "average_time": stats["total_time"] / stats["calls"],
+                    "max_time": stats["max_time"],
+                }
+            return {
+                "pool_size": self.pool_size,
+                "queue_size": self.queue_size,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "handlers": handlers,
+            }
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+def get_handler_pool(app):
+    """
+    Return the handler pool of the current process. It is built on first
+    call from the application configuration.
+    """
+    global handler_pool
+    with handler_pool_lock:
+        if handler_pool is None:
+            handler_pool = HandlerPool(
+                app,
+                app.config["EVENT_HANDLERS_POOL_SIZE"],
+                app.config["EVENT_HANDLERS_QUEUE_SIZE"],
+                app.config["EVENT_HANDLERS_TIMEOUT"],
+            )
+    return handler_pool
+
+
+def get_stats():
+    if handler_pool is None:
+        return {}
+    return handler_pool.get_stats()
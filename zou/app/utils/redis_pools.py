@@ -0,0 +1,114 @@
+"""
+This module builds the Redis clients used by the stores and the cache. All
+clients of the same database share a blocking connection pool: when all
+connections are in use, callers wait for a free one instead of opening new
+connections.
+"""
+import redis
+
+from zou.app import config
+
+
+pools = {}
+is_available = None
+
+
+def get_pool(db_index, decode_responses=True):
+    """
+    Return the connection pool of given Redis database. It is built on first
+    call from the configuration.
+    """
+    key = (db_index, decode_responses)
+    if key not in pools:
+        pools[key] = redis.BlockingConnectionPool(
+            host=config.KEY_VALUE_STORE["host"],
+            port=config.KEY_VALUE_STORE["port"],
+            db=db_index,
+            decode_responses=decode_responses,
+            max_connections=config.KV_MAX_CONNECTIONS,
+            timeout=config.KV_POOL_TIMEOUT,
+            socket_timeout=config.KV_SOCKET_TIMEOUT,
+            socket_connect_timeout=config.KV_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=config.KV_HEALTH_CHECK_INTERVAL,
+        )
+    return pools[key]
+
+
+def get_client(db_index, decode_responses=True):
+    """
+    Return a Redis client for given database, relying on the shared pool.
+    """
+    return redis.StrictRedis(
+        connection_pool=get_pool(db_index, decode_responses)
+    )
+
+
+def is_kv_available():
+    """
+    Tell if the Redis instance can be reached. The check runs only once per
+    process.
+    """
+    global is_available
+    if is_available is None:
+        try:
+            get_client(config.AUTH_TOKEN_BLACKLIST_KV_INDEX).ping()
+            is_available = True
+        except (redis.ConnectionError, redis.TimeoutError):
+            is_available = False
+    return is_available
+
+
+def get_pool_stats():
+    """
+    Return usage of each connection pool: maximum number of connections,
+    number of connections opened and number of connections in use.
+    """
+    stats = []
+    for ((db_index, decode_responses), pool) in pools.items():
+        nb_created = len(pool._connections)
+        nb_idle = len([
+            connection
+            for connection in list(pool.pool.queue)
+            if connection is not None
+        ])
+        stats.append({
+            "db": db_index,
+            "decode_responses": decode_responses,
+            "max_connections": pool.max_connections,
+            "created_connections": nb_created,
+            "in_use_connections": nb_created - nb_idle,
+        })
+    return stats
+
+
+def get_many(client, keys):
+    """
+    Return values of given keys with a single round trip.
+    """
+    if len(keys) == 0:
+        return []
+    return client.mget(keys)
+
+
+def set_many(client, values, ttl=None):
+    """
+    Set given key/value pairs with a single round trip.
+    """
+    pipeline = client.pipeline(transaction=False)
+    for (key, value) in values.items():
+        pipeline.set(key, value, ex=ttl)
+    return pipeline.execute()
+
+
+def delete_many(client, keys, chunk_size=1000):
+    """
+    Delete given keys by chunks, each chunk being a single command. Commands
+    are sent with a single round trip.
+    """
+    keys = list(keys)
+    if len(keys) == 0:
+        return 0
+    pipeline = client.pipeline(transaction=False)
+    for index in range(0, len(keys), chunk_size):
+        pipeline.delete(*keys[index:index + chunk_size])
+    return sum(pipeline.execute())
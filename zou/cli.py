@@ -321,5 +321,52 @@ def remove_old_data(days):
     commands.remove_old_data(days)
 
 
+@cli.command()
+@click.option("--months", default=3)
+def create_event_partitions(months):
+    """
+    Create monthly partitions of the event table for the current month and
+    the next ones (3 by default).
+    """
+    commands.create_event_partitions(months)
+
+
+@cli.command()
+@click.option("--interval", default=None, type=float)
+def send_notification_digests(interval):
+    """
+    Send notification digests whose window is over. When
+    NOTIFICATION_DIGEST_WINDOW is set, run it with an interval (in seconds)
+    as a long running process, or run it periodically from cron.
+    """
+    commands.send_notification_digests(interval)
+
+
+@cli.command()
+@click.option("--url", default="http://localhost:5001")
+@click.option("--email", default="admin@example.com")
+@click.option("--clients", default=100)
+@click.option("--rate", default=10)
+@click.option("--duration", default=10)
+@click.option("--pid", default=None, type=int)
+def load_test_event_stream(url, email, clients, rate, duration, pid):
+    """
+    Connect simulated clients to a running event stream and publish events
+    through Redis. Report delivery latencies and, if the event stream PID is
+    given, memory used per connection. Email must match an existing user.
+    """
+    commands.load_test_event_stream(url, email, clients, rate, duration, pid)
+
+
+@cli.command()
+@click.option("--concurrency", default=None, type=int)
+def transcoding_worker(concurrency):
+    """
+    Run workers transcoding movie previews (TRANSCODING_CONCURRENCY workers
+    by default). Jobs of higher priority are processed first.
+    """
+    commands.run_transcoding_workers(concurrency)
+
+
 if __name__ == "__main__":
     cli()
@@ -1,8 +1,12 @@
-from flask import Flask, jsonify
-from flask_jwt_extended import verify_jwt_in_request, JWTManager
-from flask_socketio import SocketIO, disconnect
+from flask import Flask, jsonify, session
+from flask_jwt_extended import (
+    get_jwt_identity,
+    verify_jwt_in_request,
+    JWTManager,
+)
+from flask_socketio import SocketIO, disconnect, join_room, leave_room
 from zou.app import config
-from zou.app.stores import auth_tokens_store
+from zou.app.stores import auth_tokens_store, publisher_store
 
 from gevent import monkey
 
@@ -15,6 +19,32 @@ def get_redis_url():
     return "redis://%s:%s/2" % (redis_host, redis_port)
 
 
+def get_person(email):
+    from zou.app import app as zou_app
+    from zou.app.services import persons_service
+
+    with zou_app.app_context():
+        return persons_service.get_person_by_email(email)
+
+
+def has_project_access(person, project_id):
+    """
+    Same rule as the API: admins access every project, other people only
+    the projects where they are part of the team.
+    """
+    from zou.app import app as zou_app
+    from zou.app.services import projects_service
+
+    if person["role"] == "admin":
+        return True
+    try:
+        with zou_app.app_context():
+            project = projects_service.get_project_with_relations(project_id)
+        return person["id"] in project["team"]
+    except Exception:
+        return False
+
+
 def create_app(redis_url):
     socketio = SocketIO(logger=True)
 
@@ -29,12 +59,34 @@ def create_app(redis_url):
     def connected():
         try:
             verify_jwt_in_request()
+            person = get_person(get_jwt_identity())
+            session["person"] = {"id": person["id"], "role": person["role"]}
+            # Until the client joins project rooms, it receives the events of
+            # all projects.
+            join_room(publisher_store.ALL_EVENTS_ROOM)
+            join_room(publisher_store.get_person_room(person["id"]))
             app.logger.info("New websocket client connected")
         except Exception:
             app.logger.info("New websocket client failed to connect")
             disconnect()
             return False
 
+    @socketio.on("join-project", namespace="/events")
+    def join_project(data):
+        person = session.get("person", None)
+        project_id = data.get("project_id", None)
+        if person is None or not has_project_access(person, project_id):
+            return {"error": True, "message": "Access to project denied"}
+        leave_room(publisher_store.ALL_EVENTS_ROOM)
+        join_room(publisher_store.get_project_room(project_id))
+        return {"project_id": project_id}
+
+    @socketio.on("leave-project", namespace="/events")
+    def leave_project(data):
+        project_id = data.get("project_id", None)
+        leave_room(publisher_store.get_project_room(project_id))
+        return {"project_id": project_id}
+
     @socketio.on("disconnect", namespace="/events")
     def disconnected():
         app.logger.info("Websocket client disconnected")
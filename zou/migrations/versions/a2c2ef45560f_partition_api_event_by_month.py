@@ -0,0 +1,148 @@
+"""partition api event by month
+
+Partitioning requires PostgreSQL 11. On older versions, the event table is
+kept as a regular table with the same columns and indexes, the primary key
+being the id column only.
+
+Revision ID: a2c2ef45560f
+Revises: b80dc270f827
+Create Date: 2021-03-08 09:41:12.506218
+
+"""
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from dateutil import relativedelta
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2c2ef45560f'
+down_revision = 'b80dc270f827'
+branch_labels = None
+depends_on = None
+
+
+EVENT_COLUMNS = "id, created_at, updated_at, name, user_id, project_id, data"
+EVENT_INDEXES = ["name", "user_id", "project_id"]
+NB_MONTHS_AHEAD = 3
+
+
+def get_month_start(date):
+    return datetime.datetime(date.year, date.month, 1)
+
+
+def is_partitioning_supported(connection):
+    return connection.dialect.server_version_info >= (11,)
+
+
+def is_partitioned(connection):
+    relkind = connection.execute(
+        sa.text("SELECT relkind FROM pg_class WHERE relname = 'api_event'")
+    ).scalar()
+    return relkind == "p"
+
+
+def upgrade():
+    connection = op.get_bind()
+    if not is_partitioning_supported(connection):
+        op.execute(
+            "UPDATE api_event "
+            "SET created_at = COALESCE(updated_at, now()) "
+            "WHERE created_at IS NULL"
+        )
+        op.alter_column("api_event", "created_at", nullable=False)
+        op.create_index(
+            "ix_api_event_created_at", "api_event", ["created_at"],
+            unique=False
+        )
+        return
+
+    op.execute(
+        "CREATE TABLE api_event_partitioned ("
+        "id UUID NOT NULL, "
+        "created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, "
+        "updated_at TIMESTAMP WITHOUT TIME ZONE, "
+        "name VARCHAR(80) NOT NULL, "
+        "user_id UUID REFERENCES person (id), "
+        "project_id UUID REFERENCES project (id), "
+        "data JSONB, "
+        "PRIMARY KEY (id, created_at)"
+        ") PARTITION BY RANGE (created_at)"
+    )
+    op.execute(
+        "CREATE TABLE api_event_default "
+        "PARTITION OF api_event_partitioned DEFAULT"
+    )
+
+    now = datetime.datetime.utcnow()
+    oldest_date = connection.execute(
+        sa.text("SELECT min(created_at) FROM api_event")
+    ).scalar() or now
+    start_date = get_month_start(oldest_date)
+    last_date = get_month_start(now) + relativedelta.relativedelta(
+        months=NB_MONTHS_AHEAD
+    )
+    while start_date <= last_date:
+        end_date = start_date + relativedelta.relativedelta(months=1)
+        connection.execute(
+            sa.text(
+                "CREATE TABLE %s PARTITION OF api_event_partitioned "
+                "FOR VALUES FROM (:start_date) TO (:end_date)"
+                % start_date.strftime("api_event_y%Ym%m")
+            ),
+            start_date=start_date,
+            end_date=end_date,
+        )
+        start_date = end_date
+
+    op.execute(
+        "INSERT INTO api_event_partitioned (%s) "
+        "SELECT id, COALESCE(created_at, updated_at, now()), updated_at, "
+        "name, user_id, project_id, data FROM api_event" % EVENT_COLUMNS
+    )
+    op.drop_table("api_event")
+    op.execute("ALTER TABLE api_event_partitioned RENAME TO api_event")
+    op.execute(
+        "ALTER TABLE api_event "
+        "RENAME CONSTRAINT api_event_partitioned_pkey TO api_event_pkey"
+    )
+    for column in EVENT_INDEXES + ["created_at"]:
+        op.create_index(
+            "ix_api_event_%s" % column, "api_event", [column], unique=False
+        )
+
+
+def downgrade():
+    if not is_partitioned(op.get_bind()):
+        op.drop_index("ix_api_event_created_at", table_name="api_event")
+        op.alter_column("api_event", "created_at", nullable=True)
+        return
+
+    op.execute("ALTER TABLE api_event RENAME TO api_event_partitioned")
+    op.execute(
+        "ALTER TABLE api_event_partitioned "
+        "RENAME CONSTRAINT api_event_pkey TO api_event_partitioned_pkey"
+    )
+    for column in EVENT_INDEXES + ["created_at"]:
+        op.execute("DROP INDEX IF EXISTS ix_api_event_%s" % column)
+    op.execute(
+        "CREATE TABLE api_event ("
+        "id UUID NOT NULL PRIMARY KEY, "
+        "created_at TIMESTAMP WITHOUT TIME ZONE, "
+        "updated_at TIMESTAMP WITHOUT TIME ZONE, "
+        "name VARCHAR(80) NOT NULL, "
+        "user_id UUID REFERENCES person (id), "
+        "project_id UUID REFERENCES project (id), "
+        "data JSONB"
+        ")"
+    )
+    op.execute(
+        "INSERT INTO api_event (%s) SELECT %s FROM api_event_partitioned"
+        % (EVENT_COLUMNS, EVENT_COLUMNS)
+    )
+    op.execute("DROP TABLE api_event_partitioned")
+    for column in EVENT_INDEXES:
+        op.create_index(
+            "ix_api_event_%s" % column, "api_event", [column], unique=False
+        )
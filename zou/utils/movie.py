@@ -49,20 +49,101 @@ def get_movie_size(movie_path):
     """
     Returns movie resolution (extract a frame and returns its size).
     """
+    (width, height, _) = get_movie_info(movie_path)
+    return (width, height)
+
+
+def get_movie_info(movie_path):
+    """
+    Returns movie resolution and whether it has a soundtrack, with a single
+    probe.
+    """
+    metadata = get_movie_metadata(movie_path)
+    return (metadata["width"], metadata["height"], metadata["has_audio"])
+
+
+def get_movie_metadata(movie_path):
+    """
+    Probe given movie once and return its main properties: duration (in
+    seconds), number of frames, fps, resolution, codecs and the type of each
+    stream, in index order. The result can be stored to avoid probing the
+    movie again.
+    """
     probe = ffmpeg.probe(movie_path)
+    streams = sorted(probe["streams"], key=lambda stream: stream["index"])
     video = next((
-        stream for stream in probe['streams']
-        if stream['codec_type'] == 'video'
+        stream for stream in streams if stream["codec_type"] == "video"
     ), None)
-    width = int(video['width'])
-    height = int(video['height'])
-    return (width, height)
+    audio = next((
+        stream for stream in streams if stream["codec_type"] == "audio"
+    ), None)
+    duration = probe.get("format", {}).get("duration")
+    metadata = {
+        "duration": float(duration) if duration is not None else None,
+        "nb_frames": None,
+        "fps": None,
+        "width": None,
+        "height": None,
+        "video_codec": None,
+        "audio_codec": audio["codec_name"] if audio is not None else None,
+        "has_audio": audio is not None,
+        "streams": [stream["codec_type"] for stream in streams],
+    }
+    if video is not None:
+        nb_frames = video.get("nb_frames")
+        metadata.update({
+            "nb_frames": int(nb_frames) if nb_frames is not None else None,
+            "fps": get_stream_fps(video),
+            "width": int(video["width"]),
+            "height": int(video["height"]),
+            "video_codec": video["codec_name"],
+        })
+    return metadata
+
+
+def get_stream_fps(stream):
+    """
+    Return the frame rate of given probed video stream as a float, None if
+    it can't be read.
+    """
+    try:
+        (numerator, denominator) = stream["avg_frame_rate"].split("/")
+        return round(float(numerator) / float(denominator), 3)
+    except (KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+def is_demuxer_compatible(movie_infos):
+    """
+    Tell from stored movie metadata if given movies can be concatenated with
+    the concat demuxer: they must have a video stream followed by an audio
+    stream, with the same codecs, resolution and frame rate. It returns
+    False if metadata are missing for a movie.
+    """
+    if len(movie_infos) == 0 or any(info is None for info in movie_infos):
+        return False
+    properties = set()
+    for info in movie_infos:
+        if info.get("streams") != ["video", "audio"]:
+            return False
+        properties.add((
+            info.get("video_codec"),
+            info.get("audio_codec"),
+            info.get("width"),
+            info.get("height"),
+            info.get("fps"),
+        ))
+    return len(properties) == 1
 
 
 def normalize_movie(movie_path, fps, width, height):
     """
     Normalize movie using resolution, width and height given in parameter.
     Generates a high def movie and a low def movie.
+
+    Both movies are encoded by a single ffmpeg run: the source is decoded
+    once and its frames are split between the two encoders. If the source
+    has no soundtrack, a silent one is generated on the fly.
     """
     folder_path = os.path.dirname(movie_path)
     file_source_name = os.path.basename(movie_path)
@@ -71,7 +152,7 @@ def normalize_movie(movie_path, fps, width, height):
     low_file_target_name = "%s_low.mp4" % file_source_name[:-8]
     low_file_target_path = os.path.join(folder_path, low_file_target_name)
 
-    (w, h) = get_movie_size(movie_path)
+    (w, h, has_audio) = get_movie_info(movie_path)
     resize_factor = w / h
 
     if width is None:
@@ -83,55 +164,50 @@ def normalize_movie(movie_path, fps, width, height):
     if height % 2 == 1:
         height = height + 1
 
-    if not has_soundtrack(movie_path):
-        _, _, err = add_empty_soundtrack(movie_path)
+    low_width = 1280
+    low_height = math.floor((height / width) * low_width)
+    if low_height % 2 == 1:
+        low_height = low_height + 1
+
+    source = ffmpeg.input(movie_path)
+    if has_audio:
+        audio = source.audio
+        extra_args = {}
     else:
-        err = None
+        audio = ffmpeg.input("anullsrc", format="lavfi").audio
+        extra_args = {"shortest": None}
 
-    # High def version
-    stream = ffmpeg.input(movie_path)
-    stream = ffmpeg.output(
-        stream.video,
-        stream.audio,
-        file_target_path,
+    video = source.video.filter_multi_output("split")
+    encoding_args = dict(
         pix_fmt="yuv420p",
         format="mp4",
         r=fps,
-        b="28M",
         preset="slow",
         vcodec="libx264",
         color_primaries=1,
         color_trc=1,
         colorspace=1,
         movflags="+faststart",
-        s="%sx%s" % (width, height),
+        **extra_args
     )
-    stream.run(quiet=False, capture_stderr=True)
-
-    # Low def version
-    low_width = 1280
-    low_height = math.floor((height / width) * low_width)
-    if low_height % 2 == 1:
-        low_height = low_height + 1
-    stream = ffmpeg.input(movie_path)
-    stream = ffmpeg.output(
-        stream.video,
-        stream.audio,
+    high_def = ffmpeg.output(
+        video[0].filter("scale", width, height),
+        audio,
+        file_target_path,
+        b="28M",
+        **encoding_args
+    )
+    low_def = ffmpeg.output(
+        video[1].filter("scale", low_width, low_height),
+        audio,
         low_file_target_path,
-        pix_fmt="yuv420p",
-        format="mp4",
-        r=fps,
         b="1M",
-        preset="slow",
-        vcodec="libx264",
-        color_primaries=1,
-        color_trc=1,
-        colorspace=1,
-        movflags="+faststart",
-        s="%sx%s" % (low_width, low_height),
+        **encoding_args
+    )
+    ffmpeg.merge_outputs(high_def, low_def).overwrite_output().run(
+        quiet=False, capture_stderr=True
     )
-    stream.run(quiet=False, capture_stderr=True)
-    return file_target_path, low_file_target_path, err
+    return file_target_path, low_file_target_path, None
 
 
 def add_empty_soundtrack(file_path):
@@ -170,31 +246,52 @@ def has_soundtrack(file_path):
 
 
 def build_playlist_movie(concat, tmp_file_paths, movie_file_path, width,
-                         height, fps):
+                         height, fps, movie_infos=None):
     """
-    Build a single movie file from a playlist.
+    Build a single movie file from a playlist. Movie metadata stored at
+    upload time (see get_movie_metadata) can be given for each file, in the
+    same order: files are probed only when their metadata are missing.
     """
     in_files = []
     result = {"message": "", "success": False}
+    if movie_infos is None:
+        movie_infos = [None] * len(tmp_file_paths)
+    else:
+        movie_infos = list(movie_infos)
     if len(tmp_file_paths) > 0:
 
         # Get movie dimensions
         (first_movie_file_path, _) = tmp_file_paths[0]
         if width is None:
-            (width, height) = get_movie_size(first_movie_file_path)
+            if movie_infos[0] is not None:
+                (width, height) = (
+                    movie_infos[0]["width"], movie_infos[0]["height"]
+                )
+            else:
+                (width, height) = get_movie_size(first_movie_file_path)
 
         # Clean empty audio tracks
-        for tmp_file_path, file_name in tmp_file_paths:
-            if not has_soundtrack(tmp_file_path):
+        for index, (tmp_file_path, file_name) in enumerate(tmp_file_paths):
+            info = movie_infos[index]
+            if info is not None:
+                has_audio = info["has_audio"]
+            else:
+                has_audio = has_soundtrack(tmp_file_path)
+            if not has_audio:
                 ret, _, err = add_empty_soundtrack(tmp_file_path)
                 if err:
                     result["message"] += "%s\n" % err
                 if ret != 0:
                     return result
+                # Stored metadata no longer match the file.
+                movie_infos[index] = None
             in_files.append(tmp_file_path)
 
         # Run concatenation
-        concat_result = concat(in_files, movie_file_path, width, height, fps)
+        concat_result = concat(
+            in_files, movie_file_path, width, height, fps,
+            movie_infos=movie_infos
+        )
         if concat_result.get("message"):
             result["message"] += concat_result.get("message")
         result["success"] = concat_result.get("success", True)
@@ -202,37 +299,40 @@ def build_playlist_movie(concat, tmp_file_paths, movie_file_path, width,
     return result
 
 
-def concat_demuxer(in_files, output_path, *args):
+def concat_demuxer(in_files, output_path, *args, movie_infos=None):
     """
     Concatenate media files with exactly the same codec and codec
     parameters. Different container formats can be used and it can be used
-    with any container formats.
+    with any container formats. Stream layouts are checked from given movie
+    metadata, files without metadata are probed.
     """
-
-    for input_path in in_files:
-        info = ffmpeg.probe(input_path)
-        streams = info["streams"]
-        if len(streams) != 2:
+    if movie_infos is None:
+        movie_infos = [None] * len(in_files)
+
+    for (input_path, info) in zip(in_files, movie_infos):
+        if info is not None:
+            stream_types = info["streams"]
+        else:
+            streams = sorted(
+                ffmpeg.probe(input_path)["streams"],
+                key=lambda stream: stream["index"]
+            )
+            stream_types = [stream["codec_type"] for stream in streams]
+        if len(stream_types) != 2:
             return {
                 "success": False,
                 "message": "%s has an unexpected stream number (%s)" %
-                           (input_path, len(streams))
+                           (input_path, len(stream_types))
             }
 
-        stream_infos = {streams[0]["codec_type"], streams[1]["codec_type"]}
-        if stream_infos  != {"video", "audio"}:
+        if set(stream_types) != {"video", "audio"}:
             return {
                 "success": False,
                 "message": "%s has unexpected stream type (%s)" %
-                           (input_path, {streams[0]["codec_type"],
-                                         streams[1]["codec_type"]})
+                           (input_path, set(stream_types))
             }
 
-        video_index = [
-            x["index"] for x in streams
-            if x["codec_type"] == "video"
-        ][0]
-        if video_index != 0:
+        if stream_types[0] != "video":
             return {
                 "success": False,
                 "message": "%s has an unexpected stream order" % input_path
@@ -249,7 +349,7 @@ def concat_demuxer(in_files, output_path, *args):
         return run_ffmpeg(stream, '-xerror')
 
 
-def concat_filter(in_files, output_path, width, height, *args):
+def concat_filter(in_files, output_path, width, height, *args, **kwargs):
     """
     Concatenate media files with different codecs or different codec
     properties